@@ -0,0 +1,89 @@
+# ruff: noqa: T201
+"""
+Sync/async context switches of requests served over ASGI.
+
+Creates a test database, a user and a token, then sends each request below
+through ``config.asgi`` (with Django's ``AsyncClient``) with
+``ContextSwitchMiddleware`` enabled, and prints the ``sync_to_async`` and
+``async_to_sync`` calls each made, as counted by ``bistro.core.switches``::
+
+    DATABASE_URL=postgres:///bistro python -m benchmarks.context_switches
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+
+import django
+
+
+async def measure(token: str, session_cookie: str) -> dict[str, tuple[int, str]]:
+    from asgiref.sync import sync_to_async
+    from django.db import connections
+    from django.test import AsyncClient
+
+    anonymous = AsyncClient()
+    logged_in = AsyncClient()
+    logged_in.cookies.load(session_cookie)
+    token_headers = {"Authorization": f"Token {token}"}
+    requests = [
+        ("token", anonymous, "/api/users/me/", token_headers),
+        ("token", anonymous, "/api/users/", token_headers),
+        ("anonymous", anonymous, "/", {}),
+        ("anonymous", anonymous, "/about/", {}),
+        ("anonymous", anonymous, "/static/css/project.css", {}),
+        ("session", logged_in, "/", {}),
+        ("session", logged_in, "/users/~redirect/", {}),
+        ("session", logged_in, "/api/users/me/", {}),
+    ]
+    results = {}
+    for kind, client, path, headers in requests:
+        response = await client.get(path, headers=headers)
+        results[f"{kind} GET {path}"] = (
+            response.status_code,
+            response.get("X-Context-Switches", "-"),
+        )
+    # The sync code of the requests ran on asgiref's thread-sensitive thread.
+    await sync_to_async(connections.close_all)()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--settings", default="config.settings.test")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", args.settings)
+    django.setup()
+    from django.conf import settings
+    from django.test import Client
+    from django.test.utils import setup_databases
+    from django.test.utils import teardown_databases
+    from rest_framework.authtoken.models import Token
+
+    from bistro.users.models import User
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    settings.WHITENOISE_USE_FINDERS = True
+    # Keep away from the database of the test suite.
+    settings.DATABASES["default"].setdefault("TEST", {})["NAME"] = "bistro_benchmark"
+    logging.getLogger("bistro.core.middleware").setLevel(logging.DEBUG)
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        user = User.objects.create(email="pos@example.com", name="POS")
+        token = Token.objects.create(user=user).key
+        client = Client()
+        client.force_login(user)
+        session_cookie = client.cookies.output(header="")
+        results = asyncio.run(measure(token, session_cookie))
+    finally:
+        teardown_databases(databases, verbosity=0)
+
+    print(f"{'request':<44}{'status':>8}{'switches':>10}")
+    for name, (status, count) in results.items():
+        print(f"{name:<44}{status:>8}{count:>10}")
+
+
+if __name__ == "__main__":
+    main()
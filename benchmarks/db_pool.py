@@ -0,0 +1,202 @@
+# ruff: noqa: S603, T201
+"""
+Connection churn and latency of the ASGI app with and without the DB pool.
+
+Drives ``config.asgi.application`` in-process with ``--requests`` token
+authenticated ``GET /api/users/me/`` calls, ``--concurrency`` at a time, once
+with ``CONN_MAX_AGE`` (the previous production setting) and once with the
+psycopg pool. Connection churn is read from PostgreSQL's own session counter
+(``pg_stat_database.sessions``, PostgreSQL 14+). Errors under
+``CONN_MAX_AGE`` are requests refused once the discarded per-thread
+connections exhaust ``max_connections``::
+
+    DATABASE_URL=postgres:///bistro python -m benchmarks.db_pool
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from http import HTTPStatus
+
+MODES = ("conn_max_age", "pool")
+
+
+def configure(mode: str, pool_size: int) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    from django.conf import settings
+
+    settings.ALLOWED_HOSTS = ["localhost"]
+    database = settings.DATABASES["default"]
+    if mode == "pool":
+        database["CONN_MAX_AGE"] = 0
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": pool_size,
+            "max_size": pool_size,
+        }
+    else:
+        database["CONN_MAX_AGE"] = 60
+
+
+def session_counter():
+    """Return a callable reading ``pg_stat_database.sessions``.
+
+    It uses its own connection, outside Django and the pool, so reading the
+    counter doesn't open (or borrow) connections of its own.
+    """
+    import psycopg
+    from django.db import connection
+
+    params = connection.get_connection_params()
+    monitor = psycopg.connect(**params, autocommit=True)
+
+    def sessions_opened() -> int:
+        row = monitor.execute(
+            "SELECT sessions FROM pg_stat_database WHERE datname = current_database()",
+        ).fetchone()
+        assert row is not None  # The current database always has a row.
+        return row[0]
+
+    return sessions_opened
+
+
+def api_token() -> str:
+    from rest_framework.authtoken.models import Token
+
+    from bistro.users.models import User
+
+    user, _ = User.objects.get_or_create(email="bench-pool@example.com")
+    token, _ = Token.objects.get_or_create(user=user)
+    return token.key
+
+
+async def request(application, token: str) -> tuple[int, float]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/users/me/",
+        "raw_path": b"/api/users/me/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"authorization", f"Token {token}".encode()),
+        ],
+        "client": ("10.0.0.1", 40000),
+        "server": ("localhost", 8000),
+    }
+    status = []
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # Django listens for a disconnect until the response is sent.
+        return await asyncio.Future()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    started = time.perf_counter()
+    await application(scope, receive, send)
+    return status[0], time.perf_counter() - started
+
+
+async def load(
+    application,
+    token: str,
+    total: int,
+    concurrency: int,
+) -> list[tuple[int, float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited():
+        async with semaphore:
+            return await request(application, token)
+
+    return await asyncio.gather(*(limited() for _ in range(total)))
+
+
+def run_mode(args: argparse.Namespace) -> None:
+    configure(args.mode, args.pool_size)
+    from asgiref.sync import sync_to_async
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def main():
+        token = await sync_to_async(api_token)()
+        sessions_opened = await sync_to_async(session_counter)()
+        await load(application, token, args.concurrency, args.concurrency)
+        before = await sync_to_async(sessions_opened)()
+        started = time.perf_counter()
+        results = await load(application, token, args.requests, args.concurrency)
+        duration = time.perf_counter() - started
+        after = await sync_to_async(sessions_opened)()
+        return results, duration, after - before
+
+    results, duration, sessions = asyncio.run(main())
+    quantiles = statistics.quantiles([elapsed for _, elapsed in results], n=100)
+    print(
+        json.dumps(
+            {
+                "mode": args.mode,
+                "requests_per_second": len(results) / duration,
+                "errors": sum(status != HTTPStatus.OK for status, _ in results),
+                "connections_opened": sessions,
+                "p50_ms": quantiles[49] * 1000,
+                "p99_ms": quantiles[98] * 1000,
+            },
+        ),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--mode", choices=MODES)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args)
+        return
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    print(
+        f"{'mode':<14}{'req/s':>8}{'errors':>8}{'connections':>13}"
+        f"{'p50 ms':>9}{'p99 ms':>9}",
+    )
+    for mode in MODES:
+        # Each mode runs in a fresh interpreter so no connections are shared.
+        output = subprocess.run(
+            [
+                sys.executable,
+                *("-m", "benchmarks.db_pool", "--mode", mode),
+                f"--requests={args.requests}",
+                f"--concurrency={args.concurrency}",
+                f"--pool-size={args.pool_size}",
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(
+            f"{mode:<14}{result['requests_per_second']:>8.0f}{result['errors']:>8}"
+            f"{result['connections_opened']:>13}"
+            f"{result['p50_ms']:>9.1f}{result['p99_ms']:>9.1f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# ruff: noqa: T201
+"""
+Creating users one by one versus with ``bulk_create_users()``.
+
+Creates a test database and ``--users`` users with ``create_user()`` in a
+loop, then as many with ``UserManager.bulk_create_users()``, all with
+Argon2 hashed passwords (the hashers of ``config.settings.base``), and prints
+the time each took and the users created per second::
+
+    DATABASE_URL=postgres:///bistro python -m benchmarks.import_users
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--settings", default="config.settings.test")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", args.settings)
+    django.setup()
+    from django.conf import settings
+    from django.test.utils import setup_databases
+    from django.test.utils import teardown_databases
+
+    from bistro.users.models import User
+    from config.settings import base
+
+    settings.PASSWORD_HASHERS = base.PASSWORD_HASHERS
+    # Keep away from the database of the test suite.
+    settings.DATABASES["default"].setdefault("TEST", {})["NAME"] = "bistro_benchmark"
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        started = time.perf_counter()
+        for n in range(args.users):
+            User.objects.create_user(f"one-{n}@example.com", f"password-{n}")
+        one_by_one = time.perf_counter() - started
+
+        started = time.perf_counter()
+        User.objects.bulk_create_users(
+            (
+                {"email": f"bulk-{n}@example.com", "password": f"password-{n}"}
+                for n in range(args.users)
+            ),
+            max_workers=args.workers,
+        )
+        bulk = time.perf_counter() - started
+    finally:
+        teardown_databases(databases, verbosity=0)
+
+    print(f"{'':<16}{'seconds':>10}{'users/s':>10}")
+    for name, elapsed in (("create_user", one_by_one), ("bulk", bulk)):
+        print(f"{name:<16}{elapsed:>10.2f}{args.users / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
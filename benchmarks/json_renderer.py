@@ -0,0 +1,117 @@
+# ruff: noqa: T201
+"""
+Rendering and parsing time of large API responses, DRF's JSON vs orjson.
+
+Serializes ``--orders`` in-memory orders (``--items`` each) and as many users
+with the API serializers, without touching the database, then times rendering
+the serialized lists with DRF's renderer and ``bistro.core.renderers``, and
+parsing the rendered orders back with both parsers::
+
+    python -m benchmarks.json_renderer --orders 5000
+"""
+
+import argparse
+import io
+import os
+import timeit
+import uuid
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import django
+
+if TYPE_CHECKING:
+    from rest_framework.utils.serializer_helpers import ReturnList
+
+
+def build_data(orders: int, items: int) -> "dict[str, ReturnList]":
+    from django.test import RequestFactory
+    from django.utils import timezone
+    from rest_framework.serializers import ListSerializer
+
+    from bistro.orders.api.serializers import OrderSerializer
+    from bistro.orders.models import Order
+    from bistro.orders.models import OrderItem
+    from bistro.users.api.serializers import UserSerializer
+    from bistro.users.models import User
+
+    request = RequestFactory().get("/api/orders/", SERVER_NAME="localhost")
+    context = {"request": request}
+    order_list = []
+    for pk in range(1, orders + 1):
+        order = Order(pk=pk, uuid=uuid.uuid4(), table=f"T{pk % 40}")
+        order.placed_at = timezone.now()
+        order._prefetched_objects_cache = {  # type: ignore[attr-defined]  # noqa: SLF001
+            "items": [
+                OrderItem(
+                    order=order,
+                    name=f"Dish {n}",
+                    station="grill",
+                    quantity=n + 1,
+                    unit_price=Decimal("12.50"),
+                )
+                for n in range(items)
+            ],
+        }
+        order_list.append(order)
+    users = [User(pk=pk, name=f"Guest {pk}") for pk in range(1, orders + 1)]
+    # What many=True builds, spelled out so the data is typed as the list it is.
+    return {
+        "orders": ListSerializer(
+            order_list,
+            child=OrderSerializer(),
+            context=context,
+        ).data,
+        "users": ListSerializer(users, child=UserSerializer(), context=context).data,
+    }
+
+
+def best_of(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--settings", default="config.settings.test")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", args.settings)
+    django.setup()
+    from django.conf import settings
+
+    settings.ALLOWED_HOSTS = ["localhost"]
+    from rest_framework import parsers
+    from rest_framework import renderers
+
+    from bistro.core.parsers import JSONParser
+    from bistro.core.renderers import JSONRenderer
+
+    slow, fast = renderers.JSONRenderer(), JSONRenderer()
+    data = build_data(args.orders, args.items)
+    for name, rows in data.items():
+        content = slow.render(rows)
+        assert fast.render(rows) == content
+        drf = best_of(lambda rows=rows: slow.render(rows), args.repeat)
+        orjson = best_of(lambda rows=rows: fast.render(rows), args.repeat)
+        print(
+            f"render {name:<7} ({len(content) / 1024:.0f} KiB): "
+            f"DRF {drf:.1f} ms, orjson {orjson:.1f} ms ({drf / orjson:.1f}x)",
+        )
+
+    content = slow.render(data["orders"])
+    drf = best_of(
+        lambda: parsers.JSONParser().parse(io.BytesIO(content)),
+        args.repeat,
+    )
+    orjson = best_of(lambda: JSONParser().parse(io.BytesIO(content)), args.repeat)
+    print(
+        f"parse  orders  ({len(content) / 1024:.0f} KiB): "
+        f"DRF {drf:.1f} ms, orjson {orjson:.1f} ms ({drf / orjson:.1f}x)",
+    )
+
+
+if __name__ == "__main__":
+    main()
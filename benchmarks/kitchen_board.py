@@ -0,0 +1,130 @@
+# ruff: noqa: S603, T201
+"""
+Idle kitchen board subscribers held by a single uvicorn worker.
+
+Starts ``config.asgi:application`` under uvicorn in a subprocess, opens
+``--connections`` websockets subscribed to a station and reports the
+worker's resident memory per connection and the ping round-trip time
+while all of them are connected::
+
+    python -m benchmarks.kitchen_board --connections 5000
+
+Extra arguments are passed to uvicorn, e.g. ``--ws-per-message-deflate false``
+to see how much of the per-connection memory is zlib compression state.
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import websockets
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def rss_kib(pid: int) -> int:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+    return 0
+
+
+def raise_open_files_limit(connections: int) -> None:
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, connections + 1024)
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+
+async def wait_for_server(url: str) -> None:
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            async with websockets.connect(url):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def run(args: argparse.Namespace, pid: int) -> None:
+    url = f"ws://127.0.0.1:{args.port}/ws/kitchen/?station=grill"
+    await wait_for_server(url)
+    await asyncio.sleep(0.5)
+    baseline = rss_kib(pid)
+
+    started = time.perf_counter()
+    clients = []
+    for offset in range(0, args.connections, args.batch):
+        size = min(args.batch, args.connections - offset)
+        clients += await asyncio.gather(
+            *(websockets.connect(url) for _ in range(size)),
+        )
+    connect_time = time.perf_counter() - started
+    await asyncio.sleep(1)
+    loaded = rss_kib(pid)
+
+    latencies = []
+    for client in clients[:: max(1, len(clients) // 200)]:
+        sent = time.perf_counter()
+        await client.send("ping")
+        await client.recv()
+        latencies.append((time.perf_counter() - sent) * 1000)
+
+    per_connection = (loaded - baseline) / len(clients)
+    print(f"connections:           {len(clients)}")
+    print(f"connect time:          {connect_time:.2f} s")
+    print(f"worker RSS idle:       {baseline / 1024:.1f} MiB")
+    print(f"worker RSS connected:  {loaded / 1024:.1f} MiB")
+    print(f"RSS per connection:    {per_connection:.1f} KiB")
+    print(
+        f"ping p50 / p99:        {statistics.median(latencies):.2f} / "
+        f"{statistics.quantiles(latencies, n=100)[98]:.2f} ms",
+    )
+
+    await asyncio.gather(*(client.close() for client in clients))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--settings", default="config.settings.local")
+    args, uvicorn_args = parser.parse_known_args()
+
+    raise_open_files_limit(args.connections)
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": args.settings}
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "config.asgi:application",
+            "--port",
+            str(args.port),
+            "--log-level",
+            "warning",
+            "--backlog",
+            str(args.batch * 2),
+            *uvicorn_args,
+        ],
+        cwd=BASE_DIR,
+        env=env,
+    )
+    try:
+        asyncio.run(run(args, server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
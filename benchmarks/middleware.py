@@ -0,0 +1,133 @@
+# ruff: noqa: T201
+"""
+Per-middleware time of token authenticated API requests.
+
+Creates a test database and a token, then sends ``--requests`` token
+authenticated ``GET /api/users/me/`` requests through the test client twice:
+once with the stock Django middleware in place of their
+``bistro.core.middleware`` subclasses, and once with ``MIDDLEWARE`` as
+configured. A probe between every two middleware records when the request
+passes it on the way in and out, which gives the time spent in each
+middleware itself (median, microseconds); "view" is everything inside the
+innermost middleware, ``process_view`` hooks included::
+
+    DATABASE_URL=postgres:///bistro python -m benchmarks.middleware
+"""
+
+import argparse
+import os
+import statistics
+import time
+from http import HTTPStatus
+
+import django
+
+PROBE = "benchmarks.middleware.Probe"
+
+
+class Probe:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        entered = request.__dict__.setdefault("probes_entered", [])
+        left = request.__dict__.setdefault("probes_left", [])
+        entered.append(time.perf_counter_ns())
+        response = self.get_response(request)
+        left.append(time.perf_counter_ns())
+        return response
+
+
+def stock(middleware: list[str]) -> list[str]:
+    """``middleware`` with the Django classes in place of their subclasses."""
+    from django.utils.module_loading import import_string
+
+    from bistro.core.middleware import BrowserOnlyMixin
+
+    paths = []
+    for path in middleware:
+        middleware_class = import_string(path)
+        if isinstance(middleware_class, type) and issubclass(
+            middleware_class,
+            BrowserOnlyMixin,
+        ):
+            base = middleware_class.__bases__[-1]
+            path = f"{base.__module__}.{base.__qualname__}"  # noqa: PLW2901
+        paths.append(path)
+    return paths
+
+
+def measure(middleware: list[str], token: str, requests: int) -> dict[str, float]:
+    from django.test import Client
+    from django.test import override_settings
+
+    probed = [PROBE]
+    for path in middleware:
+        probed += [path, PROBE]
+    names = [path.rsplit(".", 1)[-1] for path in middleware]
+    samples: dict[str, list[int]] = {name: [] for name in [*names, "view", "total"]}
+    with override_settings(MIDDLEWARE=probed):
+        client = Client(HTTP_AUTHORIZATION=f"Token {token}")
+        for n in range(requests):
+            response = client.get("/api/users/me/")
+            assert response.status_code == HTTPStatus.OK
+            if n < requests // 10:
+                continue  # Warm-up.
+            # The test client keeps the request the middleware were called with.
+            probes = vars(response.wsgi_request)
+            entered = probes["probes_entered"]
+            left = probes["probes_left"][::-1]
+            # Middleware raising MiddlewareNotUsed leave their probes adjacent.
+            for index, name in enumerate(names):
+                samples[name].append(
+                    entered[index + 1] - entered[index] + left[index] - left[index + 1],
+                )
+            samples["view"].append(left[-1] - entered[-1])
+            samples["total"].append(left[0] - entered[0])
+    return {
+        name: statistics.median(values) / 1000 if values else 0.0
+        for name, values in samples.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--settings", default="config.settings.test")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", args.settings)
+    django.setup()
+    from django.conf import settings
+    from django.test.utils import setup_databases
+    from django.test.utils import teardown_databases
+    from rest_framework.authtoken.models import Token
+
+    from bistro.users.models import User
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    # Keep away from the database of the test suite.
+    settings.DATABASES["default"].setdefault("TEST", {})["NAME"] = "bistro_benchmark"
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        user = User.objects.create(email="pos@example.com", name="POS")
+        token = Token.objects.create(user=user).key
+        lean = list(settings.MIDDLEWARE)
+        results = {
+            "stock": measure(stock(lean), token, args.requests),
+            "lean": measure(lean, token, args.requests),
+        }
+    finally:
+        teardown_databases(databases, verbosity=0)
+
+    names = dict.fromkeys(name for result in results.values() for name in result)
+    print(f"{'median µs':<32}{'stock':>10}{'lean':>10}")
+    for name in names:
+        print(
+            f"{name:<32}"
+            + "".join(f"{result.get(name, 0):>10.1f}" for result in results.values()),
+        )
+
+
+if __name__ == "__main__":
+    main()
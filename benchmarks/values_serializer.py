@@ -0,0 +1,80 @@
+# ruff: noqa: T201
+"""
+List serialization of users, ``UserSerializer`` vs ``UserValuesSerializer``.
+
+Creates a test database with ``--rows`` users (1000 and 10000 by default) and
+times fetching and serializing all of them the way the list endpoint does:
+model instances through ``UserSerializer``, and ``values()`` rows through
+``UserValuesSerializer``. Both outputs are compared first::
+
+    DATABASE_URL=postgres:///bistro python -m benchmarks.values_serializer
+"""
+
+import argparse
+import os
+import timeit
+
+import django
+
+
+def best_of(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def run(rows: int, repeat: int) -> None:
+    from django.test import RequestFactory
+
+    from bistro.users.api.serializers import UserSerializer
+    from bistro.users.api.serializers import UserValuesSerializer
+    from bistro.users.models import User
+
+    User.objects.all().delete()
+    User.objects.bulk_create(
+        User(email=f"guest{n}@example.com", name=f"Guest {n}") for n in range(rows)
+    )
+    request = RequestFactory().get("/api/users/", SERVER_NAME="localhost")
+    context = {"request": request}
+    queryset = User.objects.order_by("pk")
+
+    def model_serializer():
+        return UserSerializer(queryset.all(), many=True, context=context).data
+
+    def values_serializer():
+        rows = UserValuesSerializer.values(queryset.all())
+        return UserValuesSerializer(rows, many=True, context=context).data
+
+    assert model_serializer() == values_serializer()
+    model = best_of(model_serializer, repeat)
+    values = best_of(values_serializer, repeat)
+    print(
+        f"{rows:>6} users: UserSerializer {model:.1f} ms, "
+        f"UserValuesSerializer {values:.1f} ms ({model / values:.1f}x)",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--settings", default="config.settings.test")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", args.settings)
+    django.setup()
+    from django.conf import settings
+    from django.test.utils import setup_databases
+    from django.test.utils import teardown_databases
+
+    settings.ALLOWED_HOSTS = ["localhost"]
+    # Keep away from the database of the test suite.
+    settings.DATABASES["default"].setdefault("TEST", {})["NAME"] = "bistro_benchmark"
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        for rows in args.rows:
+            run(rows, args.repeat)
+    finally:
+        teardown_databases(databases, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import pytest
+from rest_framework.test import APIClient
 
 from bistro.users.models import User
 from bistro.users.tests.factories import UserFactory
@@ -12,3 +13,10 @@ def _media_storage(settings, tmpdir) -> None:
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
@@ -0,0 +1,27 @@
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from rest_framework.authentication import BaseAuthentication
+
+
+class BatchAuthentication(BaseAuthentication):
+    """
+    The user and token of the batch a sub-request belongs to.
+
+    ``BatchView`` authenticates a batch once and hands the result to its
+    sub-requests as ``batch_auth``, an attribute clients can't set.
+    """
+
+    def authenticate(self, request):
+        # Request proxies the attributes of the Django request.
+        return getattr(request, "batch_auth", None)
+
+
+class BatchAuthenticationScheme(OpenApiAuthenticationExtension):
+    # Not a scheme of its own, clients authenticate the batch.
+    target_class = "bistro.core.api.authentication.BatchAuthentication"
+    name: list[str] = []
+
+    def get_security_requirement(self, auto_schema):
+        return None
+
+    def get_security_definition(self, auto_schema):
+        return []
@@ -0,0 +1,53 @@
+from rest_framework import serializers
+
+# Upper bound on the number of sub-requests of a single batch.
+BATCH_MAX_REQUESTS = 25
+
+# Headers a sub-request may set. The others (Host, X-Forwarded-*,
+# Authorization, ...) are the batch's.
+SUB_REQUEST_HEADERS = frozenset(
+    {
+        "accept",
+        "accept-language",
+        "if-match",
+        "if-modified-since",
+        "if-none-match",
+        "if-unmodified-since",
+    },
+)
+
+
+class SubRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=["GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"],
+        default="GET",
+    )
+    path = serializers.RegexField(r"^/api/", max_length=2048)
+    headers = serializers.DictField(child=serializers.CharField(), default=dict)
+    body = serializers.JSONField(required=False)
+
+    def validate_headers(self, value):
+        if unknown := sorted(
+            name for name in value if name.lower() not in SUB_REQUEST_HEADERS
+        ):
+            msg = f"Headers not allowed in sub-requests: {', '.join(unknown)}."
+            raise serializers.ValidationError(msg)
+        return value
+
+
+class SubResponseSerializer(serializers.Serializer):
+    status = serializers.IntegerField()
+    headers = serializers.DictField(child=serializers.CharField())
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchSerializer(serializers.Serializer):
+    # many=True calls many_init(), which the stubs let take the list's options.
+    requests = SubRequestSerializer.many_init(
+        allow_empty=False,
+        max_length=BATCH_MAX_REQUESTS,
+    )
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    responses = SubResponseSerializer(many=True)
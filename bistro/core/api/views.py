@@ -0,0 +1,174 @@
+"""
+Batched API requests.
+
+POS terminals start up with a dozen API calls. ``BatchView`` takes them as
+one request, resolves and calls the API views directly, without the
+middleware stack, with the batch's authentication (its user and token are
+handed to every sub-request through ``BatchAuthentication``, so credentials
+are checked once) and returns their responses in order. Views run in the
+transaction ``ATOMIC_REQUESTS`` gives them, as they would on their own, so
+failed writes roll back.
+
+Consecutive safe sub-requests run concurrently, ``API_BATCH_MAX_WORKERS`` at
+a time, each in autocommit on its own thread's database connection. Unsafe
+ones are barriers: they run one at a time (in the transaction of their view),
+after everything before them, and pin the reads after them to the primary.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.urls import Resolver404
+from django.urls import resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from bistro.core.db import pin_to_primary
+from bistro.core.db import primary_reads
+from bistro.core.transaction import SAFE_METHODS
+from bistro.core.transaction import non_atomic
+
+from .serializers import BatchResponseSerializer
+from .serializers import BatchSerializer
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the batch's own body, not a sub-request's.
+BODY_META = ("CONTENT_LENGTH", "CONTENT_TYPE", "HTTP_CONTENT_LENGTH", "wsgi.input")
+
+
+class SubRequest(WSGIRequest):
+    # The user and token of the batch, for BatchAuthentication.
+    batch_auth: tuple[Any, Any]
+
+
+class BatchView(APIView):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Writes run in the transactions of the views they call.
+        return non_atomic(super().as_view(**initkwargs))
+
+    @extend_schema(request=BatchSerializer, responses=BatchResponseSerializer)
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        sub_requests = serializer.validated_data["requests"]
+
+        responses = []
+        # Reads go to replicas until a sub-request writes.
+        with primary_reads(pinned=False):
+            group: list[dict] = []
+            for sub_request in sub_requests:
+                if sub_request["method"] in SAFE_METHODS:
+                    group.append(sub_request)
+                    continue
+                responses += self.run_concurrently(request, group)
+                group = []
+                pin_to_primary()
+                responses.append(self.run(request, sub_request))
+            responses += self.run_concurrently(request, group)
+        return Response(
+            status=status.HTTP_200_OK,
+            data={"responses": responses},
+        )
+
+    def run_concurrently(self, request, sub_requests: list[dict]) -> list[dict]:
+        max_workers = settings.API_BATCH_MAX_WORKERS
+        if len(sub_requests) < 2 or max_workers < 2:  # noqa: PLR2004
+            return [self.run(request, sub_request) for sub_request in sub_requests]
+
+        def run_in_thread(context, sub_request):
+            try:
+                return context.run(self.run, request, sub_request)
+            finally:
+                # Connections are per thread and the threads are discarded.
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(
+                    run_in_thread,
+                    [contextvars.copy_context() for _ in sub_requests],
+                    sub_requests,
+                ),
+            )
+
+    def run(self, request, sub_request: dict) -> dict:
+        sub = self.build_request(request, sub_request)
+        try:
+            match = resolve(sub.path_info)
+        except Resolver404:
+            match = None
+        if (
+            match is None
+            or match.namespace != "api"
+            or getattr(match.func, "cls", None) is type(self)
+        ):
+            return {
+                "status": HTTPStatus.NOT_FOUND,
+                "headers": {},
+                "body": {"detail": "Not found."},
+            }
+        # As the request handler would, for views not opting out.
+        view = BaseHandler().make_view_atomic(match.func)
+        try:
+            response = view(sub, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Batched %s %s failed", sub.method, sub.path)
+            return {
+                "status": HTTPStatus.INTERNAL_SERVER_ERROR,
+                "headers": {},
+                "body": None,
+            }
+        return self.encode_response(response)
+
+    def build_request(self, request, sub_request: dict) -> SubRequest:
+        path, _, query_string = sub_request["path"].partition("?")
+        body = b""
+        if "body" in sub_request:
+            body = json.dumps(sub_request["body"]).encode()
+        environ = {
+            key: value for key, value in request.META.items() if key not in BODY_META
+        }
+        environ.update(
+            {
+                "REQUEST_METHOD": sub_request["method"],
+                "PATH_INFO": path,
+                "QUERY_STRING": query_string,
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(body)),
+                "wsgi.input": io.BytesIO(body),
+                # Not in the META of ASGI requests.
+                "wsgi.url_scheme": request.scheme,
+            },
+        )
+        for name, value in sub_request["headers"].items():
+            environ[f"HTTP_{name.upper().replace('-', '_')}"] = value
+        sub = SubRequest(environ)
+        # Authenticated once, for the whole batch (see BatchAuthentication).
+        sub.batch_auth = (request.user, request.auth)
+        return sub
+
+    def encode_response(self, response) -> dict:
+        if hasattr(response, "data"):
+            body = response.data
+        else:
+            body = response.content.decode(response.charset) or None
+        return {
+            "status": response.status_code,
+            "headers": dict(response.items()),
+            "body": body,
+        }
@@ -0,0 +1,260 @@
+"""
+Publish/subscribe backplane for websocket events.
+
+Every ASGI worker holds its own websockets, so an event raised in one worker
+is published to the backplane and each worker delivers it to the sockets it
+holds. ``BROADCAST_URL`` selects the backend: ``redis://`` / ``rediss://``
+shares events between all workers and nodes using the same Redis server,
+``memory://`` keeps them inside the current process (tests and local runs).
+
+Publishing is thread-safe and never blocks on the network: messages are
+buffered and a background thread sends whatever accumulated since the last
+round-trip as one pipeline. Subscribing happens on the event loop; a worker
+keeps a single backplane connection no matter how many sockets it serves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import logging
+import threading
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from typing import Protocol
+
+import redis
+import redis.asyncio
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[str, str], None]
+
+
+class BroadcastBackend(Protocol):
+    def publish(self, messages: list[tuple[str, str]]) -> None: ...
+
+    async def subscribe(self, channel: str) -> None: ...
+
+    async def unsubscribe(self, channel: str) -> None: ...
+
+    def listen(self) -> AsyncIterator[tuple[str, str]]: ...
+
+    async def close(self) -> None: ...
+
+
+class MemoryBackend:
+    """
+    In-process stand-in for Redis.
+
+    Backends sharing a ``hub`` see each other's messages, the way workers
+    sharing a Redis server do.
+    """
+
+    def __init__(self, hub: dict[str, set[MemoryBackend]] | None = None):
+        self.hub = _memory_hub if hub is None else hub
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[tuple[str, str]] | None = None
+
+    def publish(self, messages: list[tuple[str, str]]) -> None:
+        for channel, data in messages:
+            for backend in list(self.hub.get(channel, ())):
+                backend.deliver(channel, data)
+
+    def deliver(self, channel: str, data: str) -> None:
+        loop, queue = self._loop, self._queue
+        if loop is not None and queue is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(queue.put_nowait, (channel, data))
+
+    async def subscribe(self, channel: str) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+        self.hub.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, channel: str) -> None:
+        backends = self.hub.get(channel)
+        if backends is not None:
+            backends.discard(self)
+            if not backends:
+                del self.hub[channel]
+
+    async def listen(self) -> AsyncIterator[tuple[str, str]]:
+        assert self._queue is not None  # subscribe() runs first
+        while True:
+            yield await self._queue.get()
+
+    async def close(self) -> None:
+        for channel in [c for c, backends in self.hub.items() if self in backends]:
+            await self.unsubscribe(channel)
+
+
+_memory_hub: dict[str, set[MemoryBackend]] = {}
+
+
+class RedisBackend:
+    """Redis pub/sub; one connection per worker for subscriptions."""
+
+    reconnect_delay = 1.0
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client: redis.Redis | None = None
+        self._pubsub: redis.asyncio.client.PubSub | None = None
+
+    def publish(self, messages: list[tuple[str, str]]) -> None:
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        with self._client.pipeline(transaction=False) as pipe:
+            for channel, data in messages:
+                pipe.publish(channel, data)
+            pipe.execute()
+
+    def _get_pubsub(self) -> redis.asyncio.client.PubSub:
+        if self._pubsub is None:
+            client = redis.asyncio.Redis.from_url(self.url, decode_responses=True)
+            self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+        return self._pubsub
+
+    async def subscribe(self, channel: str) -> None:
+        await self._get_pubsub().subscribe(channel)
+
+    async def unsubscribe(self, channel: str) -> None:
+        await self._get_pubsub().unsubscribe(channel)
+
+    async def listen(self) -> AsyncIterator[tuple[str, str]]:
+        pubsub = self._get_pubsub()
+        while True:
+            try:
+                message = await pubsub.get_message(timeout=None)
+            except redis.ConnectionError:
+                logger.warning("Broadcast connection lost, reconnecting")
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            if message is not None and message["type"] == "message":
+                yield message["channel"], message["data"]
+
+    async def close(self) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+def backend_from_url(url: str) -> BroadcastBackend:
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    msg = f"Unsupported BROADCAST_URL scheme: {url}"
+    raise ValueError(msg)
+
+
+class Broadcast:
+    """A worker's handle on the backplane."""
+
+    # Upper bound on the number of messages sent in one round-trip.
+    max_batch = 500
+    # Seconds to wait before listening again after the backend failed.
+    reconnect_delay = 1.0
+
+    def __init__(self, backend: BroadcastBackend):
+        self.backend = backend
+        self._pending: list[tuple[str, str]] = []
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._publisher: threading.Thread | None = None
+        self._listeners: dict[str, set[Listener]] = {}
+        self._reader: asyncio.Task | None = None
+
+    def publish(self, channel: str, data: str) -> None:
+        """Queue ``data`` for every subscriber of ``channel`` on any worker."""
+        with self._condition:
+            self._pending.append((channel, data))
+            if self._publisher is None:
+                self._publisher = threading.Thread(
+                    target=self._run_publisher,
+                    name="broadcast-publisher",
+                    daemon=True,
+                )
+                self._publisher.start()
+            self._condition.notify()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until queued messages are handed to the backend."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight,
+                timeout,
+            )
+
+    def _run_publisher(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                batch = self._pending[: self.max_batch]
+                del self._pending[: self.max_batch]
+                self._in_flight = len(batch)
+            try:
+                self.backend.publish(batch)
+            except Exception:
+                logger.exception("Dropped %d broadcast messages", len(batch))
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    async def subscribe(self, channel: str, listener: Listener) -> None:
+        """Call ``listener(channel, data)`` on this loop for each message."""
+        listeners = self._listeners.setdefault(channel, set())
+        listeners.add(listener)
+        if len(listeners) == 1:
+            await self.backend.subscribe(channel)
+        loop = asyncio.get_running_loop()
+        if self._reader is None or self._reader.get_loop() is not loop:
+            self._reader = loop.create_task(self._read())
+
+    async def unsubscribe(self, channel: str, listener: Listener) -> None:
+        listeners = self._listeners.get(channel)
+        if listeners is None:
+            return
+        listeners.discard(listener)
+        if not listeners:
+            del self._listeners[channel]
+            await self.backend.unsubscribe(channel)
+
+    async def _read(self) -> None:
+        while True:
+            try:
+                async for channel, data in self.backend.listen():
+                    self._dispatch(channel, data)
+            except Exception:
+                logger.exception("Broadcast connection failed, reconnecting")
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        for listener in list(self._listeners.get(channel, ())):
+            try:
+                listener(channel, data)
+            except Exception:
+                logger.exception("Broadcast listener failed for %s", channel)
+
+    async def close(self) -> None:
+        """Send queued messages and drop the backplane connection."""
+        await asyncio.to_thread(self.flush, 5)
+        if self._reader is not None:
+            self._reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reader
+            self._reader = None
+        self._listeners.clear()
+        await self.backend.close()
+
+
+@functools.cache
+def get_broadcast() -> Broadcast:
+    return Broadcast(backend_from_url(settings.BROADCAST_URL))
@@ -0,0 +1,65 @@
+"""
+Deploy checks of the middleware subclasses of ``bistro.core.middleware``.
+
+Django's ``security.W002`` and ``security.W003`` look for the literal paths
+of ``XFrameOptionsMiddleware`` and ``CsrfViewMiddleware`` in ``MIDDLEWARE``
+and, finding neither, skip ``security.W016`` and ``security.W019`` too. They
+are silenced in the settings and replaced by these, which accept subclasses.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags
+from django.core.checks import Warning  # noqa: A004
+from django.core.checks import register
+from django.middleware.clickjacking import XFrameOptionsMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.module_loading import import_string
+
+W002 = Warning(
+    "No XFrameOptionsMiddleware in MIDDLEWARE, pages will be served without "
+    "an 'x-frame-options' header.",
+    id="core.W002",
+)
+
+W003 = Warning(
+    "No CsrfViewMiddleware in MIDDLEWARE, requests aren't protected against "
+    "cross-site request forgery.",
+    id="core.W003",
+)
+
+W016 = Warning(
+    "CsrfViewMiddleware is in MIDDLEWARE, but CSRF_COOKIE_SECURE isn't True.",
+    id="core.W016",
+)
+
+W019 = Warning(
+    "XFrameOptionsMiddleware is in MIDDLEWARE, but X_FRAME_OPTIONS isn't 'DENY'.",
+    id="core.W019",
+)
+
+
+def uses_middleware(middleware_class) -> bool:
+    """Whether ``MIDDLEWARE`` contains ``middleware_class`` or a subclass."""
+    for path in settings.MIDDLEWARE:
+        candidate = import_string(path)
+        if isinstance(candidate, type) and issubclass(candidate, middleware_class):
+            return True
+    return False
+
+
+@register(Tags.security, deploy=True)
+def check_xframe_options_middleware(app_configs, **kwargs):
+    if not uses_middleware(XFrameOptionsMiddleware):
+        return [W002]
+    if settings.X_FRAME_OPTIONS != "DENY":
+        return [W019]
+    return []
+
+
+@register(Tags.security, deploy=True)
+def check_csrf_middleware(app_configs, **kwargs):
+    if not uses_middleware(CsrfViewMiddleware):
+        return [W003]
+    if not settings.CSRF_USE_SESSIONS and settings.CSRF_COOKIE_SECURE is not True:
+        return [W016]
+    return []
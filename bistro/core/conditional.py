@@ -0,0 +1,130 @@
+"""
+Conditional GETs for DRF viewsets.
+
+``ConditionalGetMixin`` derives validators from ``last_modified_field`` before
+anything is serialized: an object's ETag and Last-Modified come from its own
+timestamp, a list's ETag from the rows of the page (their pk and timestamp,
+or the whole row for ``values()`` rows) and its links, so it costs no query
+beyond the page's own. Matching ``If-None-Match`` / ``If-Modified-Since``
+requests are answered with 304 without serializing or rendering.
+
+Changes that bypass ``Model.save()`` (``QuerySet.update()``, raw SQL) don't
+move the timestamp and must bump it themselves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+from typing import Protocol
+from typing import cast
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from rest_framework.generics import GenericAPIView as _GenericAPIViewBase
+else:
+    _GenericAPIViewBase = object
+
+SAFE_CONDITIONAL_METHODS = frozenset({"GET", "HEAD"})
+
+
+class LinkedPagination(Protocol):
+    """The page links every paginator of DRF's has."""
+
+    def get_next_link(self) -> str | None: ...
+
+    def get_previous_link(self) -> str | None: ...
+
+
+class ConditionalGetMixin(_GenericAPIViewBase):
+    # Timestamp updated on every change of a row, e.g. TimeStampedModel's.
+    last_modified_field = "modified"
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        version = [self.get_row_version(row) for row in rows]
+        if page is not None:
+            # Rows added or removed around the page change its links.
+            paginator = cast("LinkedPagination", self.paginator)
+            version += [paginator.get_next_link(), paginator.get_previous_link()]
+        etag = self.get_etag(request, *version)
+        # No Last-Modified: deleting a row doesn't move the latest timestamp.
+        return self.conditional_response(
+            request,
+            lambda: self.list_response(rows, paginated=page is not None),
+            etag=etag,
+        )
+
+    def list_response(self, rows, *, paginated: bool) -> Response:
+        data = self.get_serializer(rows, many=True).data
+        if paginated:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def get_row_version(self, row):
+        if isinstance(row, dict):
+            # values() rows are all their representation is built from.
+            return tuple(row.items())
+        return (row.pk, getattr(row, self.last_modified_field))
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional_response(
+            request,
+            lambda: Response(self.get_serializer(instance).data),
+            **self.get_object_validators(request, instance),
+        )
+
+    def get_object_validators(self, request, instance) -> dict:
+        """ETag and Last-Modified of ``instance``, also for custom actions."""
+        last_modified = getattr(instance, self.last_modified_field)
+        return {
+            "etag": self.get_etag(request, instance.pk, last_modified),
+            "last_modified": last_modified,
+        }
+
+    def get_etag(self, request, *version) -> str:
+        # The representation also depends on the URL (action, pages, filters),
+        # the negotiated format and the requesting user.
+        key = repr(
+            (
+                type(self).__qualname__,
+                request.get_full_path(),
+                request.META.get("HTTP_ACCEPT"),
+                request.user.pk,
+                *version,
+            ),
+        )
+        return f'"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"'
+
+    def conditional_response(
+        self,
+        request,
+        respond: Callable[[], Response],
+        *,
+        etag: str,
+        last_modified: datetime | None = None,
+    ):
+        # HTTP dates have whole seconds.
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = None
+        if request.method in SAFE_CONDITIONAL_METHODS:
+            response = get_conditional_response(
+                request,
+                etag=etag,
+                last_modified=timestamp,
+            )
+        if response is None:
+            response = respond()
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        return response
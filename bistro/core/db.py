@@ -0,0 +1,130 @@
+"""
+Read-replica routing.
+
+``DATABASE_REPLICAS`` lists the database aliases that replicate ``default``.
+``ReplicaRouter`` sends reads to one of them and writes to ``default``. Once
+something was written, or while a request with an unsafe method is handled
+(see ``ReplicaMiddleware``), reads stay on ``default`` too so they see that
+write. Replicas lagging more than ``DATABASE_REPLICA_MAX_LAG`` seconds behind,
+or failing the check, are skipped until the next check; with no replica left
+reads fall back to ``default``.
+
+The pin lives in a context variable: it covers the current request, or the
+rest of the current thread / task outside of requests (management commands,
+shell).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import random
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import DatabaseError
+from django.db import connections
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+_pinned: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+# Seconds since the last replayed transaction, or 0 when the replica has
+# replayed everything it received (an idle primary isn't lag).
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+"""
+
+
+def pin_to_primary() -> None:
+    """Send the reads of the current request / context to the primary."""
+    _pinned.set(True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+@contextlib.contextmanager
+def primary_reads(*, pinned: bool = True) -> Iterator[None]:
+    """Pin (or unpin) reads for the duration of the block."""
+    token = _pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def replica_lag(alias: str) -> float:
+    """Replication lag of ``alias`` in seconds; 0 for non-PostgreSQL aliases."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(REPLICA_LAG_SQL)
+        return float(cursor.fetchone()[0])
+
+
+class ReplicaRouter:
+    def __init__(self):
+        # alias -> (monotonic time of the next check, usable)
+        self._status: dict[str, tuple[float, bool]] = {}
+
+    def db_for_read(self, model, **hints):
+        if _pinned.get():
+            return DEFAULT_DB_ALIAS
+        replicas = self.usable_replicas()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS  # noqa: S311
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:  # noqa: SLF001
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema through replication.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+    def usable_replicas(self) -> list[str]:
+        now = time.monotonic()
+        usable = []
+        for alias in settings.DATABASE_REPLICAS:
+            next_check, ok = self._status.get(alias, (0.0, False))
+            if now >= next_check:
+                ok = self.check(alias)
+                interval = settings.DATABASE_REPLICA_CHECK_INTERVAL
+                self._status[alias] = (now + interval, ok)
+            if ok:
+                usable.append(alias)
+        return usable
+
+    def check(self, alias: str) -> bool:
+        try:
+            lag = replica_lag(alias)
+        except DatabaseError:
+            logger.warning("Replica %s is unavailable", alias, exc_info=True)
+            connections[alias].close()
+            return False
+        if lag > settings.DATABASE_REPLICA_MAX_LAG:
+            logger.warning("Replica %s lags %.1f s behind", alias, lag)
+            return False
+        return True
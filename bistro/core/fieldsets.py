@@ -0,0 +1,110 @@
+"""
+Sparse fieldsets.
+
+Clients choose the fields of a representation with ``?fields=name,url`` (only
+these) and ``?omit=url`` (all but these). ``SparseFieldsMixin`` prunes the
+fields of a serializer accordingly, and ``SparseQuerysetMixin`` narrows a
+view's queryset to the columns the remaining fields are built from, with
+``only()`` for model instances and ``values()`` for a ``ValuesSerializer``.
+
+Only the top level serializer of reads (GET, HEAD) is pruned, writes always
+validate and return every field.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import cast
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+
+from .serializers import ValuesSerializer
+from .serializers import model_columns
+from .transaction import SAFE_METHODS
+
+if TYPE_CHECKING:
+    from rest_framework.generics import GenericAPIView as _GenericAPIViewBase
+    from rest_framework.serializers import ModelSerializer
+    from rest_framework.serializers import Serializer as _SerializerBase
+else:
+    _GenericAPIViewBase = _SerializerBase = object
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+PARAMETERS = [
+    OpenApiParameter(
+        FIELDS_PARAM,
+        OpenApiTypes.STR,
+        description="Comma separated fields to include, all by default.",
+    ),
+    OpenApiParameter(
+        OMIT_PARAM,
+        OpenApiTypes.STR,
+        description="Comma separated fields to leave out.",
+    ),
+]
+
+
+def requested_fields(request, available) -> list[str] | None:
+    """
+    The names of ``available`` fields ``request`` asks for.
+
+    ``None`` when it doesn't choose, ``ValidationError`` for unknown names.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = getattr(request, "query_params", request.GET)
+    chosen = {
+        param: {name for name in params[param].split(",") if name}
+        for param in (FIELDS_PARAM, OMIT_PARAM)
+        if param in params
+    }
+    if not chosen:
+        return None
+    errors = {
+        param: [f"Unknown fields: {', '.join(sorted(unknown))}."]
+        for param, names in chosen.items()
+        if (unknown := names.difference(available))
+    }
+    if errors:
+        raise serializers.ValidationError(errors)
+    included = chosen.get(FIELDS_PARAM, available)
+    omitted = chosen.get(OMIT_PARAM, set())
+    return [name for name in available if name in included and name not in omitted]
+
+
+class SparseFieldsMixin(_SerializerBase):
+    """Prunes the fields of a serializer to the ones the request asks for."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+        names = requested_fields(self.context.get("request"), list(fields))
+        if names is None:
+            return fields
+        return {name: fields[name] for name in names}
+
+
+class SparseQuerysetMixin(_GenericAPIViewBase):
+    """Selects the columns of the (pruned) serializer fields only."""
+
+    def narrow_queryset(self, queryset):
+        serializer = self.get_serializer_class()(context={"request": self.request})
+        if isinstance(serializer, ValuesSerializer):
+            return serializer.values(queryset, serializer.context)
+        if self.request.method not in SAFE_METHODS:
+            # Writes save, and return, every field.
+            return queryset
+        # Serializers other than ValuesSerializer are model serializers.
+        columns = ["pk", *model_columns(cast("ModelSerializer", serializer))]
+        # Conditional GETs read the validators of the instance.
+        if last_modified_field := getattr(self, "last_modified_field", None):
+            columns.append(last_modified_field)
+        return queryset.only(*dict.fromkeys(columns))
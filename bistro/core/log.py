@@ -0,0 +1,322 @@
+"""
+Logging off the request path.
+
+Structured logging
+------------------
+
+A ``StreamHandler`` writes on the thread logging, so a slow reader of
+stdout (the container's log driver) stalls requests. ``BoundedQueueHandler``
+puts records in a bounded queue instead, to be formatted and written by
+the handlers of its ``QueueListener``'s thread. When the queue is full,
+records are dropped rather than waited on, and counted: a warning with the
+count is queued once there's room again.
+
+``JSONFormatter`` writes a record as one line of JSON, with the ID of the
+request it was logged in and the milliseconds since that request started,
+which ``RequestContextFilter`` adds from the context ``request_context()``
+(``RequestIDMiddleware``) sets.
+
+Error mail digests
+------------------
+
+``AdminEmailHandler`` renders and sends an email for every error it is
+given, on the thread logging it: during an outage each failing request also
+waits for the mail relay, and admins get thousands of identical emails.
+
+``ErrorDigestHandler`` groups errors by fingerprint (the logger, the
+exception type and where it was raised, or the unformatted message) and
+mails a digest of the groups every ``interval`` seconds from a thread of
+its own. A digest has the report of the first error of each group, and how
+often it happened since; groups already reported in the last
+``repeat_interval`` seconds are only counted. At most ``max_groups`` groups
+are collected per digest, further errors are counted as dropped. Logging
+threads only render the report of a new group, never wait for mail.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import traceback
+from contextvars import ContextVar
+from copy import copy
+from datetime import UTC
+from datetime import datetime
+from logging.handlers import QueueHandler
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.utils.log import AdminEmailHandler
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.views.debug import ExceptionReporter
+
+# The ID of the current request and the time.time() it started at.
+_request: ContextVar[tuple[str, float] | None] = ContextVar("request", default=None)
+
+# The attributes of every LogRecord, the others were passed in ``extra``.
+RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)),
+) | {"message", "asctime", "request_id", "request_ms"}
+
+
+@contextlib.contextmanager
+def request_context(request_id: str) -> Iterator[None]:
+    """Tag the records logged in the block with ``request_id``."""
+    token = _request.set((request_id, time.time()))
+    try:
+        yield
+    finally:
+        _request.reset(token)
+
+
+class RequestContextFilter(logging.Filter):
+    """Add ``request_id`` and ``request_ms`` to records logged in requests."""
+
+    def filter(self, record):
+        context = _request.get()
+        if context is None:
+            record.request_id = record.request_ms = None
+        else:
+            record.request_id = context[0]
+            record.request_ms = round((record.created - context[1]) * 1000, 1)
+        return True
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+        # Total, for monitoring.
+        self.dropped_total = 0
+        # Of the process the listener runs in.
+        self.pid = None
+
+    def emit(self, record):
+        # dictConfig() sets self.listener but leaves starting it to us, in
+        # every process, as forking only copies the thread that forked.
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            if (listener := getattr(self, "listener", None)) is not None:
+                listener.start()
+        super().emit(record)
+
+    def enqueue(self, record):
+        # Under self.lock, held by handle().
+        try:
+            if self.dropped:
+                self.queue.put_nowait(self.dropped_record())
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self.dropped_total += 1
+
+    def dropped_record(self) -> logging.LogRecord:
+        return logging.LogRecord(
+            __name__,
+            logging.WARNING,
+            __file__,
+            0,
+            "Dropped %d log records, the log queue was full.",
+            (self.dropped,),
+            None,
+        )
+
+    def prepare(self, record):
+        # Unlike QueueHandler, leave the formatting to the listener's
+        # handlers, only merging what can't cross threads as it is.
+        record = copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        # Write what's queued.
+        self.acquire()
+        try:
+            listener = getattr(self, "listener", None)
+            if listener is not None and self.pid == os.getpid():
+                self.pid = None
+                listener.stop()
+        finally:
+            self.release()
+        super().close()
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "request_ms": getattr(record, "request_ms", None),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        entry.update(
+            (name, value)
+            for name, value in vars(record).items()
+            if name not in RECORD_ATTRIBUTES
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+@dataclasses.dataclass
+class ErrorGroup:
+    subject: str
+    report: str | None
+    count: int = 0
+
+
+class ErrorDigestHandler(AdminEmailHandler):
+    # Set by AdminEmailHandler, which django-stubs doesn't declare.
+    reporter_class: type[ExceptionReporter]
+
+    def __init__(
+        self,
+        interval: float = 60,
+        repeat_interval: float = 3600,
+        max_groups: int = 20,
+        email_backend=None,
+        reporter_class=None,
+    ):
+        super().__init__(email_backend=email_backend, reporter_class=reporter_class)
+        self.interval = interval
+        self.repeat_interval = repeat_interval
+        self.max_groups = max_groups
+        self.groups: dict[tuple, ErrorGroup] = {}
+        self.dropped = 0
+        # Fingerprint -> monotonic time its report was last mailed.
+        self.reported: dict[tuple, float] = {}
+        self.thread: threading.Thread | None = None
+        self.stopped = threading.Event()
+
+    def emit(self, record):
+        if not settings.ADMINS:
+            return
+        # handle() holds self.lock, as flush() does to take the groups.
+        fingerprint = self.fingerprint(record)
+        group = self.groups.get(fingerprint)
+        if group is None:
+            if len(self.groups) >= self.max_groups:
+                self.dropped += 1
+                return
+            group = self.groups[fingerprint] = self.group(record, fingerprint)
+        group.count += 1
+        self.start()
+
+    def fingerprint(self, record) -> tuple:
+        if record.exc_info and record.exc_info[2] is not None:
+            exc_type, _, tb = record.exc_info
+            # Where it was raised, the innermost frame.
+            *_, (frame, lineno) = traceback.walk_tb(tb)
+            return (
+                record.name,
+                exc_type.__qualname__,
+                frame.f_code.co_filename,
+                lineno,
+            )
+        return (record.name, record.levelno, str(record.msg))
+
+    def group(self, record, fingerprint: tuple) -> ErrorGroup:
+        try:
+            request = record.request
+        except AttributeError:
+            request = None
+        subject = self.format_subject(f"{record.levelname}: {record.getMessage()}")
+        last_reported = self.reported.get(fingerprint)
+        if (
+            last_reported is not None
+            and time.monotonic() - last_reported < self.repeat_interval
+        ):
+            return ErrorGroup(subject, report=None)
+
+        no_exc_record = copy(record)
+        no_exc_record.exc_info = None
+        no_exc_record.exc_text = None
+        exc_type, exc_value, tb = record.exc_info or (None, record.getMessage(), None)
+        reporter = self.reporter_class(request, exc_type, exc_value, tb, is_email=True)
+        report = f"{self.format(no_exc_record)}\n\n{reporter.get_traceback_text()}"
+        return ErrorGroup(subject, report=report)
+
+    def start(self) -> None:
+        # Also after a fork, which only copies the thread that forked.
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(
+                target=self.run,
+                name="error-digest",
+                daemon=True,
+            )
+            self.thread.start()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Mail the digest of the errors collected so far."""
+        self.acquire()
+        try:
+            groups, self.groups = self.groups, {}
+            dropped, self.dropped = self.dropped, 0
+        finally:
+            self.release()
+        if not groups:
+            return
+        now = time.monotonic()
+        for fingerprint, group in groups.items():
+            if group.report is not None:
+                self.reported[fingerprint] = now
+        # Forget what wasn't seen for a while.
+        self.reported = {
+            fingerprint: reported
+            for fingerprint, reported in self.reported.items()
+            if now - reported < self.repeat_interval
+        }
+        self.send_mail(*self.digest(groups, dropped), fail_silently=True)
+
+    def digest(self, groups: dict[tuple, ErrorGroup], dropped: int) -> tuple[str, str]:
+        total = sum(group.count for group in groups.values()) + dropped
+        first = next(iter(groups.values()))
+        subject = f"{total} errors: {first.subject}" if total > 1 else first.subject
+        sections = []
+        for group in groups.values():
+            section = f"{group.subject} ({group.count}x)"
+            if group.report is None:
+                section += "\nReported in a previous digest."
+            else:
+                section += f"\n\n{group.report}"
+            sections.append(section)
+        if dropped:
+            sections.append(f"{dropped} more errors, beyond {self.max_groups} kinds.")
+        separator = "\n\n" + "=" * 79 + "\n\n"
+        return subject, separator.join(sections)
+
+    def close(self) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.flush()
+        super().close()
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from bistro.core.schema import write_schema_artifacts
+
+
+class Command(BaseCommand):
+    help = "Write the OpenAPI schema served at /api/schema/ to SCHEMA_ARTIFACTS_DIR."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.SCHEMA_ARTIFACTS_DIR,
+            help="Directory to write to (default: SCHEMA_ARTIFACTS_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        if not options["output"]:
+            msg = "Set SCHEMA_ARTIFACTS_DIR or pass --output."
+            raise CommandError(msg)
+        manifest = write_schema_artifacts(Path(options["output"]))
+        for filename in manifest.values():
+            self.stdout.write(f"Wrote {filename}")
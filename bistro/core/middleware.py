@@ -0,0 +1,419 @@
+import contextlib
+import functools
+import logging
+import re
+import uuid
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+from typing import cast
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_started
+from django.db import connections
+from django.middleware import clickjacking
+from django.middleware import common
+from django.middleware import csrf
+from django.middleware import locale
+from whitenoise import middleware as whitenoise
+
+from . import switches
+from .db import primary_reads
+from .log import request_context
+from .transaction import SAFE_METHODS
+from .transaction import TransactionCounter
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from collections.abc import Callable
+
+    from django.http import HttpRequest
+    from django.http import HttpResponseBase
+    from django.utils.deprecation import MiddlewareMixin as _MiddlewareBase
+
+    AsyncGetResponse = Callable[[HttpRequest], Awaitable[HttpResponseBase]]
+else:
+    _MiddlewareBase = object
+
+logger = logging.getLogger(__name__)
+
+
+class SyncAndAsyncMiddleware:
+    """
+    Middleware running in the mode of the handler it wraps.
+
+    Under ASGI, sync-only middleware cost two context switches per request,
+    into a thread and back; subclasses implement ``call()`` and ``acall()``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.acall(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def acall(self, request):
+        raise NotImplementedError
+
+
+class RequestIDMiddleware(SyncAndAsyncMiddleware):
+    """
+    Tag the records logged in each request with its ID.
+
+    The ID is the request's ``X-Request-ID`` header, set by the proxy in front
+    of the site, or a new one; it is returned in the ``X-Request-ID`` response
+    header and set as ``request.id``.
+    """
+
+    valid_id = re.compile(r"[\w.:-]{1,128}", re.ASCII)
+
+    def call(self, request):
+        request_id = self.request_id(request)
+        with request_context(request_id):
+            response = self.get_response(request)
+        response["X-Request-ID"] = request_id
+        return response
+
+    async def acall(self, request):
+        request_id = self.request_id(request)
+        with request_context(request_id):
+            response = await self.get_response(request)
+        response["X-Request-ID"] = request_id
+        return response
+
+    def request_id(self, request) -> str:
+        request_id = request.headers.get("X-Request-ID", "")
+        if not self.valid_id.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        request.id = request_id
+        return request_id
+
+
+class ContextSwitchMiddleware(SyncAndAsyncMiddleware):
+    """
+    Count the sync/async context switches of each request.
+
+    The count is logged and returned in the ``X-Context-Switches`` response
+    header; it covers the middleware listed after this one. Only enabled with
+    ``DEBUG`` or when this module logs at debug level.
+    """
+
+    def __init__(self, get_response):
+        if not (settings.DEBUG or logger.isEnabledFor(logging.DEBUG)):
+            raise MiddlewareNotUsed
+        switches.install()
+        super().__init__(get_response)
+
+    def call(self, request):
+        with switches.count_switches() as count:
+            response = self.get_response(request)
+        return self.report(request, response, count[0])
+
+    async def acall(self, request):
+        with switches.count_switches() as count:
+            response = await self.get_response(request)
+        return self.report(request, response, count[0])
+
+    def report(self, request, response, count):
+        logger.debug(
+            "%s %s: %d context switches",
+            request.method,
+            request.path,
+            count,
+        )
+        response["X-Context-Switches"] = count
+        return response
+
+
+class ReplicaMiddleware(SyncAndAsyncMiddleware):
+    """
+    Scope the primary pin of ``bistro.core.db`` to the request.
+
+    Requests with unsafe methods read from the primary from the start, as they
+    are about to write; safe ones read from replicas until they write.
+    """
+
+    def call(self, request):
+        with primary_reads(pinned=request.method not in SAFE_METHODS):
+            return self.get_response(request)
+
+    async def acall(self, request):
+        # The pin is a context variable, sync_to_async() carries it to the
+        # threads of the request and back.
+        with primary_reads(pinned=request.method not in SAFE_METHODS):
+            return await self.get_response(request)
+
+
+_transaction_counter: ContextVar[TransactionCounter | None] = ContextVar(
+    "transaction_counter",
+    default=None,
+)
+
+
+def count_transactions(execute, sql, params, many, context):
+    """Execute wrapper feeding the ``TransactionCounter`` of the context."""
+    counter = _transaction_counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+def add_transaction_counter(sender, **kwargs):
+    for connection in connections.all():
+        if count_transactions not in connection.execute_wrappers:
+            connection.execute_wrappers.append(count_transactions)
+
+
+class TransactionCountMiddleware(SyncAndAsyncMiddleware):
+    """
+    Count the database queries and transactions of each request.
+
+    The counts are logged and returned in the ``X-DB-Queries`` and
+    ``X-DB-Transactions`` response headers. Only enabled with ``DEBUG`` or
+    when this module logs at debug level.
+
+    Async requests query on the connections of the thread ``sync_to_async()``
+    runs their sync code in, so the counter is passed in a context variable to
+    an execute wrapper added to them by a ``request_started`` receiver, which
+    runs in that thread.
+    """
+
+    def __init__(self, get_response):
+        if not (settings.DEBUG or logger.isEnabledFor(logging.DEBUG)):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        if self.async_mode:
+            request_started.connect(
+                add_transaction_counter,
+                dispatch_uid="add_transaction_counter",
+            )
+
+    def call(self, request):
+        counter = TransactionCounter()
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        return self.report(request, response, counter)
+
+    async def acall(self, request):
+        counter = TransactionCounter()
+        token = _transaction_counter.set(counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _transaction_counter.reset(token)
+        return self.report(request, response, counter)
+
+    def report(self, request, response, counter):
+        logger.debug(
+            "%s %s: %d queries, %d transactions",
+            request.method,
+            request.path,
+            counter.queries,
+            counter.transactions,
+        )
+        response["X-DB-Queries"] = counter.queries
+        response["X-DB-Transactions"] = counter.transactions
+        return response
+
+
+class WhiteNoiseMiddleware(whitenoise.WhiteNoiseMiddleware):
+    """
+    ``WhiteNoiseMiddleware`` running in the mode of the handler it wraps.
+
+    Async requests for anything but static files pass straight through, the
+    files are looked up (when autorefreshing) and opened in a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.acall(request)
+        return super().__call__(request)
+
+    async def acall(self, request):
+        if self.autorefresh:
+            static_file = None
+            if request.path_info.startswith(self.prefixes()):
+                static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+    def prefixes(self) -> tuple[str, ...]:
+        """The URL prefixes ``find_file()`` searches files for."""
+        prefixes = tuple(prefix for _, prefix in self.directories)
+        if self.use_finders:
+            prefixes += (self.static_prefix,)
+        return prefixes
+
+
+class NonBlockingMixin(_MiddlewareBase):
+    """
+    Call the hooks of a ``MiddlewareMixin`` middleware on the event loop.
+
+    ``MiddlewareMixin`` runs the ``process_request()`` and
+    ``process_response()`` of async requests in a thread, two context
+    switches per middleware. The hooks of these middleware only work on the
+    request and the response, so they are called directly, unless
+    ``request_blocks()`` or ``response_blocks()`` say they do IO this time.
+    """
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, "process_request"):
+            if self.request_blocks(request):
+                response = await sync_to_async(
+                    self.process_request,
+                    thread_sensitive=True,
+                )(request)
+            else:
+                response = self.process_request(request)
+        # Only called with an async get_response.
+        get_response = cast("AsyncGetResponse", self.get_response)
+        response = response or await get_response(request)
+        if hasattr(self, "process_response"):
+            if self.response_blocks(request, response):
+                response = await sync_to_async(
+                    self.process_response,
+                    thread_sensitive=True,
+                )(request, response)
+            else:
+                response = self.process_response(request, response)
+        return response
+
+    def request_blocks(self, request) -> bool:
+        return False
+
+    def response_blocks(self, request, response) -> bool:
+        return False
+
+
+class CommonMiddleware(NonBlockingMixin, common.CommonMiddleware):
+    pass
+
+
+def is_token_api_request(request) -> bool:
+    """Whether ``request`` is an API call carrying its own credentials."""
+    return "HTTP_AUTHORIZATION" in request.META and bool(
+        re.match(settings.CORS_URLS_REGEX, request.path_info),
+    )
+
+
+class BrowserOnlyMixin(_MiddlewareBase):
+    """
+    Skip the middleware for token authenticated API requests.
+
+    They carry their credentials in the ``Authorization`` header and get JSON
+    back, so they need no session, CSRF token, messages, translations or
+    framing protection. API calls authenticated by the session cookie, e.g.
+    from the browsable API, go through the middleware as before.
+    """
+
+    def __call__(self, request):
+        if is_token_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(
+    BrowserOnlyMixin,
+    NonBlockingMixin,
+    sessions.SessionMiddleware,
+):
+    # Sessions load lazily, on first access, and are only saved when modified.
+    def response_blocks(self, request, response) -> bool:
+        return request.session.modified or settings.SESSION_SAVE_EVERY_REQUEST
+
+
+class LocaleMiddleware(BrowserOnlyMixin, NonBlockingMixin, locale.LocaleMiddleware):
+    pass
+
+
+class CsrfViewMiddleware(BrowserOnlyMixin, NonBlockingMixin, csrf.CsrfViewMiddleware):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(self.get_response):
+            # The handler runs a sync process_view() in a thread.
+            self.process_view = self.aprocess_view  # type: ignore[method-assign]
+
+    def request_blocks(self, request) -> bool:
+        return settings.CSRF_USE_SESSIONS
+
+    def response_blocks(self, request, response) -> bool:
+        return settings.CSRF_USE_SESSIONS
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if is_token_api_request(request):
+            return None
+        return super().process_view(
+            request,
+            callback,
+            callback_args,
+            callback_kwargs,
+        )
+
+    async def aprocess_view(self, request, callback, callback_args, callback_kwargs):
+        process_view = functools.partial(
+            CsrfViewMiddleware.process_view,
+            self,
+            request,
+            callback,
+            callback_args,
+            callback_kwargs,
+        )
+        # Unsafe requests are checked against their form data (and sessions).
+        if request.method in SAFE_METHODS or is_token_api_request(request):
+            return process_view()
+        return await sync_to_async(process_view, thread_sensitive=True)()
+
+
+class AuthenticationMiddleware(
+    BrowserOnlyMixin,
+    NonBlockingMixin,
+    auth.AuthenticationMiddleware,
+):
+    pass
+
+
+class MessageMiddleware(BrowserOnlyMixin, NonBlockingMixin, messages.MessageMiddleware):
+    # Reading or storing messages may load the session.
+    def response_blocks(self, request, response) -> bool:
+        storage = getattr(request, "_messages", None)
+        return storage is not None and (storage.used or storage.added_new)
+
+
+class XFrameOptionsMiddleware(
+    BrowserOnlyMixin,
+    NonBlockingMixin,
+    clickjacking.XFrameOptionsMiddleware,
+):
+    pass
@@ -0,0 +1,177 @@
+"""
+Keyset pagination.
+
+``KeysetPagination`` pages through a queryset by the ordering values of the
+last (or, going back, the first) row of the current page, e.g.
+``WHERE (placed_at, id) < (%s, %s)``, instead of an offset: every page is an
+index range scan of ``page_size + 1`` rows, however deep it is, and no
+``COUNT(*)`` is run. Cursors are opaque, base64 encoded positions.
+
+The ordering is the view's ``ordering``, else the queryset's ``order_by()``,
+else the paginator's. Its fields must be non-null columns of the model and
+its last field unique (usually ``pk``), so every row has a distinct position.
+Rows may be model instances or ``values()`` dicts containing those fields.
+"""
+
+from __future__ import annotations
+
+import binascii
+import json
+from base64 import urlsafe_b64decode
+from base64 import urlsafe_b64encode
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_value(value) -> str:
+    # Unlike DjangoJSONEncoder, keep the microseconds of times.
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class KeysetPagination(CursorPagination):
+    ordering: tuple[str, ...] = ("pk",)
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    # Set by paginate_queryset(), before any link is built.
+    base_url: str
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = self.get_fields(queryset.model, self.ordering)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self.invert(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self.after(ordering, self.cursor.position))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = self.cursor is not None, has_more
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = (
+            getattr(view, "ordering", None) or queryset.query.order_by or self.ordering
+        )
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        if not all(isinstance(field, str) for field in ordering):
+            msg = f"{type(self).__name__} can only order by field names."
+            raise ImproperlyConfigured(msg)
+        return tuple(ordering)
+
+    def get_fields(self, model, ordering):
+        """The model fields of ``ordering``, the last of them unique."""
+        fields = []
+        for field in ordering:
+            name = field.removeprefix("-")
+            fields.append(
+                model._meta.pk if name == "pk" else model._meta.get_field(name),  # noqa: SLF001
+            )
+        if not fields[-1].unique:
+            msg = (
+                f"{type(self).__name__} needs a unique field last in its "
+                f"ordering, {ordering!r} doesn't end with one."
+            )
+            raise ImproperlyConfigured(msg)
+        return fields
+
+    @staticmethod
+    def invert(field: str) -> str:
+        return field.removeprefix("-") if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def after(ordering, position) -> Q:
+        """Rows after ``position`` in ``ordering``."""
+        conditions = []
+        equal: dict[str, object] = {}
+        for field, value in zip(ordering, position, strict=True):
+            name = field.removeprefix("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            conditions.append(Q(**equal, **{f"{name}__{lookup}": value}))
+            equal[name] = value
+        return reduce(or_, conditions)
+
+    def get_position(self, row) -> list:
+        names = [field.removeprefix("-") for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self.get_position(self.page[-1])
+        return self.encode_cursor(self.make_cursor(position, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        position = self.get_position(self.page[0])
+        return self.encode_cursor(self.make_cursor(position, reverse=True))
+
+    @staticmethod
+    def make_cursor(position: list, *, reverse: bool) -> Cursor:
+        # Cursors hold any position at runtime, the stubs only allow offsets.
+        return Cursor(offset=0, reverse=reverse, position=position)  # type: ignore[arg-type]
+
+    def encode_cursor(self, cursor):
+        payload = {
+            "p": [encode_value(value) for value in cursor.position],
+            "r": int(cursor.reverse),
+        }
+        encoded = urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=")
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            encoded.decode(),
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            payload = json.loads(urlsafe_b64decode(encoded + padding))
+            position = [
+                field.to_python(value)
+                for field, value in zip(self.fields, payload["p"], strict=True)
+            ]
+            reverse = bool(payload["r"])
+        except (
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+            ValidationError,
+        ) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+        return self.make_cursor(position, reverse=reverse)
@@ -0,0 +1,56 @@
+"""
+Estimated counts for Django paginators.
+
+``Paginator`` counts the rows of its queryset with ``COUNT(*)``, which reads
+the whole table (or its index) on PostgreSQL. ``EstimatedCountPaginator``
+takes the planner's estimate of the table's rows from ``pg_class`` instead,
+when the queryset is the unfiltered table and the estimate is large enough
+for counting to hurt. Filtered querysets, e.g. admin searches, are counted
+exactly, through whatever indexes serve their filters.
+
+Estimates are as fresh as the last ``ANALYZE`` (or autovacuum) of the table,
+so the last pages may come out short or empty.
+"""
+
+from __future__ import annotations
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+ESTIMATE_SQL = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """The planner's estimate of the rows of ``queryset``'s table, if known."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    table = connection.ops.quote_name(queryset.model._meta.db_table)  # noqa: SLF001
+    with connection.cursor() as cursor:
+        cursor.execute(ESTIMATE_SQL, [table])
+        row = cursor.fetchone()
+    # -1 until the table is first analyzed.
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    # Tables estimated to have fewer rows are counted exactly.
+    exact_count_below = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if (
+            isinstance(queryset, QuerySet)
+            and not queryset.query.where
+            and not queryset.query.distinct
+            and not queryset.query.is_sliced
+        ):
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate >= self.exact_count_below:
+                return estimate
+        return super().count
@@ -0,0 +1,50 @@
+"""
+JSON rendering on top of orjson.
+
+orjson encodes dicts, lists, strings, numbers and UUIDs natively, in the same
+format as DRF's encoder; everything else (datetimes, which DRF truncates to
+milliseconds, decimals, lazy strings, querysets, ...) goes through DRF's
+encoder, so the output doesn't change. Without orjson installed, or for
+pretty-printed output (the browsable API asks for an indent orjson can't
+produce), rendering falls back to DRF's ``json`` based implementation.
+"""
+
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+# DRF escapes these so the output is a strict JavaScript subset.
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not self.use_orjson(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            # E.g. integers over 64 bits, which json handles.
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+    def use_orjson(self, accepted_media_type, renderer_context) -> bool:
+        # orjson output is always compact and never escapes non-ASCII.
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
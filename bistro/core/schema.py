@@ -0,0 +1,107 @@
+"""
+Precomputed OpenAPI schema.
+
+Generating the schema introspects every view and serializer, so it is done
+once: ``manage.py build_schema`` writes it, rendered as YAML and JSON, to
+content-hashed files in ``SCHEMA_ARTIFACTS_DIR`` when the code is built, or
+else each worker generates it on first use (the lifespan warm-up does that
+before traffic arrives). ``SchemaView`` serves the result with an ETag taken
+from the content hash, so unchanged schemas are answered with 304s.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.renderers import OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS
+from drf_spectacular.views import SpectacularAPIView
+
+RENDERERS = {"yaml": OpenApiYamlRenderer, "json": OpenApiJsonRenderer}
+
+MANIFEST_NAME = "manifest.json"
+
+
+class SchemaArtifact(NamedTuple):
+    content: bytes
+    digest: str
+
+    @classmethod
+    def from_content(cls, content: bytes) -> SchemaArtifact:
+        return cls(content, hashlib.sha256(content).hexdigest()[:16])
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+
+def generate_schema_artifacts() -> dict[str, SchemaArtifact]:
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        name: SchemaArtifact.from_content(renderer().render(schema, None, {}))
+        for name, renderer in RENDERERS.items()
+    }
+
+
+def write_schema_artifacts(directory: Path) -> dict[str, str]:
+    """Write the schema to ``directory``; return the manifest."""
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for name, artifact in generate_schema_artifacts().items():
+        manifest[name] = f"schema.{artifact.digest}.{name}"
+        (directory / manifest[name]).write_bytes(artifact.content)
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def read_schema_artifacts(directory: Path) -> dict[str, SchemaArtifact]:
+    manifest = json.loads((directory / MANIFEST_NAME).read_text())
+    return {
+        name: SchemaArtifact.from_content((directory / filename).read_bytes())
+        for name, filename in manifest.items()
+    }
+
+
+@functools.cache
+def get_schema_artifacts() -> dict[str, SchemaArtifact]:
+    if settings.SCHEMA_ARTIFACTS_DIR:
+        return read_schema_artifacts(Path(settings.SCHEMA_ARTIFACTS_DIR))
+    return generate_schema_artifacts()
+
+
+class SchemaView(SpectacularAPIView):
+    """``SpectacularAPIView`` serving the precomputed schema."""
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("lang") or request.GET.get("version"):
+            # Only the default language and version are precomputed.
+            return super().get(request, *args, **kwargs)
+        renderer = request.accepted_renderer
+        artifact = get_schema_artifacts()[renderer.format]
+        response = get_conditional_response(request, etag=artifact.etag)
+        if response is None:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type += f"; charset={renderer.charset}"
+            response = HttpResponse(artifact.content, content_type=content_type)
+            response["Content-Disposition"] = (
+                f'inline; filename="{self._get_filename(request, None)}"'
+            )
+        response["ETag"] = artifact.etag
+        # Served to admins only: keep it out of shared caches, but let
+        # browsers and SDK generators revalidate with If-None-Match.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
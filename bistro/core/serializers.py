@@ -0,0 +1,189 @@
+"""
+Read-only serialization of ``values()`` rows.
+
+A ``ValuesSerializer`` produces the same representation as its
+``serializer_class`` (a ``ModelSerializer``), but from dicts as returned by
+``QuerySet.values()`` instead of model instances, and without building a
+serializer per row: the fields are compiled once per list into plain column
+lookups, and hyperlinked identity fields into a URL template that is reversed
+once instead of once per row. Fields that are a plain model column are
+supported, nested serializers and other relations are not.
+
+    class UserValuesSerializer(ValuesSerializer):
+        serializer_class = UserSerializer
+
+    rows = UserValuesSerializer.values(User.objects.all())
+    UserValuesSerializer(rows, many=True, context={"request": request}).data
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import cast
+from urllib.parse import quote
+
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import NoReverseMatch
+from drf_spectacular.extensions import OpenApiSerializerExtension
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.db.models import QuerySet
+
+# Fields whose representation of a database value is the value itself.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+)
+# Stands in for the lookup value when the URL template is reversed.
+LOOKUP_PLACEHOLDER = "__lookup__"
+# What django.urls.reverse() leaves unquoted in URL arguments.
+URL_SAFE = "!$&'()*+,;=/~:@"
+
+
+class URLTemplate:
+    """
+    The URL of ``view_name`` for any value of its ``lookup_url_kwarg``.
+
+    The URL is reversed once with a placeholder, the values are substituted.
+    When the placeholder doesn't match the URL pattern (e.g. ``<int:pk>``)
+    every URL is reversed.
+    """
+
+    def __init__(self, view_name, lookup_url_kwarg, request, url_format=None):
+        self.view_name = view_name
+        self.lookup_url_kwarg = lookup_url_kwarg
+        self.request = request
+        self.format = url_format
+        try:
+            url = self.reverse(LOOKUP_PLACEHOLDER)
+        except NoReverseMatch:
+            self.parts = None
+        else:
+            parts = url.split(LOOKUP_PLACEHOLDER)
+            self.parts = parts if len(parts) == 2 else None  # noqa: PLR2004
+
+    def reverse(self, value) -> str:
+        return reverse(
+            self.view_name,
+            kwargs={self.lookup_url_kwarg: value},
+            request=self.request,
+            format=self.format,
+        )
+
+    def __call__(self, value) -> str:
+        if self.parts is None:
+            return self.reverse(value)
+        prefix, suffix = self.parts
+        return f"{prefix}{quote(str(value), safe=URL_SAFE)}{suffix}"
+
+
+def model_columns(serializer: serializers.ModelSerializer) -> list[str]:
+    """The model columns the readable fields of ``serializer`` are built from."""
+    columns = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.HyperlinkedIdentityField):
+            columns.append(field.lookup_field)
+        elif len(field.source_attrs) == 1 and not isinstance(
+            field,
+            serializers.BaseSerializer | serializers.RelatedField,
+        ):
+            columns.append(cast("str", field.source))
+        else:
+            msg = (
+                f"{field.field_name!r} ({type(field).__name__}) of "
+                f"{type(serializer).__name__} isn't a model column."
+            )
+            raise ImproperlyConfigured(msg)
+    return list(dict.fromkeys(columns))
+
+
+class ValuesSerializer(serializers.BaseSerializer):
+    serializer_class: type[serializers.ModelSerializer]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compiled = None
+
+    @classmethod
+    def get_columns(cls, context=None) -> list[str]:
+        """The ``values()`` columns the representation is built from."""
+        return model_columns(cls.serializer_class(context=context or {}))
+
+    @classmethod
+    def values(cls, queryset: QuerySet, context=None) -> QuerySet:
+        # Rows always carry their pk, e.g. for KeysetPagination.
+        columns = dict.fromkeys(["pk", *cls.get_columns(context)])
+        return queryset.values(*columns)
+
+    def compile(self) -> list[tuple[str, str, Callable | None]]:
+        """``(name, column, converter)`` of each field, once per list."""
+        if self._compiled is not None:
+            return self._compiled
+        compiled: list[tuple[str, str, Callable | None]] = []
+        context = self.context
+        for name, field in self.serializer_class(context=context).fields.items():
+            if field.write_only:
+                continue
+            convert: Callable | None
+            if isinstance(field, serializers.HyperlinkedIdentityField):
+                # Same format rules as HyperlinkedRelatedField.to_representation.
+                url_format = context.get("format")
+                if url_format and field.format and field.format != url_format:
+                    url_format = field.format
+                column = field.lookup_field
+                convert = URLTemplate(
+                    field.view_name,
+                    field.lookup_url_kwarg,
+                    context.get("request"),
+                    url_format,
+                )
+            else:
+                # Bound fields have their source as a string.
+                column = cast("str", field.source)
+                convert = (
+                    None
+                    if isinstance(field, PASSTHROUGH_FIELDS)
+                    else field.to_representation
+                )
+            compiled.append((name, column, convert))
+        self._compiled = compiled
+        return compiled
+
+    def to_representation(self, instance):
+        ret = {}
+        for name, column, convert in self.compile():
+            value = instance[column]
+            if convert is None or value is None:
+                ret[name] = value
+            else:
+                ret[name] = convert(value)
+        return ret
+
+
+class ValuesSerializerExtension(OpenApiSerializerExtension):
+    """Documents a ``ValuesSerializer`` as its ``serializer_class``."""
+
+    target_class = ValuesSerializer
+    match_subclasses = True
+
+    def get_name(self, auto_schema, direction):
+        return auto_schema._get_serializer_name(  # noqa: SLF001
+            self.target.serializer_class(),
+            direction,
+        )
+
+    def get_identity(self, auto_schema, direction):
+        return self.target.serializer_class
+
+    def map_serializer(self, auto_schema, direction):
+        return auto_schema._map_serializer(  # noqa: SLF001
+            self.target.serializer_class,
+            direction,
+        )
@@ -0,0 +1,128 @@
+"""
+Cache-first session engine with write coalescing.
+
+Sessions are read from ``SESSION_CACHE_ALIAS`` (Redis in production) and only
+fall back to the database when the cache lost them. The database keeps the
+durable copy, but it is only written when the session data changed: a session
+that was marked modified without a change, or saved on every request, costs
+no write until its stored expiry is less than half the session age away.
+
+Expired rows are deleted in small indexed batches, a few of them whenever new
+sessions are created (``SESSION_CLEANUP_PROBABILITY``), and ``clearsessions``
+deletes the rest batch by batch. Cached sessions expire with their TTL.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+from django.contrib.sessions.backends import db
+from django.utils import timezone
+
+from .db import primary_reads
+
+if TYPE_CHECKING:
+    from django.contrib.sessions.models import Session
+    from django.core.cache.backends.base import BaseCache
+
+KEY_PREFIX = "bistro.core.sessions"
+
+
+class SessionStore(cached_db.SessionStore):
+    cache_key_prefix = KEY_PREFIX
+
+    if TYPE_CHECKING:
+        # Private API of Django's session stores, missing from django-stubs.
+        _cache: BaseCache
+
+        def _get_session_from_db(self) -> Session | None: ...
+
+        def _get_session(self, no_load=False) -> dict[str, Any]: ...  # noqa: FBT002
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        # Serialized data and expiry of the session as stored in the database.
+        self._stored = None
+
+    def load(self):
+        try:
+            cached = self._cache.get(self.cache_key)
+        except Exception:  # noqa: BLE001
+            # Invalid cache keys raise on some backends, see cached_db.
+            cached = None
+        if cached is None:
+            # A replica may not have the session yet.
+            with primary_reads():
+                stored = self._get_session_from_db()
+            if stored is None:
+                return {}
+            cached = (self.decode(stored.session_data), stored.expire_date)
+            self._cache.set(
+                self.cache_key,
+                cached,
+                self.get_expiry_age(expiry=stored.expire_date),
+            )
+        data, expire_date = cached
+        self._stored = (self._serialize(data), expire_date)
+        return data
+
+    def save(self, must_create=False):  # noqa: FBT002
+        if self.session_key is None:
+            self.create()
+            return
+        data = self._get_session(no_load=must_create)
+        if not must_create and self._is_stored(data):
+            return
+        db.SessionStore.save(self, must_create=must_create)
+        expire_date = self.get_expiry_date()
+        self._stored = (self._serialize(data), expire_date)
+        self._cache.set(
+            self.cache_key,
+            (data, expire_date),
+            self.get_expiry_age(expiry=expire_date),
+        )
+
+    async def aload(self):
+        return await sync_to_async(self.load)()
+
+    async def asave(self, must_create=False):  # noqa: FBT002
+        await sync_to_async(self.save)(must_create)
+
+    def create(self):
+        super().create()
+        if random.random() < settings.SESSION_CLEANUP_PROBABILITY:  # noqa: S311
+            self.clear_expired(max_batches=1)
+
+    def _serialize(self, data) -> bytes:
+        return self.serializer().dumps(data)
+
+    def _is_stored(self, data) -> bool:
+        """Whether the stored copy has ``data`` and doesn't expire soon."""
+        if self._stored is None:
+            return False
+        serialized, expire_date = self._stored
+        refresh_after = expire_date - timedelta(
+            seconds=self.get_session_cookie_age() / 2,
+        )
+        return serialized == self._serialize(data) and timezone.now() < refresh_after
+
+    @classmethod
+    def clear_expired(cls, max_batches=None):
+        """Delete expired sessions, ``SESSION_CLEANUP_BATCH_SIZE`` at a time."""
+        model = cls.get_model_class()
+        batch_size = settings.SESSION_CLEANUP_BATCH_SIZE
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            expired = model.objects.filter(expire_date__lt=timezone.now())
+            deleted, _ = model.objects.filter(
+                pk__in=expired.values("pk")[:batch_size],
+            ).delete()
+            batches += 1
+            if deleted < batch_size:
+                break
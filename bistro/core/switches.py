@@ -0,0 +1,70 @@
+"""
+Counting sync/async context switches.
+
+Under ASGI, Django runs sync middleware, sync views and ``render()`` through
+``asgiref``'s ``sync_to_async`` (a hop to a thread and back), and sync code
+calls async code through ``async_to_sync``. ``count_switches()`` counts both
+kinds of calls made by the current context, threads it hands work to
+included. Counting patches ``SyncToAsync.__call__`` and
+``AsyncToSync.__call__``, so it is only installed on demand (see
+``ContextSwitchMiddleware``).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+from typing import Any
+
+from asgiref.sync import AsyncToSync
+from asgiref.sync import SyncToAsync
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+
+# A list, so that threads running a copy of the context add to the same count.
+_switches: ContextVar[list[int] | None] = ContextVar("switches", default=None)
+
+
+def _count() -> None:
+    switches = _switches.get()
+    if switches is not None:
+        switches[0] += 1
+
+
+def install() -> None:
+    """Make ``sync_to_async`` and ``async_to_sync`` calls countable."""
+    if getattr(SyncToAsync.__call__, "counted", False):
+        return
+
+    sync_to_async_call: Callable[..., Any] = SyncToAsync.__call__
+    async_to_sync_call: Callable[..., Any] = AsyncToSync.__call__
+
+    @functools.wraps(sync_to_async_call)
+    async def counted_sync_to_async(self, *args, **kwargs):
+        _count()
+        return await sync_to_async_call(self, *args, **kwargs)
+
+    @functools.wraps(async_to_sync_call)
+    def counted_async_to_sync(self, *args, **kwargs):
+        _count()
+        return async_to_sync_call(self, *args, **kwargs)
+
+    # mypy can't follow patched methods.
+    counted_sync_to_async.counted = True  # type: ignore[attr-defined]
+    SyncToAsync.__call__ = counted_sync_to_async  # type: ignore[method-assign]
+    AsyncToSync.__call__ = counted_async_to_sync  # type: ignore[method-assign]
+
+
+@contextlib.contextmanager
+def count_switches() -> Iterator[list[int]]:
+    """Count the switches of the block in the first item of the yielded list."""
+    switches = [0]
+    token = _switches.set(switches)
+    try:
+        yield switches
+    finally:
+        _switches.reset(token)
@@ -0,0 +1,141 @@
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.urls import ResolverMatch
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from bistro.core.api import views
+from bistro.orders.models import Order
+from bistro.orders.tests.factories import OrderFactory
+from bistro.orders.tests.factories import make_payload
+from bistro.users.api.views import UserViewSet
+from bistro.users.models import User
+
+URL = reverse("api:batch")
+
+
+def batch(client: APIClient, *requests: dict) -> list[dict]:
+    response = client.post(URL, {"requests": list(requests)}, format="json")
+    assert response.status_code == HTTPStatus.OK
+    return response.json()["responses"]
+
+
+@pytest.mark.django_db
+class TestBatchView:
+    @pytest.fixture(autouse=True)
+    def _inline(self, settings):
+        # Threads wouldn't see the test's transaction.
+        settings.API_BATCH_MAX_WORKERS = 1
+
+    def test_reads(self, api_client, user):
+        order = OrderFactory.create()
+        me, orders = batch(
+            api_client,
+            {"path": "/api/users/me/?fields=name"},
+            {"path": "/api/orders/"},
+        )
+        assert me["status"] == HTTPStatus.OK
+        assert me["body"] == {"name": user.name}
+        assert "ETag" in me["headers"]
+        assert [o["uuid"] for o in orders["body"]["results"]] == [str(order.uuid)]
+
+    def test_headers(self, api_client):
+        (me,) = batch(api_client, {"path": "/api/users/me/"})
+        headers = {"If-None-Match": me["headers"]["ETag"]}
+        (not_modified,) = batch(
+            api_client,
+            {"path": "/api/users/me/", "headers": headers},
+        )
+        assert not_modified["status"] == HTTPStatus.NOT_MODIFIED
+        assert not_modified["body"] is None
+
+    def test_writes_are_barriers(self, api_client, user):
+        payload = make_payload(1)
+        before, created, after = batch(
+            api_client,
+            {"path": "/api/orders/"},
+            {"method": "POST", "path": "/api/orders/bulk/", "body": payload},
+            {"path": "/api/orders/"},
+        )
+        assert before["body"]["results"] == []
+        assert created["status"] == HTTPStatus.CREATED
+        assert Order.objects.get().created_by == user
+        assert [o["uuid"] for o in after["body"]["results"]] == [payload[0]["uuid"]]
+
+    def test_sub_request_errors(self, api_client):
+        invalid, missing = batch(
+            api_client,
+            {"method": "POST", "path": "/api/orders/bulk/", "body": []},
+            {"path": "/api/orders/0/"},
+        )
+        assert invalid["status"] == HTTPStatus.BAD_REQUEST
+        assert missing["status"] == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize(
+        ("exception", "status"),
+        [
+            (ValidationError, HTTPStatus.BAD_REQUEST),
+            (RuntimeError, HTTPStatus.INTERNAL_SERVER_ERROR),
+        ],
+    )
+    def test_failed_writes_roll_back(self, api_client, monkeypatch, exception, status):
+        class WritingView(APIView):
+            def post(self, request):
+                User.objects.create(email="written@example.com")
+                raise exception
+
+        match = ResolverMatch(WritingView.as_view(), (), {}, namespaces=["api"])
+        monkeypatch.setattr(views, "resolve", lambda path: match)
+        (response,) = batch(api_client, {"method": "POST", "path": "/api/write/"})
+        assert response["status"] == status
+        assert not User.objects.filter(email="written@example.com").exists()
+
+    @pytest.mark.parametrize("header", ["Host", "X-Forwarded-For", "Authorization"])
+    def test_only_some_headers(self, api_client, header):
+        response = api_client.post(
+            URL,
+            {"requests": [{"path": "/api/users/me/", "headers": {header: "x"}}]},
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    @pytest.mark.parametrize("path", ["/api/nope/", "/api/batch/", "/api/schema/"])
+    def test_only_api_routes(self, api_client, path):
+        (response,) = batch(api_client, {"path": path})
+        assert response["status"] == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize(
+        "requests",
+        [[], [{"path": "/admin/"}], [{"path": "/api/users/me/"}] * 26],
+    )
+    def test_invalid_batches(self, api_client, requests):
+        response = api_client.post(URL, {"requests": requests}, format="json")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_requires_authentication(self):
+        response = APIClient().post(URL, {"requests": []}, format="json")
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_run_concurrently(settings, monkeypatch):
+    settings.API_BATCH_MAX_WORKERS = 4
+    user = User.objects.create(email="pos@example.com", name="POS")
+    client = APIClient()
+    client.force_authenticate(user)
+
+    # Every read waits for all the others, which only completes concurrently.
+    barrier = threading.Barrier(3, timeout=5)
+    me = UserViewSet.me
+
+    def waiting_me(self, request):
+        barrier.wait()
+        return me(self, request)
+
+    monkeypatch.setattr(UserViewSet, "me", waiting_me)
+    responses = batch(client, *[{"path": "/api/users/me/"}] * 3)
+    assert [r["body"]["name"] for r in responses] == ["POS"] * 3
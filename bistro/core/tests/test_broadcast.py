@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bistro.core.broadcast import Broadcast
+from bistro.core.broadcast import MemoryBackend
+from bistro.core.broadcast import RedisBackend
+from bistro.core.broadcast import backend_from_url
+
+
+class RecordingBackend(MemoryBackend):
+    """Records batch sizes; the first publish blocks until released."""
+
+    def __init__(self, hub):
+        super().__init__(hub)
+        self.batches: list[int] = []
+        self.release = threading.Event()
+
+    def publish(self, messages):
+        self.batches.append(len(messages))
+        self.release.wait(timeout=5)
+        super().publish(messages)
+
+
+def test_backend_from_url():
+    assert isinstance(backend_from_url("memory://"), MemoryBackend)
+    assert isinstance(backend_from_url("redis://localhost:6379/0"), RedisBackend)
+    with pytest.raises(ValueError, match="Unsupported"):
+        backend_from_url("amqp://localhost")
+
+
+def test_message_reaches_every_worker():
+    hub: dict = {}
+    workers = [Broadcast(MemoryBackend(hub)) for _ in range(3)]
+
+    async def scenario():
+        received: asyncio.Queue = asyncio.Queue()
+        for n, worker in enumerate(workers):
+
+            def listener(channel: str, data: str, n: int = n) -> None:
+                received.put_nowait((n, channel, data))
+
+            await worker.subscribe("orders", listener)
+        workers[0].publish("orders", "hello")
+        workers[0].publish("other", "ignored")
+        messages = [await asyncio.wait_for(received.get(), 1) for _ in workers]
+        assert sorted(messages) == [(n, "orders", "hello") for n in range(3)]
+        for worker in workers:
+            await worker.close()
+        assert hub == {}
+
+    asyncio.run(scenario())
+
+
+class FlakyBackend(MemoryBackend):
+    """Fails the first time it is listened to."""
+
+    failed = False
+
+    async def listen(self):
+        if not self.failed:
+            self.failed = True
+            msg = "Protocol error"
+            raise RuntimeError(msg)
+        async for message in super().listen():
+            yield message
+
+
+def test_reader_survives_backend_failures(caplog):
+    broadcast = Broadcast(FlakyBackend({}))
+    broadcast.reconnect_delay = 0
+
+    async def scenario():
+        received: asyncio.Queue = asyncio.Queue()
+        await broadcast.subscribe(
+            "orders",
+            lambda channel, data: received.put_nowait(data),
+        )
+        await asyncio.sleep(0.01)
+        broadcast.publish("orders", "hello")
+        assert await asyncio.wait_for(received.get(), 1) == "hello"
+        await broadcast.close()
+
+    asyncio.run(scenario())
+    assert "Broadcast connection failed, reconnecting" in caplog.text
+
+
+def test_publishes_are_batched():
+    backend = RecordingBackend({})
+    broadcast = Broadcast(backend)
+    broadcast.publish("orders", "first")
+    while not backend.batches:
+        time.sleep(0.001)
+    # The publisher thread is now blocked sending "first"; later messages
+    # pile up and go out together in the next round-trip.
+    for n in range(10):
+        broadcast.publish("orders", str(n))
+    backend.release.set()
+    assert broadcast.flush(timeout=5)
+    assert backend.batches == [1, 10]
+
+
+def test_batches_are_bounded(monkeypatch):
+    backend = RecordingBackend({})
+    backend.release.set()
+    broadcast = Broadcast(backend)
+    monkeypatch.setattr(broadcast, "max_batch", 4)
+    with broadcast._condition:  # noqa: SLF001
+        for n in range(10):
+            broadcast.publish("orders", str(n))
+    assert broadcast.flush(timeout=5)
+    assert backend.batches == [4, 4, 2]
+
+
+def test_unsubscribe_stops_delivery():
+    hub: dict = {}
+    broadcast = Broadcast(MemoryBackend(hub))
+
+    async def scenario():
+        received = []
+
+        def listener(channel, data):
+            received.append(data)
+
+        await broadcast.subscribe("orders", listener)
+        broadcast.publish("orders", "one")
+        broadcast.flush(timeout=1)
+        await asyncio.sleep(0.01)
+        await broadcast.unsubscribe("orders", listener)
+        broadcast.publish("orders", "two")
+        broadcast.flush(timeout=1)
+        await asyncio.sleep(0.01)
+        assert received == ["one"]
+        assert hub == {}
+        await broadcast.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,24 @@
+from bistro.core import checks
+
+
+def test_subclasses_pass(settings):
+    settings.CSRF_COOKIE_SECURE = True
+    assert checks.check_csrf_middleware(None) == []
+    assert checks.check_xframe_options_middleware(None) == []
+
+
+def test_missing_middleware(settings):
+    settings.MIDDLEWARE = [
+        path
+        for path in settings.MIDDLEWARE
+        if not path.endswith(("CsrfViewMiddleware", "XFrameOptionsMiddleware"))
+    ]
+    assert checks.check_csrf_middleware(None) == [checks.W003]
+    assert checks.check_xframe_options_middleware(None) == [checks.W002]
+
+
+def test_insecure_settings(settings):
+    settings.CSRF_COOKIE_SECURE = False
+    settings.X_FRAME_OPTIONS = "SAMEORIGIN"
+    assert checks.check_csrf_middleware(None) == [checks.W016]
+    assert checks.check_xframe_options_middleware(None) == [checks.W019]
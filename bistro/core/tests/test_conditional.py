@@ -0,0 +1,120 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bistro.orders.tests.factories import OrderFactory
+from bistro.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+class TestObjectValidators:
+    url = reverse("api:user-me")
+
+    def test_validators(self, api_client: APIClient):
+        response = api_client.get(self.url)
+        assert response.status_code == HTTPStatus.OK
+        assert response["ETag"].startswith('"')
+        assert "Last-Modified" in response
+
+    def test_if_none_match(self, api_client: APIClient, django_assert_num_queries):
+        etag = api_client.get(self.url)["ETag"]
+        with django_assert_num_queries(0):
+            response = api_client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_if_modified_since(self, api_client: APIClient):
+        last_modified = api_client.get(self.url)["Last-Modified"]
+        response = api_client.get(
+            self.url,
+            headers={"If-Modified-Since": last_modified},
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_changes_invalidate(self, api_client: APIClient, user: User):
+        etag = api_client.get(self.url)["ETag"]
+        user.name = "Renamed"
+        user.save()
+        response = api_client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.OK
+        assert response["ETag"] != etag
+        assert response.data["name"] == "Renamed"
+
+    def test_etag_depends_on_the_user(self, api_client: APIClient):
+        etag = api_client.get(self.url)["ETag"]
+        other = APIClient()
+        other.force_authenticate(User.objects.create(email="other@example.com"))
+        assert other.get(self.url)["ETag"] != etag
+
+    def test_retrieve(self, api_client: APIClient):
+        url = reverse("api:order-detail", kwargs={"pk": OrderFactory.create().pk})
+        etag = api_client.get(url)["ETag"]
+        response = api_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+class TestListValidators:
+    url = reverse("api:order-list")
+
+    def test_if_none_match(self, api_client: APIClient, django_assert_num_queries):
+        OrderFactory.create_batch(2)
+        etag = api_client.get(self.url)["ETag"]
+        # Only the page and its prefetched items are read.
+        with django_assert_num_queries(2):
+            response = api_client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert "Last-Modified" not in response
+
+    def test_new_rows_invalidate(self, api_client: APIClient):
+        etag = api_client.get(self.url)["ETag"]
+        OrderFactory()
+        response = api_client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.OK
+
+    def test_deleted_rows_invalidate(self, api_client: APIClient):
+        orders = OrderFactory.create_batch(2)
+        etag = api_client.get(self.url)["ETag"]
+        orders[0].delete()
+        response = api_client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.OK
+
+    def test_item_changes_invalidate(self, api_client: APIClient):
+        order = OrderFactory.create()
+        etag = api_client.get(self.url)["ETag"]
+        item = order.items.all()[0]
+        item.quantity += 1
+        item.save()
+        response = api_client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.OK
+
+    def test_rows_beyond_the_page_invalidate(self, api_client: APIClient):
+        OrderFactory()
+        etag = api_client.get(self.url, {"page_size": 1})["ETag"]
+        OrderFactory(placed_at=timezone.now() - timedelta(days=1))
+        response = api_client.get(
+            self.url,
+            {"page_size": 1},
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["next"]
+
+    def test_values_rows(self, api_client: APIClient, user: User):
+        url = reverse("api:user-list")
+        etag = api_client.get(url)["ETag"]
+        response = api_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        user.name = "Renamed"
+        user.save()
+        response = api_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.OK
+
+    def test_query_string_is_part_of_the_etag(self, api_client: APIClient):
+        etag = api_client.get(self.url)["ETag"]
+        assert api_client.get(self.url, {"format": "json"})["ETag"] != etag
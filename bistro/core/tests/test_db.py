@@ -0,0 +1,134 @@
+import asyncio
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.db import DatabaseError
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from bistro.core import db
+from bistro.core.db import ReplicaRouter
+from bistro.core.db import is_pinned
+from bistro.core.db import primary_reads
+from bistro.core.middleware import ReplicaMiddleware
+from bistro.users.models import User
+
+
+@pytest.fixture
+def lag(settings, monkeypatch) -> Iterator[dict[str, float | Exception]]:
+    """Replication lag per replica; set to an exception to fail the check."""
+    settings.DATABASE_REPLICAS = ["replica_1", "replica_2"]
+    settings.DATABASE_REPLICA_MAX_LAG = 5.0
+    settings.DATABASE_REPLICA_CHECK_INTERVAL = 0
+    lags: dict[str, float | Exception] = {"replica_1": 0.0, "replica_2": 0.0}
+
+    def replica_lag(alias):
+        value = lags[alias]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    monkeypatch.setattr(db, "replica_lag", replica_lag)
+    with primary_reads(pinned=False):
+        yield lags
+
+
+class TestReplicaRouter:
+    def test_reads_go_to_replicas(self, lag):
+        router = ReplicaRouter()
+        aliases = {router.db_for_read(User) for _ in range(50)}
+        assert aliases == {"replica_1", "replica_2"}
+
+    def test_writes_go_to_primary(self, lag):
+        assert ReplicaRouter().db_for_write(User) == "default"
+
+    def test_reads_after_a_write_stay_on_primary(self, lag):
+        router = ReplicaRouter()
+        router.db_for_write(User)
+        assert router.db_for_read(User) == "default"
+
+    def test_lagging_replica_is_skipped(self, lag):
+        lag["replica_1"] = 30.0
+        router = ReplicaRouter()
+        assert {router.db_for_read(User) for _ in range(20)} == {"replica_2"}
+
+    def test_unavailable_replica_is_skipped(self, lag, monkeypatch):
+        lag["replica_2"] = DatabaseError("connection refused")
+        closed = []
+        monkeypatch.setattr(
+            db,
+            "connections",
+            {"replica_2": SimpleNamespace(close=lambda: closed.append(True))},
+        )
+        router = ReplicaRouter()
+        assert {router.db_for_read(User) for _ in range(20)} == {"replica_1"}
+        assert closed
+
+    def test_falls_back_to_primary(self, lag):
+        lag["replica_1"] = lag["replica_2"] = 30.0
+        assert ReplicaRouter().db_for_read(User) == "default"
+
+    def test_status_is_rechecked_after_the_interval(self, lag, settings):
+        settings.DATABASE_REPLICA_CHECK_INTERVAL = 60
+        router = ReplicaRouter()
+        router.usable_replicas()
+        lag["replica_1"] = 30.0
+        assert router.usable_replicas() == ["replica_1", "replica_2"]
+
+        settings.DATABASE_REPLICA_CHECK_INTERVAL = 0
+        router._status.clear()  # noqa: SLF001
+        assert router.usable_replicas() == ["replica_2"]
+
+    def test_no_migrations_on_replicas(self, lag):
+        router = ReplicaRouter()
+        assert router.allow_migrate("replica_1", "users") is False
+        assert router.allow_migrate("default", "users") is None
+
+    def test_queryset_routing(self, user, lag):
+        assert User.objects.all().db in {"replica_1", "replica_2"}
+        User.objects.filter(pk=user.pk).update(name="Changed")
+        assert User.objects.all().db == "default"
+
+
+class TestReplicaMiddleware:
+    @pytest.mark.parametrize(
+        ("method", "pinned"),
+        [("get", False), ("head", False), ("post", True), ("delete", True)],
+    )
+    def test_pins_unsafe_methods(self, rf: RequestFactory, method, pinned):
+        seen = []
+
+        def view(request):
+            seen.append(is_pinned())
+            return HttpResponse()
+
+        with primary_reads(pinned=False):
+            ReplicaMiddleware(view)(getattr(rf, method)("/"))
+            assert seen == [pinned]
+            assert not is_pinned()
+
+    def test_pin_ends_with_the_request(self, rf: RequestFactory):
+        def view(request):
+            ReplicaRouter().db_for_write(User)
+            return HttpResponse()
+
+        with primary_reads(pinned=False):
+            ReplicaMiddleware(view)(rf.get("/"))
+            assert not is_pinned()
+
+    def test_async_requests(self, rf: RequestFactory):
+        seen = []
+
+        async def view(request):
+            seen.append(is_pinned())
+            # Pinned in a thread, as by a sync view writing.
+            await sync_to_async(db.pin_to_primary)()
+            seen.append(is_pinned())
+            return HttpResponse()
+
+        with primary_reads(pinned=False):
+            asyncio.run(ReplicaMiddleware(view)(rf.get("/")))
+            assert seen == [False, True]
+            assert not is_pinned()
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+def selects_password(queries: CaptureQueriesContext) -> bool:
+    return any('"password"' in query["sql"] for query in queries)
+
+
+class TestSparseFields:
+    def test_fields(self, api_client, user):
+        response = api_client.get(reverse("api:user-me"), {"fields": "name"})
+        assert response.json() == {"name": user.name}
+
+    def test_omit(self, api_client, user):
+        response = api_client.get(reverse("api:user-list"), {"omit": "url"})
+        assert response.json()["results"] == [{"name": user.name}]
+
+    def test_unknown_fields(self, api_client):
+        response = api_client.get(reverse("api:user-me"), {"fields": "password"})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {"fields": ["Unknown fields: password."]}
+
+    def test_etag_depends_on_the_fields(self, api_client):
+        url = reverse("api:user-me")
+        etag = api_client.get(url)["ETag"]
+        assert api_client.get(url, {"omit": "url"})["ETag"] != etag
+
+    def test_writes_return_every_field(self, api_client, user):
+        url = reverse("api:user-detail", kwargs={"pk": user.pk})
+        response = api_client.patch(f"{url}?fields=url", {"name": "Renamed"})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["name"] == "Renamed"
+
+
+class TestSparseColumns:
+    def test_retrieve(self, api_client, user):
+        url = reverse("api:user-detail", kwargs={"pk": user.pk})
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"fields": "name"})
+        assert response.json() == {"name": user.name}
+        assert not selects_password(queries)
+
+    def test_list(self, api_client, user):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("api:user-list"), {"fields": "url"})
+        assert response.json()["results"] == [
+            {"url": f"http://testserver/api/users/{user.pk}/"},
+        ]
+        assert not selects_password(queries)
@@ -0,0 +1,170 @@
+import json
+import logging
+import queue
+import sys
+import time
+
+import pytest
+from django.core import mail
+
+from bistro.core.log import BoundedQueueHandler
+from bistro.core.log import ErrorDigestHandler
+from bistro.core.log import JSONFormatter
+from bistro.core.log import RequestContextFilter
+from bistro.core.log import request_context
+
+
+@pytest.fixture(autouse=True)
+def _admins(settings):
+    settings.ADMINS = [("Admin", "admin@example.com")]
+
+
+@pytest.fixture
+def handler():
+    handler = ErrorDigestHandler(interval=3600, max_groups=2)
+    yield handler
+    handler.close()
+
+
+def fail(exc_type=ValueError):
+    raise exc_type
+
+
+def error_record(exc_type=ValueError) -> logging.LogRecord:
+    try:
+        fail(exc_type)
+    except exc_type:
+        exc_info = sys.exc_info()
+    return logging.LogRecord(
+        "django.request",
+        logging.ERROR,
+        __file__,
+        1,
+        "Internal Server Error: %s",
+        ("/path/",),
+        exc_info,
+    )
+
+
+def test_groups_errors_into_digests(handler):
+    for _ in range(3):
+        handler.handle(error_record())
+    handler.handle(error_record(KeyError))
+    assert mail.outbox == []
+    assert handler.thread.is_alive()
+
+    handler.flush()
+    [digest] = mail.outbox
+    assert digest.subject.endswith("4 errors: ERROR: Internal Server Error: /path/")
+    assert digest.body.count("Internal Server Error: /path/ (3x)") == 1
+    assert digest.body.count("Internal Server Error: /path/ (1x)") == 1
+    assert digest.body.count("Traceback") == 2  # noqa: PLR2004
+
+
+def test_mails_digests_from_its_thread():
+    handler = ErrorDigestHandler(interval=0.01)
+    try:
+        handler.handle(error_record())
+        deadline = time.monotonic() + 5
+        while not mail.outbox and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(mail.outbox) == 1
+    finally:
+        handler.close()
+
+
+def test_counts_errors_reported_recently(handler):
+    handler.handle(error_record())
+    handler.flush()
+    handler.handle(error_record())
+    handler.flush()
+    assert len(mail.outbox) == 2  # noqa: PLR2004
+    assert "Traceback" not in mail.outbox[1].body
+    assert "Reported in a previous digest." in mail.outbox[1].body
+
+
+def test_drops_errors_beyond_max_groups(handler):
+    handler.handle(error_record(ValueError))
+    handler.handle(error_record(KeyError))
+    handler.handle(error_record(TypeError))
+    handler.handle(error_record(TypeError))
+    handler.flush()
+    [digest] = mail.outbox
+    assert "2 more errors, beyond 2 kinds." in digest.body
+    assert "TypeError" not in digest.body
+
+
+def test_sends_nothing_without_errors(handler):
+    handler.flush()
+    assert mail.outbox == []
+
+
+def test_mails_the_rest_when_closed():
+    handler = ErrorDigestHandler(interval=3600)
+    handler.handle(error_record())
+    handler.close()
+    assert len(mail.outbox) == 1
+    assert handler.thread is not None
+    assert not handler.thread.is_alive()
+
+
+def log_record(msg="Order %s ready", *args, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("bistro", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestBoundedQueueHandler:
+    def test_drops_records_when_full(self):
+        records: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(records)
+        for n in range(4):
+            handler.handle(log_record("Order %s ready", n))
+        assert handler.dropped == handler.dropped_total == 2  # noqa: PLR2004
+
+        # The count of dropped records goes first, once there's room.
+        records.get_nowait()
+        handler.handle(log_record("Order %s ready", 4))
+        assert handler.dropped == 1
+        records.get_nowait()
+        records.get_nowait()
+        handler.handle(log_record("Order %s ready", 5))
+        messages = [records.get_nowait().getMessage() for _ in range(2)]
+        assert messages == [
+            "Dropped 1 log records, the log queue was full.",
+            "Order 5 ready",
+        ]
+        assert handler.dropped == 0
+        assert handler.dropped_total == 3  # noqa: PLR2004
+
+    def test_listener_writes_records(self):
+        target = logging.handlers.BufferingHandler(capacity=10)
+        handler = BoundedQueueHandler(queue.Queue(maxsize=10))
+        handler.listener = logging.handlers.QueueListener(handler.queue, target)
+        handler.handle(error_record())
+        handler.close()
+        [record] = target.buffer
+        assert record.getMessage() == "Internal Server Error: /path/"
+        assert record.exc_info is None
+        assert record.exc_text is not None
+        assert "ValueError" in record.exc_text
+
+
+class TestJSONFormatter:
+    def test_format(self):
+        record = log_record("Order %s ready", 7, table="4")
+        with request_context("abc"):
+            RequestContextFilter().filter(record)
+        entry = json.loads(JSONFormatter().format(record))
+        assert entry["message"] == "Order 7 ready"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "bistro"
+        assert entry["request_id"] == "abc"
+        assert entry["request_ms"] <= 0
+        assert entry["table"] == "4"
+
+    def test_exceptions(self):
+        RequestContextFilter().filter(record := error_record())
+        entry = json.loads(JSONFormatter().format(record))
+        assert entry["request_id"] is None
+        assert entry["exc_info"].endswith("ValueError")
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import AsyncClient
+from django.test import Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from bistro.core.log import RequestContextFilter
+from bistro.core.middleware import RequestIDMiddleware
+from bistro.core.middleware import SessionMiddleware
+from bistro.core.middleware import WhiteNoiseMiddleware
+from bistro.core.middleware import is_token_api_request
+from bistro.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture
+def token_client(user: User) -> Client:
+    token = Token.objects.create(user=user)
+    return Client(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+
+@pytest.mark.parametrize(
+    ("path", "headers", "expected"),
+    [
+        ("/api/users/me/", {"HTTP_AUTHORIZATION": "Token x"}, True),
+        ("/api/users/me/", {}, False),
+        ("/users/~redirect/", {"HTTP_AUTHORIZATION": "Token x"}, False),
+    ],
+)
+def test_is_token_api_request(rf, path, headers, expected):
+    assert is_token_api_request(rf.get(path, **headers)) is expected
+
+
+class TestRequestIDMiddleware:
+    def test_tags_log_records(self, rf, caplog):
+        def view(request):
+            logger.warning("In the view")
+            return HttpResponse()
+
+        caplog.handler.addFilter(RequestContextFilter())
+        response = RequestIDMiddleware(view)(rf.get("/"))
+        [record] = caplog.records
+        assert len(response["X-Request-ID"]) == 32  # noqa: PLR2004
+        assert record.request_id == response["X-Request-ID"]
+        assert record.request_ms >= 0
+
+    @pytest.mark.parametrize(
+        ("header", "kept"),
+        [("edge-1f3a:42", True), ("a" * 129, False), ("a b", False)],
+    )
+    def test_keeps_valid_ids_of_the_proxy(self, rf, header, kept):
+        request = rf.get("/", headers={"X-Request-ID": header})
+        response = RequestIDMiddleware(lambda request: HttpResponse())(request)
+        assert (response["X-Request-ID"] == header) is kept
+        assert request.id == response["X-Request-ID"]
+
+    def test_async(self):
+        response = asyncio.run(
+            AsyncClient().get(reverse("home"), headers={"X-Request-ID": "abc"}),
+        )
+        assert response["X-Request-ID"] == "abc"
+
+
+class TestBrowserOnlyMiddleware:
+    def test_token_api_requests_skip_it(self, token_client):
+        response = token_client.get(reverse("api:user-me"))
+        assert response.status_code == HTTPStatus.OK
+        assert "X-Frame-Options" not in response
+        assert "Cookie" not in response.get("Vary", "")
+        assert not hasattr(response.wsgi_request, "session")
+
+    def test_session_api_requests_use_it(self, client, user):
+        client.force_login(user)
+        response = client.get(reverse("api:user-me"))
+        assert response.status_code == HTTPStatus.OK
+        assert response["X-Frame-Options"] == "DENY"
+
+    def test_pages_use_it(self, client):
+        response = client.get(reverse("home"))
+        assert response["X-Frame-Options"] == "DENY"
+        assert response.wsgi_request.session is not None
+
+    def test_csrf_is_enforced(self):
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(reverse("account_login"), {"login": "x"})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+class TestAsyncMiddleware:
+    def test_pages_use_it(self):
+        response = asyncio.run(AsyncClient().get(reverse("home")))
+        assert response.status_code == HTTPStatus.OK
+        assert response["X-Frame-Options"] == "DENY"
+        assert "Cookie" in response["Vary"]
+
+    def test_csrf_is_enforced(self):
+        client = AsyncClient(enforce_csrf_checks=True)
+        response = asyncio.run(client.post(reverse("account_login"), {"login": "x"}))
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    @pytest.mark.django_db(transaction=True)
+    def test_modified_sessions_are_saved(self, rf):
+        async def view(request):
+            request.session["seen"] = True
+            return HttpResponse()
+
+        response = asyncio.run(SessionMiddleware(view)(rf.get("/")))
+        assert response.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def test_static_files(self, rf, settings):
+        settings.WHITENOISE_USE_FINDERS = True
+
+        async def view(request):
+            return HttpResponse(b"view")
+
+        middleware = WhiteNoiseMiddleware(view)
+        response = asyncio.run(middleware(rf.get("/static/css/project.css")))
+        assert response.status_code == HTTPStatus.OK
+        assert b"".join(response.streaming_content)
+        response.close()
+        response = asyncio.run(middleware(rf.get("/")))
+        assert response.content == b"view"
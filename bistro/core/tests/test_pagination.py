@@ -0,0 +1,90 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from bistro.core.pagination import KeysetPagination
+from bistro.orders.models import Order
+from bistro.orders.tests.factories import OrderFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def orders() -> list[Order]:
+    now = timezone.now()
+    # Pairs of orders placed at the same (microsecond) time.
+    return [
+        OrderFactory.create(placed_at=now - timedelta(microseconds=n // 2), items=[])
+        for n in range(7)
+    ]
+
+
+def expected_uuids(orders) -> list[str]:
+    ordered = sorted(orders, key=lambda order: (order.placed_at, order.pk))
+    return [str(order.uuid) for order in reversed(ordered)]
+
+
+def walk(api_client, url) -> list[dict]:
+    pages = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        pages.append(response.data)
+        url = response.data["next"]
+    return pages
+
+
+class TestKeysetPagination:
+    url = reverse("api:order-list")
+
+    def test_pages(self, api_client, orders):
+        pages = walk(api_client, f"{self.url}?page_size=2")
+        assert [len(page["results"]) for page in pages] == [2, 2, 2, 1]
+        uuids = [order["uuid"] for page in pages for order in page["results"]]
+        assert uuids == expected_uuids(orders)
+        assert pages[0]["previous"] is None
+
+    def test_previous(self, api_client, orders):
+        pages = walk(api_client, f"{self.url}?page_size=2")
+        previous = api_client.get(pages[2]["previous"]).data
+        assert previous["results"] == pages[1]["results"]
+        assert previous["next"] == pages[1]["next"]
+        first = api_client.get(pages[1]["previous"]).data
+        assert first["results"] == pages[0]["results"]
+        assert first["previous"] is None
+
+    def test_deep_pages_cost_the_same(self, api_client, orders):
+        pages = walk(api_client, f"{self.url}?page_size=2")
+        with CaptureQueriesContext(connection) as first:
+            api_client.get(f"{self.url}?page_size=2")
+        with CaptureQueriesContext(connection) as deep:
+            api_client.get(pages[-2]["next"])
+        assert len(first) == len(deep)
+        assert not [q for q in deep if "COUNT(" in q["sql"]]
+        assert not [q for q in first if "COUNT(" in q["sql"]]
+
+    @pytest.mark.parametrize("cursor", ["nope", "eyJwIjogWzFdfQ", "W10"])
+    def test_invalid_cursor(self, api_client, cursor):
+        response = api_client.get(self.url, {"cursor": cursor})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_values_rows(self, api_client, user):
+        response = api_client.get(reverse("api:user-list"), {"page_size": 1})
+        assert response.data["next"] is None
+        assert response.data["results"][0]["name"] == user.name
+
+    def test_ordering_must_end_with_a_unique_field(self):
+        request = Request(APIRequestFactory().get("/"))
+        with pytest.raises(ImproperlyConfigured):
+            KeysetPagination().paginate_queryset(
+                Order.objects.order_by("placed_at"),
+                request,
+            )
@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+
+from bistro.core.paginator import EstimatedCountPaginator
+from bistro.users.models import User
+from bistro.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def users() -> list[User]:
+    users = UserFactory.create_batch(3)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE users_user")
+    return users
+
+
+class TestEstimatedCountPaginator:
+    def test_estimates_large_tables(self, users, django_assert_num_queries):
+        # The table's estimate is one row short.
+        User.objects.filter(pk=users[0].pk).delete()
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 2)
+        paginator.exact_count_below = 3
+        with django_assert_num_queries(1) as captured:
+            assert paginator.count == len(users)
+        assert "pg_class" in captured[0]["sql"]
+
+    def test_counts_small_tables(self, users):
+        User.objects.filter(pk=users[0].pk).delete()
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 2)
+        assert paginator.count == len(users) - 1
+
+    def test_counts_filtered_querysets(self, users, django_assert_num_queries):
+        queryset = User.objects.filter(email=users[0].email).order_by("pk")
+        paginator = EstimatedCountPaginator(queryset, 2)
+        paginator.exact_count_below = 0
+        with django_assert_num_queries(1) as captured:
+            assert paginator.count == 1
+        assert "COUNT(*)" in captured[0]["sql"]
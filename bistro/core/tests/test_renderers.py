@@ -0,0 +1,79 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils.translation import gettext_lazy as _
+from rest_framework import parsers
+from rest_framework import renderers as drf_renderers
+from rest_framework.exceptions import ParseError
+
+from bistro.core import renderers
+from bistro.core.parsers import JSONParser
+from bistro.core.renderers import JSONRenderer
+
+DATA = {
+    "uuid": uuid.UUID("5b1c0f5e-8a42-4f6e-9a35-1b2c3d4e5f60"),
+    "placed_at": datetime.datetime(2025, 3, 1, 12, 30, 1, 123456, tzinfo=datetime.UTC),
+    "date": datetime.date(2025, 3, 1),
+    "time": datetime.time(12, 30, 1, 500),
+    "unit_price": decimal.Decimal("12.50"),
+    "status": _("New"),
+    "name": "Crème brûlée\u2028\u2029",
+    "items": [{"quantity": 2, "notes": ""}],
+    1: None,
+}
+
+
+@pytest.fixture
+def without_orjson(monkeypatch):
+    monkeypatch.setattr(renderers, "orjson", None)
+    monkeypatch.setattr("bistro.core.parsers.orjson", None)
+
+
+class TestJSONRenderer:
+    def test_matches_drf(self):
+        expected = drf_renderers.JSONRenderer().render(DATA)
+        assert JSONRenderer().render(DATA) == expected
+
+    def test_indent_falls_back(self):
+        context = {"indent": 4}
+        expected = drf_renderers.JSONRenderer().render(DATA, None, context)
+        assert JSONRenderer().render(DATA, None, context) == expected
+
+    def test_big_integers_fall_back(self):
+        data = {"n": 2**70}
+        assert JSONRenderer().render(data) == b'{"n":%d}' % 2**70
+
+    def test_none(self):
+        assert JSONRenderer().render(None) == b""
+
+    @pytest.mark.usefixtures("without_orjson")
+    def test_without_orjson(self):
+        assert JSONRenderer().render(DATA) == drf_renderers.JSONRenderer().render(
+            DATA,
+        )
+
+
+class TestJSONParser:
+    def parse(self, content: bytes, **context):
+        return JSONParser().parse(io.BytesIO(content), parser_context=context)
+
+    def test_matches_drf(self):
+        content = JSONRenderer().render(DATA)
+        expected = parsers.JSONParser().parse(io.BytesIO(content))
+        assert self.parse(content) == expected
+
+    @pytest.mark.parametrize("content", [b"{", b'{"n": NaN}'])
+    def test_invalid(self, content):
+        with pytest.raises(ParseError):
+            self.parse(content)
+
+    def test_other_encodings_fall_back(self):
+        content = '{"name": "Crème"}'.encode("latin-1")
+        assert self.parse(content, encoding="latin-1") == {"name": "Crème"}
+
+    @pytest.mark.usefixtures("without_orjson")
+    def test_without_orjson(self):
+        assert self.parse(b'{"n": 1}') == {"n": 1}
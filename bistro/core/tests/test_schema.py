@@ -0,0 +1,82 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+import yaml
+from django.core.management import call_command
+from django.urls import reverse
+
+from bistro.core import schema
+from bistro.core.schema import get_schema_artifacts
+
+
+@pytest.fixture(autouse=True)
+def _artifacts(settings):
+    settings.SCHEMA_ARTIFACTS_DIR = None
+    get_schema_artifacts.cache_clear()
+    yield
+    get_schema_artifacts.cache_clear()
+
+
+@pytest.fixture
+def generations(monkeypatch) -> list[int]:
+    calls = []
+    generate = schema.generate_schema_artifacts
+
+    def counting():
+        calls.append(1)
+        return generate()
+
+    monkeypatch.setattr(schema, "generate_schema_artifacts", counting)
+    return calls
+
+
+class TestSchemaView:
+    url = reverse("api-schema")
+
+    def test_generated_once(self, admin_client, generations):
+        first = admin_client.get(self.url)
+        second = admin_client.get(self.url)
+        assert first.status_code == second.status_code == HTTPStatus.OK
+        assert first.content == second.content
+        assert yaml.safe_load(first.content)["info"]["title"] == "bistro API"
+        assert first["Content-Type"] == "application/vnd.oai.openapi; charset=utf-8"
+        assert len(generations) == 1
+
+    def test_formats(self, admin_client):
+        yaml_response = admin_client.get(self.url)
+        json_response = admin_client.get(self.url, {"format": "json"})
+        assert json.loads(json_response.content) == yaml.safe_load(
+            yaml_response.content,
+        )
+        assert json_response["ETag"] != yaml_response["ETag"]
+
+    def test_not_modified(self, admin_client):
+        etag = admin_client.get(self.url)["ETag"]
+        response = admin_client.get(self.url, headers={"If-None-Match": etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_other_languages_are_generated(self, admin_client, generations):
+        response = admin_client.get(self.url, {"lang": "en"})
+        assert response.status_code == HTTPStatus.OK
+        assert not generations
+
+    @pytest.mark.django_db
+    def test_requires_admin(self, client):
+        assert client.get(self.url).status_code == HTTPStatus.FORBIDDEN
+
+
+def test_build_schema(tmp_path, settings, generations):
+    call_command("build_schema", output=str(tmp_path), stdout=StringIO())
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert sorted(manifest) == ["json", "yaml"]
+
+    settings.SCHEMA_ARTIFACTS_DIR = str(tmp_path)
+    artifacts = get_schema_artifacts()
+    for name, filename in manifest.items():
+        assert filename == f"schema.{artifacts[name].digest}.{name}"
+        assert (tmp_path / filename).read_bytes() == artifacts[name].content
+    assert len(generations) == 1
@@ -0,0 +1,40 @@
+import pytest
+
+from bistro.core.search import prefix_query
+from bistro.users.models import SEARCH_VECTOR
+from bistro.users.models import User
+from bistro.users.tests.factories import UserFactory
+
+
+def test_prefix_query_of_blank_terms():
+    assert prefix_query("  ") is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("search_term", "found"),
+    [
+        ("ada", True),
+        ("LOVE ada", True),
+        ("ada@example.com", True),
+        ("ada@exa", True),
+        ("example", True),
+        ("@example.com", True),
+        ("example.com", True),
+        ("ada babbage", False),
+        # Neither infixes nor misspellings match.
+        ("velace", False),
+        ("xample", False),
+        ("lovelase", False),
+        # Operators and quotes are matched, not interpreted.
+        ("ada | babbage", False),
+        ("o'brien", False),
+        ("ada\\", True),
+    ],
+)
+def test_prefix_query(search_term, found):
+    UserFactory.create(name="Ada Lovelace", email="ada@example.com")
+    users = User.objects.alias(search=SEARCH_VECTOR).filter(
+        search=prefix_query(search_term),
+    )
+    assert users.exists() is found
@@ -0,0 +1,66 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework.test import APIRequestFactory
+
+from bistro.core.serializers import URLTemplate
+from bistro.core.serializers import ValuesSerializer
+from bistro.orders.api.serializers import OrderSerializer
+from bistro.users.api.serializers import UserSerializer
+from bistro.users.api.serializers import UserValuesSerializer
+from bistro.users.models import User
+from bistro.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def context() -> dict:
+    return {"request": APIRequestFactory().get("/api/users/")}
+
+
+class TestValuesSerializer:
+    def test_matches_the_model_serializer(self, context):
+        UserFactory.create_batch(3)
+        queryset = User.objects.order_by("pk")
+        rows = UserValuesSerializer.values(queryset)
+        assert (
+            UserValuesSerializer(rows, many=True, context=context).data
+            == UserSerializer(queryset, many=True, context=context).data
+        )
+
+    def test_columns(self):
+        assert UserValuesSerializer.get_columns() == ["name", "pk"]
+
+    def test_without_request(self, user):
+        rows = UserValuesSerializer.values(User.objects.all())
+        data = UserValuesSerializer(rows, many=True).data
+        assert data[0]["url"] == f"/api/users/{user.pk}/"
+
+    def test_nested_serializers_are_rejected(self):
+        class OrderValuesSerializer(ValuesSerializer):
+            serializer_class = OrderSerializer
+
+        with pytest.raises(ImproperlyConfigured, match="'items'"):
+            OrderValuesSerializer.get_columns()
+
+
+@pytest.mark.parametrize("value", [1, "a b", "ü"])
+def test_url_template(value, context):
+    template = URLTemplate("api:user-detail", "pk", context["request"])
+    assert template.parts is not None
+    assert template(value) == context["request"].build_absolute_uri(
+        reverse("api:user-detail", kwargs={"pk": value}),
+    )
+
+
+def test_user_list(user, django_assert_num_queries):
+    client = APIClient()
+    client.force_authenticate(user)
+    # Only the rows, the conditional GET's ETag is built from them too.
+    with django_assert_num_queries(1):
+        response = client.get(reverse("api:user-list"))
+    assert response.json()["results"] == [
+        {"name": user.name, "url": f"http://testserver/api/users/{user.pk}/"},
+    ]
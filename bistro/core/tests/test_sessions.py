@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.utils import timezone
+
+from bistro.core.sessions import SessionStore
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _sessions(settings):
+    settings.SESSION_CLEANUP_PROBABILITY = 0
+    settings.SESSION_CLEANUP_BATCH_SIZE = 2
+    cache.clear()
+
+
+@pytest.fixture
+def session_key() -> str:
+    session = SessionStore()
+    session["cart"] = [1, 2]
+    session.save()
+    assert session.session_key is not None
+    return session.session_key
+
+
+def expired_session(key: str) -> Session:
+    return Session.objects.create(
+        session_key=key,
+        session_data="",
+        expire_date=timezone.now() - timedelta(days=1),
+    )
+
+
+class TestSessionStore:
+    def test_reads_from_the_cache(self, session_key, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert SessionStore(session_key)["cart"] == [1, 2]
+
+    def test_falls_back_to_the_database(self, session_key):
+        cache.clear()
+        session = SessionStore(session_key)
+        assert session["cart"] == [1, 2]
+        assert cache.get(session.cache_key)[0] == {"cart": [1, 2]}
+
+    def test_unchanged_session_is_not_written(
+        self,
+        session_key,
+        django_assert_num_queries,
+    ):
+        session = SessionStore(session_key)
+        session["cart"] = [1, 2]
+        assert session.modified
+        with django_assert_num_queries(0):
+            session.save()
+
+    def test_changed_session_is_written(self, session_key):
+        session = SessionStore(session_key)
+        session["cart"].append(3)
+        session.save()
+        cache.clear()
+        assert SessionStore(session_key)["cart"] == [1, 2, 3]
+
+    def test_expiry_is_refreshed(self, session_key, settings):
+        Session.objects.filter(pk=session_key).update(
+            expire_date=timezone.now() + timedelta(seconds=60),
+        )
+        cache.clear()
+        session = SessionStore(session_key)
+        session.load()
+        session.save()
+        stored = Session.objects.get(pk=session_key)
+        age = timedelta(seconds=settings.SESSION_COOKIE_AGE)
+        assert stored.expire_date > timezone.now() + age / 2
+
+    def test_clear_expired_in_batches(self, session_key):
+        for n in range(5):
+            expired_session(f"expired{n}")
+        SessionStore.clear_expired(max_batches=1)
+        assert Session.objects.count() == 4  # noqa: PLR2004
+        SessionStore.clear_expired()
+        assert list(Session.objects.values_list("pk", flat=True)) == [session_key]
+
+    def test_creating_sessions_deletes_expired_ones(self, settings):
+        settings.SESSION_CLEANUP_PROBABILITY = 1
+        expired_session("expired")
+        SessionStore().create()
+        assert not Session.objects.filter(pk="expired").exists()
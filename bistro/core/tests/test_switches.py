@@ -0,0 +1,52 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from bistro.core import switches
+from bistro.users.models import User
+
+
+def test_count_switches():
+    switches.install()
+
+    async def scenario():
+        with switches.count_switches() as count:
+            await sync_to_async(async_to_sync(asyncio.sleep))(0)
+        await sync_to_async(int)()
+        return count[0]
+
+    assert asyncio.run(scenario()) == 2  # noqa: PLR2004
+
+
+class TestContextSwitchMiddleware:
+    # SecurityMiddleware runs both of its hooks in a thread, and the view (if
+    # sync) and rendering the response take a switch each.
+
+    def test_page(self, settings):
+        settings.DEBUG = True
+        response = asyncio.run(AsyncClient().get(reverse("home")))
+        assert response.status_code == HTTPStatus.OK
+        assert response["X-Context-Switches"] == "3"
+
+    @pytest.mark.django_db(transaction=True)
+    def test_token_api_request(self, settings, user: User):
+        settings.DEBUG = True
+        token = Token.objects.create(user=user)
+        response = asyncio.run(
+            AsyncClient().get(
+                reverse("api:user-me"),
+                headers={"Authorization": f"Token {token.key}"},
+            ),
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response["X-Context-Switches"] == "4"
+
+    def test_disabled_by_default(self):
+        response = asyncio.run(AsyncClient().get(reverse("home")))
+        assert "X-Context-Switches" not in response
@@ -0,0 +1,91 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncClient
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from bistro.core.transaction import atomic_unless_safe
+from bistro.orders.api.views import OrderViewSet
+from bistro.orders.tests.factories import make_payload
+from bistro.users.models import User
+
+
+@pytest.fixture
+def in_transaction() -> list[bool]:
+    return []
+
+
+@pytest.fixture
+def view(in_transaction):
+    @atomic_unless_safe
+    def view(request):
+        in_transaction.append(connection.in_atomic_block)
+        return HttpResponse()
+
+    return view
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAtomicUnlessSafe:
+    @pytest.mark.parametrize("method", ["get", "head", "options"])
+    def test_safe_methods_run_in_autocommit(self, view, in_transaction, method):
+        view(getattr(RequestFactory(), method)("/"))
+        assert in_transaction == [False]
+
+    @pytest.mark.parametrize("method", ["post", "put", "patch", "delete"])
+    def test_unsafe_methods_are_atomic(self, view, in_transaction, method):
+        view(getattr(RequestFactory(), method)("/"))
+        assert in_transaction == [True]
+
+    def test_opts_out_of_atomic_requests(self, view):
+        assert view._non_atomic_requests == {"default"}  # noqa: SLF001
+
+    def test_viewset_mixin(self):
+        view = OrderViewSet.as_view({"get": "list"})
+        assert view._non_atomic_requests == {"default"}  # noqa: SLF001
+        assert view.cls is OrderViewSet
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTransactionCountMiddleware:
+    def test_get_runs_without_a_transaction(self, settings, api_client: APIClient):
+        settings.DEBUG = True
+        response = api_client.get(reverse("api:order-list"))
+        assert response.status_code == HTTPStatus.OK
+        assert int(response["X-DB-Queries"]) > 0
+        assert response["X-DB-Transactions"] == "0"
+
+    def test_post_runs_in_one_transaction(self, settings, api_client: APIClient):
+        settings.DEBUG = True
+        response = api_client.post(
+            reverse("api:order-bulk"),
+            make_payload(2),
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response["X-DB-Transactions"] == "1"
+
+    def test_async_requests(self, settings, user: User):
+        settings.DEBUG = True
+        token = Token.objects.create(user=user)
+        response = asyncio.run(
+            AsyncClient().get(
+                reverse("api:order-list"),
+                headers={"Authorization": f"Token {token.key}"},
+            ),
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert int(response["X-DB-Queries"]) > 0
+        assert response["X-DB-Transactions"] == "0"
+
+    def test_disabled_by_default(self, user: User):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(reverse("api:order-list"))
+        assert "X-DB-Transactions" not in response
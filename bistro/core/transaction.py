@@ -0,0 +1,81 @@
+"""
+Request transactions by HTTP method.
+
+``ATOMIC_REQUESTS`` wraps every view in a transaction, GETs included, which
+costs a BEGIN/COMMIT round trip each and, behind a transaction pooler, holds
+a server connection for the whole view. ``atomic_unless_safe`` (and
+``AtomicUnlessSafeMixin`` for class-based views and viewsets) keep the
+transaction for requests that may write and run safe methods in autocommit.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+from typing import TYPE_CHECKING
+
+from django.db import connections
+from django.db import transaction
+from psycopg.pq import TransactionStatus
+
+if TYPE_CHECKING:
+    from rest_framework.viewsets import ViewSetMixin as _ViewSetBase
+else:
+    _ViewSetBase = object
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def atomic_unless_safe(view):
+    """Apply ``ATOMIC_REQUESTS`` to ``view`` for unsafe methods only."""
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return view(request, *args, **kwargs)
+        with contextlib.ExitStack() as stack:
+            for alias, settings_dict in connections.settings.items():
+                if settings_dict["ATOMIC_REQUESTS"]:
+                    stack.enter_context(transaction.atomic(using=alias))
+            return view(request, *args, **kwargs)
+
+    return non_atomic(wrapper)
+
+
+def non_atomic(view):
+    """Exclude ``view`` from ``ATOMIC_REQUESTS`` on every database."""
+    for alias in connections:
+        view = transaction.non_atomic_requests(using=alias)(view)
+    return view
+
+
+class AtomicUnlessSafeMixin(_ViewSetBase):
+    """``atomic_unless_safe`` for class-based views and viewsets."""
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        return atomic_unless_safe(super().as_view(*args, **kwargs))
+
+
+class TransactionCounter:
+    """
+    Database execute wrapper counting queries and transactions.
+
+    A transaction is counted when a query starts one on the server, i.e.
+    outside autocommit with no transaction in progress; each query run in
+    autocommit is its own implicit transaction and isn't counted.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.transactions = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        connection = context["connection"]
+        self.queries += 1
+        if (
+            not connection.get_autocommit()
+            and connection.connection.info.transaction_status == TransactionStatus.IDLE
+        ):
+            self.transactions += 1
+        return execute(sql, params, many, context)
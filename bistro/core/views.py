@@ -0,0 +1,21 @@
+from django.views.generic import TemplateView
+
+from .transaction import non_atomic
+
+
+class AsyncTemplateView(TemplateView):
+    """
+    ``TemplateView`` served on the event loop under ASGI.
+
+    Only rendering the template, which may query the database (for
+    ``request.user``), runs in a thread. ``ATOMIC_REQUESTS`` can't wrap async
+    views, so ``as_view()`` excludes it; the view doesn't write anyway.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return non_atomic(super().as_view(**initkwargs))
+
+    async def get(self, request, *args, **kwargs):
+        context = self.get_context_data(**kwargs)
+        return self.render_to_response(context)
@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import Order
+from .models import OrderItem
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    inlines = [OrderItemInline]
+    list_display = ["uuid", "table", "status", "placed_at", "created_by"]
+    list_filter = ["status"]
+    list_select_related = ["created_by"]
+    raw_id_fields = ["created_by"]
+    search_fields = ["uuid", "table"]
+    ordering = ["-placed_at"]
@@ -0,0 +1,100 @@
+import uuid
+
+from django.db import IntegrityError
+from django.db import transaction
+from rest_framework import serializers
+
+from bistro.orders.events import ORDER_CREATED
+from bistro.orders.events import publish_order
+from bistro.orders.models import Order
+from bistro.orders.models import OrderItem
+
+# Rows per INSERT statement; keeps a single statement well below the
+# PostgreSQL bind parameter limit for very large flushes.
+BULK_BATCH_SIZE = 1000
+
+
+class OrderItemSerializer(serializers.ModelSerializer[OrderItem]):
+    class Meta:
+        model = OrderItem
+        fields = ["name", "station", "quantity", "unit_price", "notes"]
+
+
+class OrderListSerializer(serializers.ListSerializer):
+    """
+    Creates a batch of orders and their items with bulk inserts.
+
+    Orders whose ``uuid`` is already stored, or repeated within the batch,
+    are skipped, which makes resubmitting an offline queue idempotent. A
+    concurrent request storing some of the same orders first makes the
+    inserts fail, they are then retried without those. The number of
+    queries does not depend on the size of the batch.
+    """
+
+    # The uuids of the orders skipped, in the order they were submitted.
+    skipped: list[uuid.UUID]
+
+    def create(self, validated_data):
+        batch: list[tuple[uuid.UUID, dict]] = [
+            (attrs.pop("uuid", None) or uuid.uuid4(), attrs) for attrs in validated_data
+        ]
+        while True:
+            stored = self.stored_uuids([order_uuid for order_uuid, _ in batch])
+            pending: dict[uuid.UUID, dict] = {}
+            self.skipped = []
+            for order_uuid, attrs in batch:
+                if order_uuid in stored or order_uuid in pending:
+                    self.skipped.append(order_uuid)
+                else:
+                    pending[order_uuid] = attrs
+            try:
+                with transaction.atomic():
+                    orders, items = self.insert(pending)
+            except IntegrityError:
+                # Only retry for orders stored since, not for other errors.
+                if not self.stored_uuids(list(pending)):
+                    raise
+                continue
+            break
+        # bulk_create() bypasses post_save, so events are published here.
+        for order, order_items in zip(orders, items, strict=True):
+            publish_order(order, ORDER_CREATED, order_items)
+        return orders
+
+    def stored_uuids(self, uuids: list[uuid.UUID]) -> set[uuid.UUID]:
+        return set(Order.objects.filter(uuid__in=uuids).values_list("uuid", flat=True))
+
+    def insert(
+        self,
+        pending: dict[uuid.UUID, dict],
+    ) -> tuple[list[Order], list[list[OrderItem]]]:
+        orders = []
+        items: list[list[OrderItem]] = []
+        for order_uuid, attrs in pending.items():
+            fields = {name: value for name, value in attrs.items() if name != "items"}
+            order = Order(uuid=order_uuid, **fields)
+            orders.append(order)
+            items.append([OrderItem(order=order, **item) for item in attrs["items"]])
+
+        Order.objects.bulk_create(orders, batch_size=BULK_BATCH_SIZE)
+        OrderItem.objects.bulk_create(
+            [item for order_items in items for item in order_items],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        return orders, items
+
+
+class OrderSerializer(serializers.ModelSerializer[Order]):
+    items = OrderItemSerializer(many=True, allow_empty=False)
+
+    class Meta:
+        model = Order
+        fields = ["uuid", "table", "status", "placed_at", "items", "url"]
+        list_serializer_class = OrderListSerializer
+
+        extra_kwargs = {
+            "url": {"view_name": "api:order-detail", "lookup_field": "pk"},
+            # Uniqueness is resolved for the whole batch at once by
+            # OrderListSerializer instead of one query per order.
+            "uuid": {"validators": []},
+        }
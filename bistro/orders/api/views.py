@@ -0,0 +1,51 @@
+from typing import cast
+
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.mixins import ListModelMixin
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from bistro.core.conditional import ConditionalGetMixin
+from bistro.core.transaction import AtomicUnlessSafeMixin
+from bistro.orders.models import Order
+
+from .serializers import OrderListSerializer
+from .serializers import OrderSerializer
+
+
+class OrderViewSet(
+    AtomicUnlessSafeMixin,
+    ConditionalGetMixin,
+    RetrieveModelMixin,
+    ListModelMixin,
+    GenericViewSet,
+):
+    serializer_class = OrderSerializer
+    queryset = Order.objects.prefetch_related("items").order_by("-placed_at", "-id")
+    lookup_field = "pk"
+    # Upper bound on the number of orders accepted by a single bulk request.
+    bulk_max_orders = 500
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """Ingest a batch of orders with their items in one request."""
+        serializer = cast(
+            "OrderListSerializer",
+            self.get_serializer(
+                data=request.data,
+                many=True,
+                allow_empty=False,
+                max_length=self.bulk_max_orders,
+            ),
+        )
+        serializer.is_valid(raise_exception=True)
+        orders = serializer.save(created_by=request.user)
+        return Response(
+            status=status.HTTP_201_CREATED,
+            data={
+                "created": [order.uuid for order in orders],
+                "skipped": serializer.skipped,
+            },
+        )
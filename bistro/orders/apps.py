@@ -0,0 +1,13 @@
+import contextlib
+
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class OrdersConfig(AppConfig):
+    name = "bistro.orders"
+    verbose_name = _("Orders")
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import bistro.orders.signals  # noqa: F401
@@ -0,0 +1,53 @@
+"""Order events pushed to the kitchen board once the transaction commits."""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import partial
+
+from django.db import transaction
+
+from .kitchen import board
+from .models import Order
+from .models import OrderItem
+
+ORDER_CREATED = "order.created"
+ORDER_UPDATED = "order.updated"
+
+
+def publish_order(
+    order: Order,
+    event: str,
+    items: Iterable[OrderItem] | None = None,
+) -> None:
+    """
+    Publish ``event`` for ``order`` to the stations preparing its items.
+
+    Items are read after commit when not given, so orders whose items are
+    saved after the order itself (e.g. admin inlines) are complete.
+    """
+    transaction.on_commit(partial(_publish, order, event, items))
+
+
+def _publish(order: Order, event: str, items: Iterable[OrderItem] | None) -> None:
+    if items is None:
+        items = order.items.all()
+    by_station: defaultdict[str, list[dict]] = defaultdict(list)
+    for item in items:
+        by_station[item.station].append(
+            {"name": item.name, "quantity": item.quantity, "notes": item.notes},
+        )
+    for station, station_items in by_station.items():
+        board.publish(
+            station,
+            {
+                "type": event,
+                "order": {
+                    "id": order.pk,
+                    "uuid": order.uuid,
+                    "table": order.table,
+                    "status": order.status,
+                    "placed_at": order.placed_at,
+                    "items": station_items,
+                },
+            },
+        )
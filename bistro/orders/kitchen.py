@@ -0,0 +1,176 @@
+"""
+Fan-out of order events to kitchen display websockets.
+
+Kitchen screens keep one websocket open and subscribe to the stations they
+display. Events go through the broadcast backplane, so a screen connected to
+any worker receives orders placed through any other worker. Idle connections
+only cost a ``Subscriber`` entry in the board; a delivery task is spawned on
+demand while a connection has pending messages.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from bistro.core.broadcast import Broadcast
+from bistro.core.broadcast import get_broadcast
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+# 1001 "Going Away": the worker is shutting down, reconnect elsewhere.
+CLOSE_GOING_AWAY = 1001
+# 1013 "Try Again Later": sent to screens that cannot keep up.
+CLOSE_SLOW_CONSUMER = 1013
+
+
+class Subscriber:
+    """A websocket connection subscribed to one or more stations."""
+
+    __slots__ = ("_pending", "_send", "_task", "closed", "stations")
+
+    # Frames buffered for a connection before it is treated as a slow consumer.
+    max_pending = 256
+
+    def __init__(self, send: Send):
+        self._send = send
+        # Text frames, or a close code that ends the connection.
+        self._pending: deque[str | int] = deque()
+        self._task: asyncio.Task | None = None
+        self.closed = False
+        self.stations: set[str] = set()
+
+    def deliver(self, text: str) -> None:
+        """Queue a text frame; must be called from the event loop."""
+        if self.closed:
+            return
+        if len(self._pending) >= self.max_pending:
+            # Memory stays bounded: the screen is disconnected instead, and
+            # reloads open orders when it reconnects.
+            logger.warning("Disconnecting slow kitchen board subscriber")
+            self._pending.clear()
+            self.close(CLOSE_SLOW_CONSUMER)
+            return
+        self._pending.append(text)
+        self._schedule_flush()
+
+    def close(self, code: int) -> asyncio.Task | None:
+        """
+        Close the connection once the frames already queued are sent.
+
+        Returns the task delivering them, if any.
+        """
+        if not self.closed:
+            self.closed = True
+            self._pending.append(code)
+            self._schedule_flush()
+        return self._task
+
+    def _schedule_flush(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self) -> None:
+        try:
+            while self._pending:
+                frame = self._pending.popleft()
+                if isinstance(frame, int):
+                    await self._send({"type": "websocket.close", "code": frame})
+                    return
+                await self._send({"type": "websocket.send", "text": frame})
+        except OSError:
+            # The client went away; the receive loop unsubscribes it.
+            self._pending.clear()
+        finally:
+            self._task = None
+
+
+class KitchenBoard:
+    """Registry of the subscribers per station held by this worker."""
+
+    channel_prefix = "kitchen:"
+
+    def __init__(self, broadcast: Broadcast | None = None):
+        self._broadcast = broadcast
+        self._stations: dict[str, set[Subscriber]] = {}
+
+    @property
+    def broadcast(self) -> Broadcast:
+        if self._broadcast is None:
+            self._broadcast = get_broadcast()
+        return self._broadcast
+
+    async def subscribe(self, subscriber: Subscriber, station: str) -> None:
+        subscriber.stations.add(station)
+        subscribers = self._stations.get(station)
+        if subscribers is None:
+            subscribers = self._stations[station] = set()
+            subscribers.add(subscriber)
+            await self.broadcast.subscribe(
+                self.channel_prefix + station,
+                self._dispatch,
+            )
+        else:
+            subscribers.add(subscriber)
+
+    async def unsubscribe(
+        self,
+        subscriber: Subscriber,
+        station: str | None = None,
+    ) -> None:
+        stations = [station] if station else list(subscriber.stations)
+        for name in stations:
+            subscriber.stations.discard(name)
+            subscribers = self._stations.get(name)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._stations[name]
+                    await self.broadcast.unsubscribe(
+                        self.channel_prefix + name,
+                        self._dispatch,
+                    )
+
+    def subscribers(self) -> set[Subscriber]:
+        return {s for subscribers in self._stations.values() for s in subscribers}
+
+    def subscriber_count(self, station: str | None = None) -> int:
+        if station is not None:
+            return len(self._stations.get(station, ()))
+        return len(self.subscribers())
+
+    def publish(self, station: str, message: dict[str, Any]) -> None:
+        """
+        Send ``message`` to every subscriber of ``station`` on every worker.
+
+        Safe to call from any thread, e.g. from a sync Django view running
+        in the ASGI thread pool. The message is encoded once per publish.
+        """
+        self.broadcast.publish(
+            self.channel_prefix + station,
+            json.dumps(message, cls=DjangoJSONEncoder),
+        )
+
+    async def drain(self, grace_period: float) -> None:
+        """Deliver queued frames, then close every connection of this worker."""
+        tasks = [
+            task
+            for subscriber in self.subscribers()
+            if (task := subscriber.close(CLOSE_GOING_AWAY)) is not None
+        ]
+        if tasks:
+            await asyncio.wait(tasks, timeout=grace_period)
+
+    def _dispatch(self, channel: str, text: str) -> None:
+        for subscriber in self._stations.get(channel[len(self.channel_prefix) :], ()):
+            subscriber.deliver(text)
+
+
+board = KitchenBoard()
@@ -0,0 +1,84 @@
+import uuid
+
+from django.conf import settings
+from django.core.validators import MinValueValidator
+from django.db.models import CASCADE
+from django.db.models import SET_NULL
+from django.db.models import CharField
+from django.db.models import DateTimeField
+from django.db.models import DecimalField
+from django.db.models import ForeignKey
+from django.db.models import Model
+from django.db.models import PositiveSmallIntegerField
+from django.db.models import TextChoices
+from django.db.models import UUIDField
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+
+
+class Order(TimeStampedModel):
+    """
+    A guest order taken at a POS terminal.
+    The terminal generates ``uuid`` itself, so orders queued while offline
+    can be resubmitted without being ingested twice.
+    """
+
+    class Status(TextChoices):
+        NEW = "new", _("New")
+        IN_PROGRESS = "in_progress", _("In progress")
+        READY = "ready", _("Ready")
+        SERVED = "served", _("Served")
+        CANCELLED = "cancelled", _("Cancelled")
+
+    uuid = UUIDField(_("UUID"), default=uuid.uuid4, unique=True)
+    table = CharField(_("Table"), blank=True, max_length=32)
+    status = CharField(
+        _("Status"),
+        max_length=16,
+        choices=Status.choices,
+        default=Status.NEW,
+    )
+    placed_at = DateTimeField(_("Placed at"), default=timezone.now)
+    created_by = ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=SET_NULL,
+        null=True,
+        blank=True,
+        related_name="orders",
+        verbose_name=_("Created by"),
+    )
+
+    class Meta:
+        verbose_name = _("order")
+        verbose_name_plural = _("orders")
+
+    def __str__(self) -> str:
+        return str(self.uuid)
+
+
+class OrderItem(Model):
+    """A line item of an order, routed to the kitchen station preparing it."""
+
+    order = ForeignKey(
+        Order,
+        on_delete=CASCADE,
+        related_name="items",
+        verbose_name=_("Order"),
+    )
+    name = CharField(_("Name"), max_length=255)
+    station = CharField(_("Station"), max_length=64, default="kitchen")
+    quantity = PositiveSmallIntegerField(
+        _("Quantity"),
+        default=1,
+        validators=[MinValueValidator(1)],
+    )
+    unit_price = DecimalField(_("Unit price"), max_digits=10, decimal_places=2)
+    notes = CharField(_("Notes"), blank=True, max_length=255)
+
+    class Meta:
+        verbose_name = _("order item")
+        verbose_name_plural = _("order items")
+
+    def __str__(self) -> str:
+        return f"{self.quantity} x {self.name}"
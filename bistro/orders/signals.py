@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .events import ORDER_CREATED
+from .events import ORDER_UPDATED
+from .events import publish_order
+from .models import Order
+from .models import OrderItem
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance: Order, created: bool, **kwargs):  # noqa: FBT001
+    publish_order(instance, ORDER_CREATED if created else ORDER_UPDATED)
+
+
+@receiver(post_save, sender=OrderItem)
+@receiver(post_delete, sender=OrderItem)
+def order_item_changed(sender, instance: OrderItem, **kwargs):
+    # The order's timestamp versions its API representation, items included.
+    Order.objects.filter(pk=instance.order_id).update(modified=timezone.now())
@@ -0,0 +1,17 @@
+from django.urls import resolve
+from django.urls import reverse
+
+
+def test_order_detail():
+    assert reverse("api:order-detail", kwargs={"pk": 1}) == "/api/orders/1/"
+    assert resolve("/api/orders/1/").view_name == "api:order-detail"
+
+
+def test_order_list():
+    assert reverse("api:order-list") == "/api/orders/"
+    assert resolve("/api/orders/").view_name == "api:order-list"
+
+
+def test_order_bulk():
+    assert reverse("api:order-bulk") == "/api/orders/bulk/"
+    assert resolve("/api/orders/bulk/").view_name == "api:order-bulk"
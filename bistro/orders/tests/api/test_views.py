@@ -0,0 +1,128 @@
+import uuid
+from http import HTTPStatus
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from bistro.orders.api.serializers import OrderListSerializer
+from bistro.orders.models import Order
+from bistro.orders.models import OrderItem
+from bistro.orders.tests.factories import OrderFactory
+from bistro.orders.tests.factories import make_payload
+from bistro.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+class TestOrderViewSet:
+    def test_list(self, api_client: APIClient):
+        order = OrderFactory.create()
+        response = api_client.get(reverse("api:order-list"))
+        assert response.status_code == HTTPStatus.OK
+        results = response.data["results"]
+        assert [o["uuid"] for o in results] == [str(order.uuid)]
+        assert len(results[0]["items"]) == len(order.items.all())
+
+    def test_retrieve(self, api_client: APIClient):
+        order = OrderFactory.create()
+        response = api_client.get(
+            reverse("api:order-detail", kwargs={"pk": order.pk}),
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["url"] == f"http://testserver/api/orders/{order.pk}/"
+
+    def test_bulk_creates_orders_and_items(self, api_client: APIClient, user: User):
+        payload = make_payload(3)
+        response = api_client.post(
+            reverse("api:order-bulk"),
+            payload,
+            format="json",
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert [str(u) for u in response.data["created"]] == [
+            o["uuid"] for o in payload
+        ]
+        assert response.data["skipped"] == []
+        assert Order.objects.filter(created_by=user).count() == len(payload)
+        assert OrderItem.objects.count() == 2 * len(payload)
+        burger = OrderItem.objects.get(order__uuid=payload[0]["uuid"], name="Burger")
+        assert burger.station == "kitchen"
+        assert burger.quantity == 2  # noqa: PLR2004
+
+    def test_bulk_skips_stored_orders(self, api_client: APIClient):
+        existing = OrderFactory.create()
+        payload = make_payload(2)
+        payload[1]["uuid"] = str(existing.uuid)
+
+        response = api_client.post(reverse("api:order-bulk"), payload, format="json")
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert [str(u) for u in response.data["created"]] == [payload[0]["uuid"]]
+        assert response.data["skipped"] == [existing.uuid]
+        assert Order.objects.count() == 2  # noqa: PLR2004
+
+    def test_bulk_skips_repeated_orders(self, api_client: APIClient):
+        payload = make_payload(2)
+        payload.append({**payload[0], "table": "T9"})
+
+        response = api_client.post(reverse("api:order-bulk"), payload, format="json")
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert [str(u) for u in response.data["created"]] == [
+            payload[0]["uuid"],
+            payload[1]["uuid"],
+        ]
+        assert response.data["skipped"] == [uuid.UUID(payload[0]["uuid"])]
+        assert Order.objects.get(uuid=payload[0]["uuid"]).table == "T0"
+
+    def test_bulk_skips_orders_stored_concurrently(
+        self,
+        api_client: APIClient,
+        monkeypatch,
+    ):
+        payload = make_payload(2)
+        OrderFactory.create(uuid=payload[1]["uuid"])
+        stored_uuids = OrderListSerializer.stored_uuids
+        calls = []
+
+        def stored_after_the_check(self, uuids):
+            # The first check runs before the concurrent request commits.
+            calls.append(uuids)
+            return set() if len(calls) == 1 else stored_uuids(self, uuids)
+
+        monkeypatch.setattr(
+            OrderListSerializer,
+            "stored_uuids",
+            stored_after_the_check,
+        )
+        response = api_client.post(reverse("api:order-bulk"), payload, format="json")
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert [str(u) for u in response.data["created"]] == [payload[0]["uuid"]]
+        assert response.data["skipped"] == [uuid.UUID(payload[1]["uuid"])]
+        assert OrderItem.objects.filter(order__uuid=payload[0]["uuid"]).count() == 2  # noqa: PLR2004
+
+    def test_bulk_query_count_is_constant(
+        self,
+        api_client: APIClient,
+        django_assert_num_queries,
+    ):
+        url = reverse("api:order-bulk")
+        with django_assert_num_queries(7) as small:
+            api_client.post(url, make_payload(1), format="json")
+        with django_assert_num_queries(len(small.captured_queries)):
+            api_client.post(url, make_payload(50), format="json")
+
+    def test_bulk_rejects_invalid_batch(self, api_client: APIClient):
+        payload = make_payload(2)
+        payload[1]["items"] = []
+
+        response = api_client.post(reverse("api:order-bulk"), payload, format="json")
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert not Order.objects.exists()
+
+    def test_bulk_rejects_empty_batch(self, api_client: APIClient):
+        response = api_client.post(reverse("api:order-bulk"), [], format="json")
+        assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,45 @@
+import uuid
+from decimal import Decimal
+
+from factory import Faker
+from factory import RelatedFactoryList
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from bistro.orders.models import Order
+from bistro.orders.models import OrderItem
+
+
+class OrderItemFactory(DjangoModelFactory[OrderItem]):
+    order = SubFactory("bistro.orders.tests.factories.OrderFactory", items=[])
+    name = Faker("word")
+    station = "kitchen"
+    quantity = 1
+    unit_price = Decimal("9.50")
+
+    class Meta:
+        model = OrderItem
+
+
+class OrderFactory(DjangoModelFactory[Order]):
+    table = Faker("numerify", text="T##")
+    items = RelatedFactoryList(OrderItemFactory, factory_related_name="order", size=2)
+
+    class Meta:
+        model = Order
+        skip_postgeneration_save = True
+
+
+def make_payload(count: int) -> list[dict]:
+    """Bulk order API payload of ``count`` new orders."""
+    return [
+        {
+            "uuid": str(uuid.uuid4()),
+            "table": f"T{i}",
+            "items": [
+                {"name": "Espresso", "station": "bar", "unit_price": "2.50"},
+                {"name": "Burger", "quantity": 2, "unit_price": "11.00"},
+            ],
+        }
+        for i in range(count)
+    ]
@@ -0,0 +1,342 @@
+import asyncio
+import json
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from bistro.core.broadcast import Broadcast
+from bistro.core.broadcast import MemoryBackend
+from bistro.orders.events import ORDER_CREATED
+from bistro.orders.events import ORDER_UPDATED
+from bistro.orders.kitchen import CLOSE_GOING_AWAY
+from bistro.orders.kitchen import CLOSE_SLOW_CONSUMER
+from bistro.orders.kitchen import KitchenBoard
+from bistro.orders.kitchen import Subscriber
+from bistro.orders.kitchen import board
+from bistro.orders.models import Order
+from bistro.orders.tests.factories import OrderFactory
+from bistro.orders.tests.factories import OrderItemFactory
+from bistro.users.models import User
+from config import websocket
+from config.websocket import websocket_application
+
+
+class WebSocketClient:
+    """Drives ``websocket_application`` through in-memory ASGI queues."""
+
+    def __init__(self, query_string: bytes = b"", headers=(), token=None):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        headers = list(headers)
+        if token is not None:
+            headers.append((b"authorization", f"Token {token.key}".encode()))
+        scope = {
+            "type": "websocket",
+            "path": "/ws/",
+            "query_string": query_string,
+            "headers": headers,
+        }
+        self.task = asyncio.create_task(
+            websocket_application(scope, self.inbox.get, self.outbox.put),
+        )
+
+    async def connect(self):
+        await self.inbox.put({"type": "websocket.connect"})
+        assert (await self.outbox.get()) == {"type": "websocket.accept"}
+
+    async def refused(self) -> int:
+        """The code the connection was refused with."""
+        await self.inbox.put({"type": "websocket.connect"})
+        message = await asyncio.wait_for(self.outbox.get(), timeout=1)
+        assert message["type"] == "websocket.close"
+        await self.task
+        return message["code"]
+
+    async def send_text(self, text: str):
+        await self.inbox.put({"type": "websocket.receive", "text": text})
+
+    async def receive_text(self) -> str:
+        message = await asyncio.wait_for(self.outbox.get(), timeout=1)
+        return message["text"]
+
+    async def close(self):
+        await self.inbox.put({"type": "websocket.disconnect"})
+        await self.task
+
+
+@pytest.fixture
+def token(user: User) -> Token:
+    return Token.objects.create(user=user)
+
+
+# The application authenticates on a thread of its own, with a connection
+# that only sees committed rows.
+@pytest.mark.django_db(transaction=True)
+class TestWebsocketApplication:
+    def test_ping(self, token):
+        async def scenario():
+            client = WebSocketClient(token=token)
+            await client.connect()
+            await client.send_text("ping")
+            assert await client.receive_text() == "pong!"
+            await client.close()
+
+        asyncio.run(scenario())
+
+    def test_subscribe_from_query_string(self, token):
+        async def scenario():
+            client = WebSocketClient(b"station=grill", token=token)
+            await client.connect()
+            # Published from a worker thread, as a sync Django view would.
+            await asyncio.to_thread(board.publish, "grill", {"type": "test"})
+            await asyncio.to_thread(board.publish, "bar", {"type": "ignored"})
+            assert json.loads(await client.receive_text()) == {"type": "test"}
+            assert client.outbox.empty()
+            await client.close()
+            assert board.subscriber_count() == 0
+
+        asyncio.run(scenario())
+
+    def test_subscribe_and_unsubscribe_commands(self, token):
+        async def scenario():
+            client = WebSocketClient(token=token)
+            await client.connect()
+            await client.send_text(json.dumps({"subscribe": ["bar", "grill"]}))
+            ack = json.loads(await client.receive_text())
+            assert ack == {"type": "subscribed", "stations": ["bar", "grill"]}
+            assert board.subscriber_count("bar") == 1
+
+            await client.send_text(json.dumps({"unsubscribe": "bar"}))
+            ack = json.loads(await client.receive_text())
+            assert ack == {"type": "subscribed", "stations": ["grill"]}
+            assert board.subscriber_count("bar") == 0
+
+            await client.send_text("not json")
+            await client.close()
+
+        asyncio.run(scenario())
+
+    def test_unknown_stations_are_rejected(self, token, monkeypatch):
+        monkeypatch.setattr(websocket, "MAX_STATIONS", 2)
+
+        async def scenario():
+            client = WebSocketClient(token=token)
+            await client.connect()
+            command = {"subscribe": ["bar", "fryer", "grill", "kitchen"]}
+            await client.send_text(json.dumps(command))
+            ack = json.loads(await client.receive_text())
+            assert ack == {
+                "type": "subscribed",
+                "stations": ["bar", "grill"],
+                "rejected": ["fryer", "kitchen"],
+            }
+            assert board.subscriber_count("fryer") == 0
+            await client.close()
+
+            client = WebSocketClient(b"station=fryer", token=token)
+            assert await client.refused() == websocket.CLOSE_BAD_REQUEST
+            stations = b"&".join([b"station=bar"] * 3)
+            client = WebSocketClient(stations, token=token)
+            assert await client.refused() == websocket.CLOSE_BAD_REQUEST
+
+        asyncio.run(scenario())
+
+    def test_fan_out_encodes_once(self, token):
+        async def scenario():
+            clients = [WebSocketClient(b"station=grill", token=token) for _ in range(3)]
+            for client in clients:
+                await client.connect()
+            board.publish("grill", {"type": "test", "n": 1})
+            texts = [await client.receive_text() for client in clients]
+            assert len(set(map(id, texts))) == 1
+            for client in clients:
+                await client.close()
+
+        asyncio.run(scenario())
+
+    def test_anonymous_users_are_refused(self, user):
+        async def scenario():
+            client = WebSocketClient(b"station=grill")
+            assert await client.refused() == websocket.CLOSE_UNAUTHORIZED
+            client = WebSocketClient(headers=[(b"authorization", b"Token nope")])
+            assert await client.refused() == websocket.CLOSE_UNAUTHORIZED
+            assert board.subscriber_count() == 0
+
+        asyncio.run(scenario())
+
+    def test_session_users_are_accepted(self, user):
+        client = Client()
+        client.force_login(user)
+        cookie = f"sessionid={client.cookies['sessionid'].value}".encode()
+
+        async def scenario():
+            ws = WebSocketClient(headers=[(b"cookie", cookie)])
+            await ws.connect()
+            await ws.close()
+
+        asyncio.run(scenario())
+
+    @pytest.mark.parametrize(
+        ("origin", "accepted"),
+        [
+            (b"http://testserver", True),
+            (b"https://testserver:8443", True),
+            (b"https://pos.example.com", True),
+            (b"https://evil.example.net", False),
+            (b"null", False),
+        ],
+    )
+    def test_origins(self, token, settings, origin, accepted):
+        settings.CSRF_TRUSTED_ORIGINS = ["https://pos.example.com"]
+
+        async def scenario():
+            client = WebSocketClient(headers=[(b"origin", origin)], token=token)
+            if accepted:
+                await client.connect()
+                await client.close()
+            else:
+                assert await client.refused() == websocket.CLOSE_FORBIDDEN
+
+        asyncio.run(scenario())
+
+
+class TestKitchenBoard:
+    def test_events_reach_subscribers_on_other_workers(self):
+        hub: dict = {}
+        worker_a = KitchenBoard(Broadcast(MemoryBackend(hub)))
+        worker_b = KitchenBoard(Broadcast(MemoryBackend(hub)))
+
+        async def scenario():
+            received: asyncio.Queue = asyncio.Queue()
+
+            async def send(message):
+                await received.put(message)
+
+            subscriber = Subscriber(send)
+            await worker_a.subscribe(subscriber, "grill")
+            worker_b.publish("grill", {"type": "test"})
+            message = await asyncio.wait_for(received.get(), timeout=1)
+            assert json.loads(message["text"]) == {"type": "test"}
+            await worker_a.unsubscribe(subscriber)
+            assert hub == {}
+
+        asyncio.run(scenario())
+
+    def test_slow_consumer_is_disconnected(self):
+        async def scenario():
+            sent = []
+            blocked = asyncio.Event()
+
+            async def send(message):
+                sent.append(message)
+                await blocked.wait()
+
+            subscriber = Subscriber(send)
+            subscriber.deliver("0")
+            await asyncio.sleep(0)
+            # "0" is stuck in send(); the rest overflows the queue.
+            for n in range(1, Subscriber.max_pending + 2):
+                subscriber.deliver(str(n))
+            assert subscriber.closed
+            blocked.set()
+            await asyncio.sleep(0)
+            assert sent == [
+                {"type": "websocket.send", "text": "0"},
+                {"type": "websocket.close", "code": CLOSE_SLOW_CONSUMER},
+            ]
+            subscriber.deliver("late")
+            assert len(sent) == 2  # noqa: PLR2004
+
+        asyncio.run(scenario())
+
+    def test_drain_delivers_pending_frames_then_closes(self):
+        async def scenario():
+            kitchen = KitchenBoard()
+            sent = []
+
+            async def send(message):
+                await asyncio.sleep(0)
+                sent.append(message)
+
+            subscriber = Subscriber(send)
+            await kitchen.subscribe(subscriber, "grill")
+            subscriber.deliver("last order")
+            await kitchen.drain(grace_period=1)
+            await kitchen.unsubscribe(subscriber)
+            assert sent == [
+                {"type": "websocket.send", "text": "last order"},
+                {"type": "websocket.close", "code": CLOSE_GOING_AWAY},
+            ]
+
+        asyncio.run(scenario())
+
+
+@pytest.mark.django_db
+class TestOrderEvents:
+    @pytest.fixture
+    def published(self, monkeypatch) -> list[tuple[str, dict]]:
+        calls: list[tuple[str, dict]] = []
+        monkeypatch.setattr(
+            board,
+            "publish",
+            lambda station, message: calls.append((station, message)),
+        )
+        return calls
+
+    def test_created_event_per_station(
+        self,
+        published,
+        django_capture_on_commit_callbacks,
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            order = OrderFactory.create(items=[])
+            OrderItemFactory(order=order, station="bar", name="Espresso")
+            OrderItemFactory(order=order, station="grill", name="Burger")
+
+        assert sorted(station for station, _ in published) == ["bar", "grill"]
+        station, message = published[0]
+        assert message["type"] == ORDER_CREATED
+        assert message["order"]["uuid"] == order.uuid
+        assert [item["name"] for item in message["order"]["items"]] == [
+            "Espresso" if station == "bar" else "Burger",
+        ]
+
+    def test_updated_event(self, published, django_capture_on_commit_callbacks):
+        order = OrderFactory.create()
+        with django_capture_on_commit_callbacks(execute=True):
+            order.status = Order.Status.READY
+            order.save()
+
+        assert [message["type"] for _, message in published] == [ORDER_UPDATED]
+        assert published[0][1]["order"]["status"] == Order.Status.READY
+
+    def test_not_published_before_commit(
+        self,
+        published,
+        django_capture_on_commit_callbacks,
+    ):
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            OrderFactory()
+        assert published == []
+        assert len(callbacks) == 1
+
+    def test_bulk_ingestion_publishes(
+        self,
+        user: User,
+        published,
+        django_capture_on_commit_callbacks,
+    ):
+        client = APIClient()
+        client.force_authenticate(user)
+        payload = [
+            {"table": "T1", "items": [{"name": "Soup", "unit_price": "4.00"}]},
+            {"table": "T2", "items": [{"name": "Tea", "unit_price": "1.00"}]},
+        ]
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post(reverse("api:order-bulk"), payload, format="json")
+
+        assert [m["order"]["table"] for _, m in published] == ["T1", "T2"]
+        assert {m["type"] for _, m in published} == {ORDER_CREATED}
@@ -0,0 +1,14 @@
+from bistro.orders.models import Order
+from bistro.orders.tests.factories import OrderFactory
+
+
+def test_order_str(db):
+    order = OrderFactory.create()
+    assert str(order) == str(order.uuid)
+    assert order.status == Order.Status.NEW
+    assert order.items.count() == 2  # noqa: PLR2004
+
+
+def test_order_item_str(db):
+    item = OrderFactory.create().items.all()[0]
+    assert str(item) == f"1 x {item.name}"
@@ -0,0 +1,34 @@
+"""
+Queuing email backend.
+
+``EmailBackend`` doesn't send anything: it saves messages to the outbox, in
+the current transaction, and ``deliver_email`` sends them through
+``OUTBOX_EMAIL_BACKEND`` later. Requests sending email (signups, password
+resets) don't wait for the mail relay, and their email only goes out if
+they commit.
+"""
+
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import DatabaseError
+from django.db import transaction
+
+from .models import OutboxMessage
+
+
+class EmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        outbox_messages = [
+            OutboxMessage.from_email_message(email_message)
+            for email_message in email_messages
+            if email_message.recipients()
+        ]
+        try:
+            # A savepoint, so failing silently leaves the caller's
+            # transaction usable.
+            with transaction.atomic():
+                OutboxMessage.objects.bulk_create(outbox_messages)
+        except DatabaseError:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(outbox_messages)
@@ -0,0 +1,117 @@
+"""
+Outbox delivery.
+
+``deliver()`` claims a batch of due messages in a short transaction: it
+selects them with ``SELECT ... FOR UPDATE SKIP LOCKED``, so workers running
+side by side never claim the same message, counts the attempt and leases
+them by moving their ``next_attempt_at`` ``OUTBOX_LEASE`` seconds ahead.
+It then sends them one by one, outside any transaction, over a single
+connection of ``OUTBOX_EMAIL_BACKEND`` kept open from batch to batch, and
+records the outcomes in a second short transaction. A failed message is
+retried ``OUTBOX_RETRY_DELAY`` seconds later, twice as late after every
+further failure, and given up on after ``OUTBOX_MAX_ATTEMPTS`` attempts. A
+failure closes the connection, the next message opens a new one.
+
+Delivery is at least once: the messages of a worker dying before it records
+their outcome are sent again once their lease runs out. As their attempt was
+counted, a message crashing workers is eventually given up on too.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class DeliveryResult:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def claimed(self) -> int:
+        return self.sent + self.retried + self.failed
+
+
+def get_transport(**kwargs):
+    return get_connection(settings.OUTBOX_EMAIL_BACKEND, **kwargs)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """How long to wait after the ``attempts``-th failed attempt."""
+    return timedelta(seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def claim(batch_size: int) -> list[OutboxMessage]:
+    """Lease up to ``batch_size`` of the messages due to this worker."""
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxMessage.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size],
+        )
+        for message in messages:
+            message.attempts += 1
+            message.next_attempt_at = now + timedelta(seconds=settings.OUTBOX_LEASE)
+        OutboxMessage.objects.bulk_update(messages, ["attempts", "next_attempt_at"])
+    return messages
+
+
+def deliver(transport, batch_size: int | None = None) -> DeliveryResult:
+    """Send a batch of the messages due, through the ``transport`` backend."""
+    result = DeliveryResult()
+    messages = claim(batch_size or settings.OUTBOX_BATCH_SIZE)
+    for message in messages:
+        try:
+            transport.open()
+            transport.send_messages([message.email_message()])
+        except Exception as exc:  # noqa: BLE001
+            transport.close()
+            failed(message, exc)
+            if message.status == OutboxMessage.Status.FAILED:
+                result.failed += 1
+            else:
+                result.retried += 1
+        else:
+            message.status = OutboxMessage.Status.SENT
+            message.sent_at = timezone.now()
+            message.last_error = ""
+            result.sent += 1
+    OutboxMessage.objects.bulk_update(
+        messages,
+        ["status", "next_attempt_at", "sent_at", "last_error"],
+    )
+    return result
+
+
+def failed(message: OutboxMessage, exc: Exception) -> None:
+    message.last_error = f"{type(exc).__name__}: {exc}"
+    if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboxMessage.Status.FAILED
+        logger.error(
+            "Giving up on outbox message %s after %s attempts: %s",
+            message.pk,
+            message.attempts,
+            message.last_error,
+        )
+    else:
+        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+        logger.warning(
+            "Outbox message %s failed (attempt %s), retrying at %s: %s",
+            message.pk,
+            message.attempts,
+            message.next_attempt_at,
+            message.last_error,
+        )
@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from bistro.outbox.delivery import DeliveryResult
+from bistro.outbox.delivery import deliver
+from bistro.outbox.delivery import get_transport
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the email due in the outbox through OUTBOX_EMAIL_BACKEND, once "
+        "or, with --loop, as a worker polling for more."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.OUTBOX_BATCH_SIZE,
+            help=(
+                "Messages claimed and sent at a time "
+                f"(default: {settings.OUTBOX_BATCH_SIZE})."
+            ),
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, polling for messages every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds between polls of an empty outbox (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        total = DeliveryResult()
+        transport = get_transport()
+        try:
+            while True:
+                result = deliver(transport, options["batch_size"])
+                total.sent += result.sent
+                total.retried += result.retried
+                total.failed += result.failed
+                if result.claimed:
+                    if options["verbosity"] > 1:
+                        self.stdout.write(self.describe(result))
+                    continue
+                # Don't hold on to a connection while there's nothing to send.
+                transport.close()
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        finally:
+            transport.close()
+        self.stdout.write(self.style.SUCCESS(self.describe(total)))
+
+    def describe(self, result: DeliveryResult) -> str:
+        return (
+            f"Sent {result.sent} messages, {result.retried} to retry, "
+            f"{result.failed} failed."
+        )
@@ -0,0 +1,94 @@
+from email import message_from_bytes
+from email.header import decode_header
+from email.header import make_header
+from email.message import Message
+
+from django.core.mail import EmailMessage
+from django.core.mail.message import MIMEMixin
+from django.db.models import BinaryField
+from django.db.models import CharField
+from django.db.models import DateTimeField
+from django.db.models import Index
+from django.db.models import JSONField
+from django.db.models import PositiveSmallIntegerField
+from django.db.models import Q
+from django.db.models import TextChoices
+from django.db.models import TextField
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+
+
+# Like Django's SafeMIME* classes; the stubs of the two as_bytes() differ.
+class StoredMIMEMessage(MIMEMixin, Message):  # type: ignore[misc]
+    """A parsed MIME message, flattened the way Django's own are."""
+
+
+class StoredEmailMessage(EmailMessage):
+    """An ``EmailMessage`` sending the MIME message it was rendered to."""
+
+    def __init__(self, mime: bytes, from_email: str, recipients: list[str]):
+        self.mime = message_from_bytes(mime, _class=StoredMIMEMessage)
+        super().__init__(
+            subject=str(make_header(decode_header(self.mime["Subject"] or ""))),
+            from_email=from_email,
+            to=recipients,
+        )
+
+    def message(self):
+        return self.mime
+
+
+class OutboxMessage(TimeStampedModel):
+    """
+    An email queued by ``bistro.outbox.backends.EmailBackend``.
+    It is rendered to its MIME message when queued, so it goes out as it was
+    written, whatever changes before it is delivered.
+    """
+
+    class Status(TextChoices):
+        PENDING = "pending", _("Pending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    from_email = TextField(_("From"))
+    recipients = JSONField(_("Recipients"), default=list)
+    subject = TextField(_("Subject"), blank=True)
+    mime = BinaryField(_("MIME message"))
+    status = CharField(
+        _("Status"),
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = PositiveSmallIntegerField(_("Attempts"), default=0)
+    next_attempt_at = DateTimeField(_("Next attempt at"), default=timezone.now)
+    sent_at = DateTimeField(_("Sent at"), null=True, blank=True)
+    last_error = TextField(_("Last error"), blank=True)
+
+    class Meta:
+        verbose_name = _("outbox message")
+        verbose_name_plural = _("outbox messages")
+        indexes = [
+            # The delivery queue, without the messages already delivered.
+            Index(
+                fields=["next_attempt_at"],
+                condition=Q(status="pending"),
+                name="outbox_message_due_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.subject
+
+    @classmethod
+    def from_email_message(cls, email_message: EmailMessage) -> "OutboxMessage":
+        return cls(
+            from_email=email_message.from_email,
+            recipients=email_message.recipients(),
+            subject=str(email_message.subject),
+            mime=email_message.message().as_bytes(linesep="\r\n"),
+        )
+
+    def email_message(self) -> StoredEmailMessage:
+        return StoredEmailMessage(bytes(self.mime), self.from_email, self.recipients)
@@ -0,0 +1,57 @@
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+
+from bistro.outbox.models import OutboxMessage
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _outbox(settings):
+    settings.EMAIL_BACKEND = "bistro.outbox.backends.EmailBackend"
+
+
+def test_queues_messages():
+    message = EmailMultiAlternatives(
+        subject="Café order",
+        body="Your order is ready.",
+        from_email="bistro@example.com",
+        to=["guest@example.com"],
+        bcc=["audit@example.com"],
+    )
+    message.attach_alternative("<p>Your order is ready.</p>", "text/html")
+    assert message.send() == 1
+    assert mail.outbox == []
+
+    outbox_message = OutboxMessage.objects.get()
+    assert outbox_message.status == OutboxMessage.Status.PENDING
+    assert outbox_message.subject == "Café order"
+    assert outbox_message.from_email == "bistro@example.com"
+    assert outbox_message.recipients == ["guest@example.com", "audit@example.com"]
+
+    stored = outbox_message.email_message()
+    assert stored.subject == "Café order"
+    assert stored.recipients() == message.recipients()
+    # As it was rendered when queued.
+    mime = stored.message().as_bytes(linesep="\r\n")
+    assert mime == bytes(outbox_message.mime)
+    assert b"Content-Type: text/html" in mime
+    assert b"Bcc" not in mime
+
+
+def test_skips_messages_without_recipients():
+    assert mail.send_mail("Subject", "Body", "bistro@example.com", []) == 0
+    assert not OutboxMessage.objects.exists()
+
+
+def test_rolls_back_with_the_transaction():
+    @transaction.atomic
+    def fail_after_sending():
+        mail.send_mail("Subject", "Body", "bistro@example.com", ["a@example.com"])
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        fail_after_sending()
+    assert not OutboxMessage.objects.exists()
@@ -0,0 +1,139 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPServerDisconnected
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from bistro.outbox.backends import EmailBackend as OutboxBackend
+from bistro.outbox.delivery import claim
+from bistro.outbox.delivery import deliver
+from bistro.outbox.delivery import get_transport
+from bistro.outbox.models import OutboxMessage
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _settings(settings):
+    settings.OUTBOX_EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.OUTBOX_MAX_ATTEMPTS = 3
+    settings.OUTBOX_RETRY_DELAY = 60
+
+
+def queue(count: int) -> list[OutboxMessage]:
+    OutboxBackend().send_messages(
+        [
+            mail.EmailMessage(f"Message {n}", "Body", "bistro@example.com", ["a@b.c"])
+            for n in range(count)
+        ],
+    )
+    return list(OutboxMessage.objects.order_by("pk"))
+
+
+def test_delivers_due_messages_in_batches():
+    messages = queue(3)
+    OutboxMessage.objects.filter(pk=messages[2].pk).update(
+        next_attempt_at=timezone.now() + timedelta(minutes=1),
+    )
+    transport = get_transport()
+
+    result = deliver(transport, batch_size=1)
+    assert (result.sent, result.claimed) == (1, 1)
+    result = deliver(transport, batch_size=1)
+    assert (result.sent, result.claimed) == (1, 1)
+    assert deliver(transport, batch_size=1).claimed == 0
+
+    assert [message.subject for message in mail.outbox] == ["Message 0", "Message 1"]
+    sent = mail.outbox[0].message().as_bytes(linesep="\r\n")
+    assert sent == bytes(messages[0].mime)
+    statuses = OutboxMessage.objects.order_by("pk").values_list("status", flat=True)
+    assert list(statuses) == ["sent", "sent", "pending"]
+
+
+def test_retries_with_backoff_then_gives_up():
+    [message] = queue(1)
+    transport = get_transport()
+    with mock.patch.object(
+        EmailBackend,
+        "send_messages",
+        side_effect=SMTPServerDisconnected("Connection unexpectedly closed"),
+    ):
+        for attempt, delay in [(1, 60), (2, 120)]:
+            before = timezone.now()
+            assert deliver(transport).retried == 1
+            message.refresh_from_db()
+            assert message.attempts == attempt
+            assert message.status == OutboxMessage.Status.PENDING
+            assert message.next_attempt_at >= before + timedelta(seconds=delay)
+            assert message.last_error == (
+                "SMTPServerDisconnected: Connection unexpectedly closed"
+            )
+            # Not due yet.
+            assert deliver(transport).claimed == 0
+            OutboxMessage.objects.update(next_attempt_at=timezone.now())
+
+        assert deliver(transport).failed == 1
+    message.refresh_from_db()
+    assert message.status == OutboxMessage.Status.FAILED
+    assert deliver(transport).claimed == 0
+    assert mail.outbox == []
+
+
+def test_one_failure_does_not_hold_up_the_batch():
+    queue(2)
+    sent = EmailBackend.send_messages
+
+    def fail_first(self, messages):
+        if messages[0].subject == "Message 0":
+            raise SMTPServerDisconnected
+        return sent(self, messages)
+
+    with mock.patch.object(EmailBackend, "send_messages", fail_first):
+        result = deliver(get_transport())
+    assert (result.sent, result.retried) == (1, 1)
+    assert [message.subject for message in mail.outbox] == ["Message 1"]
+
+
+def test_claims_lease_the_messages(settings):
+    settings.OUTBOX_LEASE = 600
+    queue(2)
+    before = timezone.now()
+    assert len(claim(1)) == 1
+    [claimed] = claim(2)
+    assert claimed.subject == "Message 1"
+    assert claim(2) == []
+
+    leased = OutboxMessage.objects.order_by("pk")
+    assert [message.attempts for message in leased] == [1, 1]
+    assert all(
+        message.next_attempt_at >= before + timedelta(seconds=600) for message in leased
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sends_outside_a_transaction():
+    queue(1)
+    sent = EmailBackend.send_messages
+    in_atomic_block = []
+
+    def send(self, messages):
+        in_atomic_block.append(connection.in_atomic_block)
+        return sent(self, messages)
+
+    with mock.patch.object(EmailBackend, "send_messages", send):
+        assert deliver(get_transport()).sent == 1
+    assert in_atomic_block == [False]
+
+
+def test_command():
+    queue(3)
+    out = StringIO()
+    call_command("deliver_email", "--batch-size=2", stdout=out)
+    assert len(mail.outbox) == 3  # noqa: PLR2004
+    assert "Sent 3 messages, 0 to retry, 0 failed." in out.getvalue()
@@ -4,8 +4,12 @@ from django.contrib import admin
 from django.contrib.auth import admin as auth_admin
 from django.utils.translation import gettext_lazy as _
 
+from bistro.core.paginator import EstimatedCountPaginator
+from bistro.core.search import FullTextSearchMixin
+
 from .forms import UserAdminChangeForm
 from .forms import UserAdminCreationForm
+from .models import SEARCH_VECTOR
 from .models import User
 
 if settings.DJANGO_ADMIN_FORCE_ALLAUTH:
@@ -16,7 +20,7 @@ if settings.DJANGO_ADMIN_FORCE_ALLAUTH:
 
 
 @admin.register(User)
-class UserAdmin(auth_admin.UserAdmin):
+class UserAdmin(FullTextSearchMixin, auth_admin.UserAdmin):
     form = UserAdminChangeForm
     add_form = UserAdminCreationForm
     fieldsets = (
@@ -37,7 +41,11 @@ class UserAdmin(auth_admin.UserAdmin):
         (_("Important dates"), {"fields": ("last_login", "date_joined")}),
     )
     list_display = ["email", "name", "is_superuser"]
-    search_fields = ["name"]
+    search_fields = ["name", "email"]
+    search_vector = SEARCH_VECTOR
+    paginator = EstimatedCountPaginator
+    # Spares a COUNT(*) of the whole table next to the search's.
+    show_full_result_count = False
     ordering = ["id"]
     add_fieldsets = (
         (
@@ -0,0 +1,22 @@
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.authentication import TokenScheme
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from bistro.users.cache import get_cached_token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` resolving tokens through ``bistro.users.cache``."""
+
+    def authenticate_credentials(self, key):
+        token = get_cached_token(key)
+        if token is None:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return token.user, token
+
+
+class CachedTokenScheme(TokenScheme):
+    target_class = "bistro.users.api.authentication.CachedTokenAuthentication"
@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
+from bistro.core.fieldsets import SparseFieldsMixin
+from bistro.core.serializers import ValuesSerializer
 from bistro.users.models import User
 
 
-class UserSerializer(serializers.ModelSerializer[User]):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer[User]):
     class Meta:
         model = User
         fields = ["name", "url"]
@@ -11,3 +13,9 @@ class UserSerializer(serializers.ModelSerializer[User]):
         extra_kwargs = {
             "url": {"view_name": "api:user-detail", "lookup_field": "pk"},
         }
+
+
+class UserValuesSerializer(ValuesSerializer):
+    """``UserSerializer`` for lists, from ``values()`` rows."""
+
+    serializer_class = UserSerializer
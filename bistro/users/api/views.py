@@ -1,3 +1,5 @@
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema_view
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin
@@ -6,21 +8,48 @@ from rest_framework.mixins import UpdateModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from bistro.core import fieldsets
+from bistro.core.conditional import ConditionalGetMixin
+from bistro.core.fieldsets import SparseQuerysetMixin
+from bistro.core.transaction import AtomicUnlessSafeMixin
 from bistro.users.models import User
 
 from .serializers import UserSerializer
+from .serializers import UserValuesSerializer
 
 
-class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=fieldsets.PARAMETERS),
+    retrieve=extend_schema(parameters=fieldsets.PARAMETERS),
+    me=extend_schema(parameters=fieldsets.PARAMETERS),
+)
+class UserViewSet(
+    AtomicUnlessSafeMixin,
+    ConditionalGetMixin,
+    SparseQuerysetMixin,
+    RetrieveModelMixin,
+    ListModelMixin,
+    UpdateModelMixin,
+    GenericViewSet,
+):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = "pk"
 
     def get_queryset(self, *args, **kwargs):
         assert isinstance(self.request.user.id, int)
-        return self.queryset.filter(id=self.request.user.id)
+        return self.narrow_queryset(self.queryset.filter(id=self.request.user.id))
+
+    def get_serializer_class(self):
+        if getattr(self, "action", None) == "list":
+            return UserValuesSerializer
+        return super().get_serializer_class()
 
     @action(detail=False)
     def me(self, request):
         serializer = UserSerializer(request.user, context={"request": request})
-        return Response(status=status.HTTP_200_OK, data=serializer.data)
+        return self.conditional_response(
+            request,
+            lambda: Response(status=status.HTTP_200_OK, data=serializer.data),
+            **self.get_object_validators(request, request.user),
+        )
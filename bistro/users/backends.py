@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+
+from allauth.account import auth_backends
+from django.contrib.auth import backends
+
+from .cache import get_cached_user
+
+if TYPE_CHECKING:
+    _ModelBackendBase = backends.ModelBackend
+else:
+    _ModelBackendBase = object
+
+
+class CachedUserMixin(_ModelBackendBase):
+    """Resolve the user of a session through ``bistro.users.cache``."""
+
+    def get_user(self, user_id):
+        user = get_cached_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+
+class ModelBackend(CachedUserMixin, backends.ModelBackend):
+    pass
+
+
+class AuthenticationBackend(CachedUserMixin, auth_backends.AuthenticationBackend):
+    pass
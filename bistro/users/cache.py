@@ -0,0 +1,78 @@
+"""
+Cache of the users behind sessions and API tokens.
+
+Without it every authenticated request queries the token (token auth) or the
+user (session auth) before the view runs. Users are cached by primary key and
+tokens map to their user's primary key, so invalidating a user covers all of
+its tokens. ``bistro.users.signals`` invalidates users when they are saved or
+deleted and tokens when they are deleted. Misses are loaded from the primary,
+a lagging replica could cache a stale row.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from bistro.core.db import primary_reads
+
+from .models import User
+
+
+def user_cache_key(user_id) -> str:
+    return f"users:user:{user_id}"
+
+
+def token_cache_key(key: str) -> str:
+    # Keep the token itself out of the cache.
+    return f"users:token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def get_cached_user(user_id) -> User | None:
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        with primary_reads():
+            user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+    return user
+
+
+def get_cached_token(key: str) -> Token | None:
+    """The token with ``key`` and its user, or ``None`` if there is none."""
+    cached = cache.get(token_cache_key(key))
+    if cached is not None:
+        user_id, created = cached
+        user = get_cached_user(user_id)
+        return None if user is None else Token(key=key, user=user, created=created)
+    with primary_reads():
+        token = Token.objects.select_related("user").filter(key=key).first()
+    if token is not None:
+        cache.set_many(
+            {
+                token_cache_key(key): (token.user_id, token.created),
+                user_cache_key(token.user_id): token.user,
+            },
+            settings.USER_CACHE_TIMEOUT,
+        )
+    return token
+
+
+def _delete_now_and_on_commit(key: str) -> None:
+    cache.delete(key)
+    # Until the change commits, a concurrent request can cache the old row
+    # again.
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_user(user_id) -> None:
+    _delete_now_and_on_commit(user_cache_key(user_id))
+
+
+def invalidate_token(key: str) -> None:
+    _delete_now_and_on_commit(token_cache_key(key))
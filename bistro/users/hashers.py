@@ -0,0 +1,162 @@
+"""
+Password hashing off the request threads.
+
+Argon2 spends tens of milliseconds of CPU per hash, by design, and a burst of
+logins at shift change would take it from every other request. The pooled
+hashers run ``encode()`` and ``verify()`` on a shared thread pool,
+``PASSWORD_HASHING_MAX_WORKERS`` threads wide (argon2-cffi releases the GIL,
+so they run in parallel with the rest of the process), which caps the CPU
+hashing takes: requests beyond the limit wait for a thread. The time tasks
+wait is logged at debug level and summed up in ``stats``.
+
+Upgrading a password's hash after a login (``check_password()``'s setter,
+when the preferred hasher or its parameters changed) runs on the pool too,
+after the login commits, instead of in the request. The new hash changes the
+session auth hash of the user, so sessions logged in with the previous hash
+stay valid through ``User.get_session_auth_fallback_hash()``, for as long as
+a session lasts and the password isn't changed.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.cache import cache
+from django.db import connections
+from django.db import transaction
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.contrib.auth.hashers import BasePasswordHasher as _HasherBase
+else:
+    _HasherBase = object
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+@dataclasses.dataclass
+class PoolStats:
+    tasks: int = 0
+    # Seconds tasks waited for a thread of the pool, in total and at most.
+    queued: float = 0.0
+    max_queued: float = 0.0
+    lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock,
+        repr=False,
+        compare=False,
+    )
+
+    def record(self, queued: float) -> None:
+        with self.lock:
+            self.tasks += 1
+            self.queued += queued
+            self.max_queued = max(self.max_queued, queued)
+
+
+stats = PoolStats()
+
+
+@functools.cache
+def get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASHING_MAX_WORKERS,
+        thread_name_prefix="password-hashing",
+    )
+
+
+def _run_pooled(submitted: float, func, *args):
+    queued = time.perf_counter() - submitted
+    stats.record(queued)
+    logger.debug("%s waited %.1f ms for the pool", func.__qualname__, queued * 1000)
+    _local.pooled = True
+    try:
+        return func(*args)
+    finally:
+        _local.pooled = False
+
+
+def submit(func, *args):
+    return get_executor().submit(_run_pooled, time.perf_counter(), func, *args)
+
+
+def run(func, *args):
+    """Call ``func`` on the pool and wait for its result."""
+    if getattr(_local, "pooled", False):
+        return func(*args)
+    return submit(func, *args).result()
+
+
+def _make_password_in_place(password: str | None) -> str:
+    _local.pooled = True
+    return hashers.make_password(password)
+
+
+def make_passwords(passwords: Iterable[str | None], max_workers: int) -> list[str]:
+    """
+    ``make_password()`` of each of ``passwords``, for bulk imports.
+
+    They are hashed on ``max_workers`` threads of their own, rather than on
+    the pool shared with requests.
+    """
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="password-import",
+    ) as executor:
+        return list(executor.map(_make_password_in_place, passwords))
+
+
+class PooledHasherMixin(_HasherBase):
+    def encode(self, password, salt, *args, **kwargs):
+        return run(super().encode, password, salt, *args, **kwargs)
+
+    def verify(self, password, encoded):
+        return run(super().verify, password, encoded)
+
+
+class PooledArgon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    pass
+
+
+def previous_password_key(user_id) -> str:
+    return f"users:previous-password:{user_id}"
+
+
+def defer_rehash(user, raw_password: str) -> None:
+    """``check_password()`` setter upgrading the hash on the pool."""
+    model, pk, encoded = type(user), user.pk, user.password
+    transaction.on_commit(lambda: submit(rehash, model, pk, encoded, raw_password))
+
+
+def rehash(model, pk, encoded: str, raw_password: str) -> None:
+    from .cache import invalidate_user
+
+    key = previous_password_key(pk)
+    try:
+        upgraded = hashers.make_password(raw_password)
+        # Before the sessions of the previous hash stop verifying. Tied to the
+        # upgraded hash, so it's void once the password changes.
+        cache.set(key, (upgraded, encoded), settings.SESSION_COOKIE_AGE)
+        # Unless the password changed in the meantime.
+        updated = model._default_manager.filter(pk=pk, password=encoded).update(  # noqa: SLF001
+            password=upgraded,
+        )
+        if updated:
+            invalidate_user(pk)
+        else:
+            cache.delete(key)
+    except Exception:
+        logger.exception("Upgrading the password hash of user %s failed", pk)
+    finally:
+        # The threads of the pool outlive requests.
+        connections.close_all()
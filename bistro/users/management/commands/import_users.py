@@ -0,0 +1,90 @@
+import csv
+import itertools
+import sys
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from bistro.users.managers import BULK_BATCH_SIZE
+from bistro.users.models import User
+
+COLUMNS = {"email", "name", "password"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users from a CSV file with an email column and optional name "
+        "and password columns, skipping emails that are invalid or already "
+        "taken."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to read, - for stdin.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BULK_BATCH_SIZE,
+            help=f"Users read and created at a time (default: {BULK_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Threads hashing passwords (default: one per CPU).",
+        )
+
+    def handle(self, *args, **options):
+        if options["path"] == "-":
+            self.import_users(sys.stdin, options)
+            return
+        try:
+            with Path(options["path"]).open(newline="", encoding="utf-8") as file:
+                self.import_users(file, options)
+        except OSError as exc:
+            raise CommandError(exc) from exc
+
+    def import_users(self, file, options):
+        reader = csv.DictReader(file)
+        columns = set(reader.fieldnames or ())
+        if "email" not in columns:
+            msg = "The CSV file has no email column."
+            raise CommandError(msg)
+        if unknown := columns - COLUMNS:
+            msg = f"Unknown columns: {', '.join(sorted(unknown))}."
+            raise CommandError(msg)
+
+        created = skipped = 0
+        started = time.perf_counter()
+        for users in itertools.batched(self.read_users(reader), options["batch_size"]):
+            result = User.objects.bulk_create_users(
+                users,
+                batch_size=options["batch_size"],
+                max_workers=options["workers"],
+            )
+            created += result.created
+            skipped += len(result.duplicates) + len(result.invalid)
+            for email in result.invalid:
+                self.stderr.write(f"Skipped {email}, the email is invalid.")
+            for email in result.duplicates:
+                self.stderr.write(f"Skipped {email}, the email is taken.")
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Created {created} users...")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} users, skipped {skipped}, in {elapsed:.1f} s "
+                f"({created / elapsed if elapsed else 0:.0f} users/s).",
+            ),
+        )
+
+    def read_users(self, reader):
+        for row in reader:
+            if not row.get("email"):
+                msg = f"Line {reader.line_num}: the email is missing."
+                raise CommandError(msg)
+            yield {
+                name: value for name, value in row.items() if name in COLUMNS and value
+            }
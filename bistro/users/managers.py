@@ -1,15 +1,43 @@
+import dataclasses
+import os
+from collections.abc import Iterable
 from typing import TYPE_CHECKING
 
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager as DjangoUserManager
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .hashers import make_passwords
 
 if TYPE_CHECKING:
-    from .models import User  # noqa: F401
+    from .models import User
+
+# Rows per INSERT statement of bulk_create_users().
+BULK_BATCH_SIZE = 1000
+
+
+@dataclasses.dataclass
+class BulkCreateResult:
+    created: int = 0
+    # Emails skipped: those already taken, then those repeated in the input.
+    duplicates: list[str] = dataclasses.field(default_factory=list)
+    # Emails skipped for not being valid addresses, in input order.
+    invalid: list[str] = dataclasses.field(default_factory=list)
 
 
 class UserManager(DjangoUserManager["User"]):
     """Custom manager for the User model."""
 
+    @classmethod
+    def normalize_email(cls, email: str | None) -> str:
+        # Stored lowercase, like allauth, which looks users up by the
+        # lowercase address.
+        return super().normalize_email(email).lower()
+
+    def get_by_natural_key(self, username: str | None) -> "User":
+        return self.get(email__iexact=username)
+
     def _create_user(self, email: str, password: str | None, **extra_fields):
         """
         Create and save a user with the given email and password.
@@ -28,6 +56,69 @@ class UserManager(DjangoUserManager["User"]):
         extra_fields.setdefault("is_superuser", False)
         return self._create_user(email, password, **extra_fields)
 
+    def bulk_create_users(
+        self,
+        users: Iterable[dict],
+        *,
+        batch_size: int = BULK_BATCH_SIZE,
+        max_workers: int | None = None,
+    ) -> BulkCreateResult:
+        """
+        Create users from dicts of their fields, ``password`` in the clear.
+
+        Emails are normalized and validated like the model field does on
+        forms; invalid ones are skipped and reported. Duplicate emails, of
+        existing users or of earlier dicts, are skipped and reported too,
+        with one query for all of them. Passwords are hashed
+        in parallel on ``max_workers`` threads (one per CPU by default) and
+        the users inserted ``batch_size`` at a time, in one transaction.
+        """
+        email_field = self.model._meta.get_field("email")  # noqa: SLF001
+        pending: dict[str, dict] = {}
+        duplicates: list[str] = []
+        invalid: list[str] = []
+        for fields in users:
+            fields = dict(fields)  # noqa: PLW2901
+            email = self.normalize_email(fields.pop("email", None))
+            if not email:
+                msg = "The given email must be set"
+                raise ValueError(msg)
+            try:
+                email_field.run_validators(email)
+            except ValidationError:
+                invalid.append(email)
+                continue
+            if email in pending:
+                duplicates.append(email)
+            else:
+                pending[email] = fields
+        taken = set(
+            self.filter(email__in=pending).values_list("email", flat=True),
+        )
+        duplicates = [email for email in pending if email in taken] + duplicates
+        for email in taken:
+            del pending[email]
+
+        passwords = make_passwords(
+            [fields.pop("password", None) for fields in pending.values()],
+            max_workers=max_workers or os.cpu_count() or 1,
+        )
+        new_users = [
+            self.model(email=email, password=password, **fields)
+            for (email, fields), password in zip(
+                pending.items(),
+                passwords,
+                strict=True,
+            )
+        ]
+        with transaction.atomic(using=self.db):
+            self.bulk_create(new_users, batch_size=batch_size)
+        return BulkCreateResult(
+            created=len(new_users),
+            duplicates=duplicates,
+            invalid=invalid,
+        )
+
     def create_superuser(self, email: str, password: str | None = None, **extra_fields):  # type: ignore[override]
         extra_fields.setdefault("is_staff", True)
         extra_fields.setdefault("is_superuser", True)
@@ -0,0 +1,24 @@
+import django.db.models.functions.text
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_user_modified"),
+    ]
+
+    operations = [
+        # Emails are stored lowercase from now on.
+        migrations.RunSQL(
+            "UPDATE users_user SET email = LOWER(email) WHERE email <> LOWER(email)",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Upper("email"),
+                name="users_user_email_upper_idx",
+            ),
+        ),
+    ]
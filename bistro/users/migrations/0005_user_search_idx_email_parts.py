@@ -0,0 +1,34 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_user_search_idx"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="user",
+            name="users_user_search_idx",
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector(
+                    "name",
+                    "email",
+                    django.db.models.functions.text.Replace(
+                        "email",
+                        models.Value("@"),
+                        models.Value(" "),
+                    ),
+                    config="simple",
+                ),
+                name="users_user_search_idx",
+            ),
+        ),
+    ]
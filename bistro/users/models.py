@@ -1,13 +1,34 @@
+import functools
+from collections.abc import Iterator
 from typing import ClassVar
 
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import check_password
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.core.cache import cache
 from django.db.models import CharField
 from django.db.models import EmailField
+from django.db.models import Index
+from django.db.models import Value
+from django.db.models.functions import Replace
+from django.db.models.functions import Upper
 from django.urls import reverse
+from django.utils.crypto import salted_hmac
 from django.utils.translation import gettext_lazy as _
+from model_utils.fields import AutoLastModifiedField
 
+from .hashers import defer_rehash
+from .hashers import previous_password_key
 from .managers import UserManager
 
+# The words users are searched by. Indexed, so queries must use this very
+# expression; "simple" keeps names as they are, without stemming. The parser
+# keeps an email as one word, so it's added split at the "@" too, for domains.
+EMAIL_PARTS = Replace("email", Value("@"), Value(" "))
+SEARCH_VECTOR = SearchVector("name", "email", EMAIL_PARTS, config="simple")
+
 
 class User(AbstractUser):
     """
@@ -22,12 +43,25 @@ class User(AbstractUser):
     last_name = None  # type: ignore[assignment]
     email = EmailField(_("email address"), unique=True)
     username = None  # type: ignore[assignment]
+    # Last change of the row, the version behind API ETags / Last-Modified.
+    modified = AutoLastModifiedField(_("modified"))
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects: ClassVar[UserManager] = UserManager()
 
+    class Meta:
+        verbose_name = _("user")
+        verbose_name_plural = _("users")
+        indexes = [
+            # Case-insensitive (iexact) email lookups, e.g. of logins and
+            # password resets; exact ones use the unique index of the field.
+            Index(Upper("email"), name="users_user_email_upper_idx"),
+            # Searches of the admin (see UserAdmin.search_vector).
+            GinIndex(SEARCH_VECTOR, name="users_user_search_idx"),
+        ]
+
     def get_absolute_url(self) -> str:
         """Get URL for user's detail view.
 
@@ -36,3 +70,32 @@ class User(AbstractUser):
 
         """
         return reverse("users:detail", kwargs={"pk": self.id})
+
+    def check_password(self, raw_password: str) -> bool:
+        # Upgrading the hash waits for the pool of bistro.users.hashers.
+        return check_password(
+            raw_password,
+            self.password,
+            functools.partial(defer_rehash, self),
+        )
+
+    async def acheck_password(self, raw_password: str) -> bool:
+        return await sync_to_async(self.check_password)(raw_password)
+
+    def set_password(self, raw_password: str | None) -> None:
+        super().set_password(raw_password)
+        # Log out the sessions of the hash before the last upgrade too.
+        if self.pk is not None:
+            cache.delete(previous_password_key(self.pk))
+
+    def get_session_auth_fallback_hash(self) -> Iterator[str]:
+        yield from super().get_session_auth_fallback_hash()
+        # Sessions logged in before the hash of the password was upgraded,
+        # while the password is the upgraded one.
+        previous = cache.get(previous_password_key(self.pk))
+        if previous and previous[0] == self.password:
+            yield salted_hmac(
+                "django.contrib.auth.models.AbstractBaseUser.get_session_auth_hash",
+                previous[1],
+                algorithm="sha256",
+            ).hexdigest()
@@ -5,10 +5,13 @@ from importlib import reload
 import pytest
 from django.contrib import admin
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.urls import reverse
 from pytest_django.asserts import assertRedirects
 
+from bistro.users.admin import UserAdmin
 from bistro.users.models import User
+from bistro.users.tests.factories import UserFactory
 
 
 class TestUserAdmin:
@@ -22,6 +25,23 @@ class TestUserAdmin:
         response = admin_client.get(url, data={"q": "test"})
         assert response.status_code == HTTPStatus.OK
 
+    @pytest.mark.django_db
+    def test_search_uses_the_index(self, rf):
+        user = UserFactory(name="Joan Smith", email="jsmith@example.com")
+        UserFactory(name="John Doe", email="doe@example.com")
+        model_admin = UserAdmin(User, admin.site)
+        queryset, may_have_duplicates = model_admin.get_search_results(
+            rf.get("/"),
+            User.objects.all(),
+            "smi jo",
+        )
+        assert not may_have_duplicates
+        assert list(queryset) == [user]
+        with connection.cursor() as cursor:
+            # Else the planner prefers scanning a table of two rows.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        assert "users_user_search_idx" in queryset.explain()
+
     def test_add(self, admin_client):
         url = reverse("admin:users_user_add")
         response = admin_client.get(url)
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from bistro.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def token(user: User) -> Token:
+    return Token.objects.create(user=user)
+
+
+@pytest.fixture
+def token_client(token: Token) -> APIClient:
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+@pytest.fixture
+def session_client(client: Client, user: User) -> Client:
+    client.force_login(user)
+    return client
+
+
+me_url = reverse("api:user-me")
+
+
+class TestTokenAuthentication:
+    def test_token_and_user_are_cached(
+        self,
+        token_client,
+        user,
+        django_assert_num_queries,
+    ):
+        assert token_client.get(me_url).data["name"] == user.name
+        with django_assert_num_queries(0):
+            response = token_client.get(me_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.data["name"] == user.name
+
+    def test_invalid_token(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        assert client.get(me_url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_deleted_token(self, token_client, token):
+        token_client.get(me_url)
+        token.delete()
+        assert token_client.get(me_url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_deactivated_user(self, token_client, user):
+        token_client.get(me_url)
+        user.is_active = False
+        user.save()
+        assert token_client.get(me_url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_changed_user(self, token_client, user):
+        token_client.get(me_url)
+        user.name = "Renamed"
+        user.save()
+        assert token_client.get(me_url).data["name"] == "Renamed"
+
+
+class TestSessionAuthentication:
+    def test_user_is_cached(self, session_client, django_assert_num_queries):
+        session_client.get(me_url)
+        with django_assert_num_queries(0):
+            response = session_client.get(me_url)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_password_change_ends_the_session(self, session_client, user):
+        session_client.get(me_url)
+        user.set_password("a-new-password")
+        user.save()
+        assert session_client.get(me_url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_deleted_user(self, session_client, user):
+        session_client.get(me_url)
+        User.objects.get(pk=user.pk).delete()
+        assert session_client.get(me_url).status_code == HTTPStatus.FORBIDDEN
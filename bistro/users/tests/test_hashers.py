@@ -0,0 +1,121 @@
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+
+from bistro.users import hashers
+from bistro.users.models import User
+from bistro.users.tests.factories import UserFactory
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+PASSWORD = "s3cret-Passw0rd"  # noqa: S105
+MD5 = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+
+@pytest.fixture
+def pooled(settings):
+    settings.PASSWORD_HASHERS = [
+        "bistro.users.hashers.PooledArgon2PasswordHasher",
+        MD5,
+    ]
+    # One thread, so tasks run in order.
+    settings.PASSWORD_HASHING_MAX_WORKERS = 1
+    hashers.get_executor.cache_clear()
+    yield
+    hashers.get_executor().shutdown()
+    hashers.get_executor.cache_clear()
+
+
+def wait_for_pool():
+    hashers.get_executor().submit(lambda: None).result()
+
+
+def test_hashes_on_the_pool(pooled, monkeypatch):
+    threads = []
+    hasher = hashers.PooledArgon2PasswordHasher()
+    encode = hashers.hashers.Argon2PasswordHasher.encode
+
+    def record(*args):
+        threads.append(threading.current_thread().name)
+        return encode(*args)
+
+    monkeypatch.setattr(hashers.hashers.Argon2PasswordHasher, "encode", record)
+    tasks = hashers.stats.tasks
+    encoded = make_password(PASSWORD)
+    assert encoded.startswith("argon2$")
+    assert threads[0].startswith("password-hashing")
+    assert check_password(PASSWORD, encoded)
+    assert not hasher.verify("wrong", encoded)
+    assert hashers.stats.tasks == tasks + 3
+
+
+def test_nested_calls_run_in_place(pooled):
+    # A task hashing on the pool, as rehash() does, doesn't wait for itself.
+    encoded = hashers.run(make_password, PASSWORD)
+    assert check_password(PASSWORD, encoded)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRehash:
+    @pytest.fixture
+    def user(self, settings) -> User:
+        settings.PASSWORD_HASHERS = [MD5]
+        return UserFactory.create(password=PASSWORD)
+
+    def test_is_deferred(self, user: User, pooled):
+        with transaction.atomic():
+            assert user.check_password(PASSWORD)
+            user.refresh_from_db()
+            assert user.password.startswith("md5$")
+
+    def test_upgrades_the_hash(self, user: User, pooled):
+        assert user.check_password(PASSWORD)
+        wait_for_pool()
+        user.refresh_from_db()
+        assert user.password.startswith("argon2$")
+        assert user.check_password(PASSWORD)
+
+    def test_keeps_a_changed_password(self, user: User, pooled, monkeypatch):
+        callbacks: list[Callable[[], None]] = []
+        monkeypatch.setattr(hashers.transaction, "on_commit", callbacks.append)
+        assert user.check_password(PASSWORD)
+        user.set_password("new-Passw0rd")
+        user.save()
+        callbacks[0]()
+        wait_for_pool()
+        user.refresh_from_db()
+        assert user.check_password("new-Passw0rd")
+        assert cache.get(hashers.previous_password_key(user.pk)) is None
+
+    def test_sessions_stay_logged_in(self, client, user: User, pooled):
+        assert client.login(email=user.email, password=PASSWORD)
+        wait_for_pool()
+        user.refresh_from_db()
+        assert user.password.startswith("argon2$")
+        response = client.get(reverse("users:redirect"))
+        assert response.url == user.get_absolute_url()
+
+    def test_password_changes_log_sessions_out(self, client, user: User, pooled):
+        assert client.login(email=user.email, password=PASSWORD)
+        wait_for_pool()
+        user.refresh_from_db()
+        assert user.password.startswith("argon2$")
+        user.set_password("new-Passw0rd")
+        user.save()
+        response = client.get(reverse("users:redirect"))
+        assert response.url.startswith(reverse("account_login"))
+
+    def test_changed_hashes_void_the_fallback(self, client, user: User, pooled):
+        assert client.login(email=user.email, password=PASSWORD)
+        wait_for_pool()
+        # Changed without set_password(), e.g. by another upgrade.
+        User.objects.filter(pk=user.pk).update(password=make_password("other"))
+        response = client.get(reverse("users:redirect"))
+        assert response.url.startswith(reverse("account_login"))
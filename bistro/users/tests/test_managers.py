@@ -2,8 +2,10 @@ from io import StringIO
 
 import pytest
 from django.core.management import call_command
+from django.core.management.base import CommandError
 
 from bistro.users.models import User
+from bistro.users.tests.factories import UserFactory
 
 
 @pytest.mark.django_db
@@ -36,6 +38,93 @@ class TestUserManager:
         )
         assert user.username is None
 
+    def test_emails_are_stored_lowercase(self):
+        user = User.objects.create_user(email="John@Example.COM")
+        assert user.email == "john@example.com"
+        assert User.objects.get_by_natural_key("JOHN@example.com") == user
+
+    def test_bulk_create_users(self, django_assert_num_queries):
+        UserFactory(email="taken@example.com")
+        # The taken emails, then a savepoint and the inserts.
+        with django_assert_num_queries(5):
+            result = User.objects.bulk_create_users(
+                [
+                    {"email": "ann@EXAMPLE.com", "name": "Ann", "password": "pw-1"},
+                    {"email": "taken@example.com"},
+                    {"email": "bob@example.com", "password": "pw-2"},
+                    {"email": "ann@example.com"},
+                    {"email": "eve@example.com"},
+                ],
+                batch_size=2,
+            )
+        assert result.created == 3  # noqa: PLR2004
+        assert result.duplicates == ["taken@example.com", "ann@example.com"]
+        ann = User.objects.get(email="ann@example.com")
+        assert ann.name == "Ann"
+        assert ann.check_password("pw-1")
+        assert User.objects.get(email="bob@example.com").check_password("pw-2")
+        assert not User.objects.get(email="eve@example.com").has_usable_password()
+
+    def test_bulk_create_users_skips_invalid_emails(self):
+        too_long = "a" * 250 + "@example.com"
+        result = User.objects.bulk_create_users(
+            [
+                {"email": "not-an-email"},
+                {"email": "Ann@Example.COM"},
+                {"email": too_long},
+            ],
+        )
+        assert result.created == 1
+        assert result.invalid == ["not-an-email", too_long]
+        assert list(User.objects.values_list("email", flat=True)) == [
+            "ann@example.com",
+        ]
+
+    def test_bulk_create_users_needs_emails(self):
+        with pytest.raises(ValueError, match="email must be set"):
+            User.objects.bulk_create_users([{"name": "Ann"}])
+        assert not User.objects.exists()
+
+
+@pytest.mark.django_db
+class TestImportUsersCommand:
+    def test_imports_csv(self, tmp_path):
+        UserFactory(email="taken@example.com")
+        path = tmp_path / "users.csv"
+        path.write_text(
+            "email,name,password\n"
+            "ann@example.com,Ann,pw-1\n"
+            "taken@example.com,,\n"
+            "bob@example.com,Bob,\n",
+        )
+        out, err = StringIO(), StringIO()
+        call_command("import_users", str(path), batch_size=2, stdout=out, stderr=err)
+        assert out.getvalue().startswith("Created 2 users, skipped 1, in ")
+        assert err.getvalue() == "Skipped taken@example.com, the email is taken.\n"
+        assert User.objects.get(email="ann@example.com").check_password("pw-1")
+        assert User.objects.get(email="bob@example.com").name == "Bob"
+
+    def test_reports_invalid_emails(self, tmp_path):
+        path = tmp_path / "users.csv"
+        path.write_text("email,name\nann@example.com,Ann\nbob at example.com,Bob\n")
+        out, err = StringIO(), StringIO()
+        call_command("import_users", str(path), stdout=out, stderr=err)
+        assert out.getvalue().startswith("Created 1 users, skipped 1, in ")
+        assert err.getvalue() == "Skipped bob at example.com, the email is invalid.\n"
+        assert not User.objects.filter(name="Bob").exists()
+
+    def test_unknown_columns(self, tmp_path):
+        path = tmp_path / "users.csv"
+        path.write_text("email,is_superuser\nann@example.com,1\n")
+        with pytest.raises(CommandError, match="Unknown columns: is_superuser."):
+            call_command("import_users", str(path))
+
+    def test_missing_email(self, tmp_path):
+        path = tmp_path / "users.csv"
+        path.write_text("email,name\nann@example.com,Ann\n,Bob\n")
+        with pytest.raises(CommandError, match="Line 3: the email is missing."):
+            call_command("import_users", str(path))
+
 
 @pytest.mark.django_db
 def test_createsuperuser_command():
@@ -1,5 +1,15 @@
+from django.db import connection
+
 from bistro.users.models import User
 
 
 def test_user_get_absolute_url(user: User):
     assert user.get_absolute_url() == f"/users/{user.pk}/"
+
+
+def test_case_insensitive_email_lookups_use_the_index(user: User):
+    with connection.cursor() as cursor:
+        # Else the planner prefers scanning a table of one row.
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    plan = User.objects.filter(email__iexact=user.email.upper()).explain()
+    assert "users_user_email_upper_idx" in plan
@@ -7,6 +7,7 @@ from django.views.generic import DetailView
 from django.views.generic import RedirectView
 from django.views.generic import UpdateView
 
+from bistro.core.transaction import atomic_unless_safe
 from bistro.users.models import User
 
 
@@ -16,7 +17,7 @@ class UserDetailView(LoginRequiredMixin, DetailView):
     slug_url_kwarg = "id"
 
 
-user_detail_view = UserDetailView.as_view()
+user_detail_view = atomic_unless_safe(UserDetailView.as_view())
 
 
 class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
@@ -33,7 +34,7 @@ class UserUpdateView(LoginRequiredMixin, SuccessMessageMixin, UpdateView):
         return self.request.user
 
 
-user_update_view = UserUpdateView.as_view()
+user_update_view = atomic_unless_safe(UserUpdateView.as_view())
 
 
 class UserRedirectView(LoginRequiredMixin, RedirectView):
@@ -43,4 +44,4 @@ class UserRedirectView(LoginRequiredMixin, RedirectView):
         return reverse("users:detail", kwargs={"pk": self.request.user.pk})
 
 
-user_redirect_view = UserRedirectView.as_view()
+user_redirect_view = atomic_unless_safe(UserRedirectView.as_view())
@@ -1,13 +1,20 @@
 from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from bistro.core.api.views import BatchView
+from bistro.orders.api.views import OrderViewSet
 from bistro.users.api.views import UserViewSet
 
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 
 router.register("users", UserViewSet)
+router.register("orders", OrderViewSet)
 
 
 app_name = "api"
-urlpatterns = router.urls
+urlpatterns = [
+    path("batch/", BatchView.as_view(), name="batch"),
+    *router.urls,
+]
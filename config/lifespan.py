@@ -0,0 +1,162 @@
+"""
+ASGI lifespan handling.
+
+On startup the worker imports and warms everything the first requests would
+otherwise pay for (URLconf, serializers, the OpenAPI schema, templates,
+database and cache connections, per-process lookup caches) before the server
+sends it traffic.
+On shutdown it drains the kitchen board websockets, flushes the broadcast
+backplane and closes the database connection pools.
+"""
+
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sites.models import Site
+from django.core.cache import caches
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+from django.utils import translation
+
+from bistro.core.broadcast import get_broadcast
+from bistro.orders.kitchen import board
+
+logger = logging.getLogger(__name__)
+
+# Seconds given to websocket subscribers to receive their queued frames.
+SHUTDOWN_GRACE_PERIOD = 5
+
+WARM_TEMPLATES = ["base.html", "pages/home.html", "pages/about.html"]
+
+
+def warm_urls():
+    resolver = get_resolver()
+    resolver.url_patterns  # noqa: B018
+    resolver.reverse_dict  # noqa: B018
+
+
+def warm_serializers():
+    from config.api_router import router
+
+    for _, viewset, _ in router.registry:
+        serializer_class = getattr(viewset, "serializer_class", None)
+        if serializer_class is not None:
+            serializer_class().fields  # noqa: B018
+
+
+def warm_schema():
+    from bistro.core.schema import get_schema_artifacts
+
+    get_schema_artifacts()
+
+
+def warm_templates():
+    for name in WARM_TEMPLATES:
+        get_template(name)
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext("Users")
+
+
+def warm_database() -> bool:
+    """
+    Open the connection pools; False when no database alias has one.
+
+    A connection opened outside a pool would be closed again at the end of
+    ``warm_up()``, along with the rest of this thread's, so only pools stay
+    warm.
+    """
+    pools = [
+        (connection, pool)
+        for connection in connections.all()
+        if (pool := getattr(connection, "pool", None))
+    ]
+    for connection, pool in pools:
+        connection.ensure_connection()
+        # Wait until the pool holds its min_size connections.
+        pool.wait()
+    return bool(pools)
+
+
+def warm_cache():
+    for alias in settings.CACHES:
+        caches[alias].get("lifespan:warm-up")
+    get_broadcast()
+
+
+def warm_lookups():
+    Site.objects.get_current()
+    ContentType.objects.get_for_models(*apps.get_models())
+
+
+WARM_UP = [
+    warm_urls,
+    warm_serializers,
+    warm_schema,
+    warm_templates,
+    warm_database,
+    warm_cache,
+    warm_lookups,
+]
+
+
+def warm_up():
+    """
+    Run each warm-up step; a failing step is logged and skipped.
+
+    A step returning False had nothing to warm in this configuration.
+    """
+    total = time.perf_counter()
+    try:
+        for step in WARM_UP:
+            started = time.perf_counter()
+            try:
+                warmed = step()
+            except Exception:
+                logger.exception("Warm-up step %s failed", step.__name__)
+            else:
+                if warmed is False:
+                    logger.debug("Warm-up step %s skipped", step.__name__)
+                    continue
+                elapsed = (time.perf_counter() - started) * 1000
+                logger.debug("Warm-up step %s took %.1f ms", step.__name__, elapsed)
+    finally:
+        # Connections are thread-local; do not leave this thread holding any.
+        connections.close_all()
+    logger.info("Worker warmed up in %.1f ms", (time.perf_counter() - total) * 1000)
+
+
+def close_pools():
+    for connection in connections.all():
+        if getattr(connection, "pool", None):
+            # Only the PostgreSQL backend pools; django-stubs lacks that API.
+            connection.close_pool()  # type: ignore[attr-defined]
+
+
+async def shut_down():
+    await board.drain(SHUTDOWN_GRACE_PERIOD)
+    await get_broadcast().close()
+    await sync_to_async(close_pools)()
+
+
+async def lifespan_application(scope, receive, send):
+    while True:
+        message = await receive()
+
+        if message["type"] == "lifespan.startup":
+            await sync_to_async(warm_up)()
+            await send({"type": "lifespan.startup.complete"})
+
+        elif message["type"] == "lifespan.shutdown":
+            try:
+                await shut_down()
+            except Exception as exc:
+                logger.exception("Shutdown failed")
+                await send({"type": "lifespan.shutdown.failed", "message": str(exc)})
+            else:
+                await send({"type": "lifespan.shutdown.complete"})
+            return
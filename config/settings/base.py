@@ -2,6 +2,7 @@
 """Base settings to build other settings files upon."""
 
 from pathlib import Path
+from typing import Any
 
 import environ
 
@@ -53,6 +54,24 @@ DATABASES = {
     ),
 }
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# Read replicas of "default", comma separated database URLs. Reads go to them
+# through bistro.core.db.ReplicaRouter.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), start=1):
+    DATABASE_REPLICAS.append(f"replica_{index}")
+    DATABASES[f"replica_{index}"] = {
+        **env.db_url_config(url),
+        "TEST": {"MIRROR": "default"},
+    }
+# Replicas further behind than this many seconds aren't read from.
+DATABASE_REPLICA_MAX_LAG = env.float("DATABASE_REPLICA_MAX_LAG", default=5.0)
+# Seconds between checks of a replica's lag and availability.
+DATABASE_REPLICA_CHECK_INTERVAL = env.float(
+    "DATABASE_REPLICA_CHECK_INTERVAL",
+    default=5.0,
+)
+# https://docs.djangoproject.com/en/dev/ref/settings/#database-routers
+DATABASE_ROUTERS = ["bistro.core.db.ReplicaRouter"]
 # https://docs.djangoproject.com/en/stable/ref/settings/#std:setting-DEFAULT_AUTO_FIELD
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -90,7 +109,10 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    "bistro.core",
     "bistro.users",
+    "bistro.orders",
+    "bistro.outbox",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -105,9 +127,12 @@ MIGRATION_MODULES = {"sites": "bistro.contrib.sites.migrations"}
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#authentication-backends
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
-    "allauth.account.auth_backends.AuthenticationBackend",
+    # django.contrib.auth / allauth backends caching the session's user.
+    "bistro.users.backends.ModelBackend",
+    "bistro.users.backends.AuthenticationBackend",
 ]
+# Seconds users and API tokens stay cached, see bistro.users.cache.
+USER_CACHE_TIMEOUT = env.int("DJANGO_USER_CACHE_TIMEOUT", default=300)
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-user-model
 AUTH_USER_MODEL = "users.User"
 # https://docs.djangoproject.com/en/dev/ref/settings/#login-redirect-url
@@ -120,11 +145,14 @@ LOGIN_URL = "account_login"
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
 PASSWORD_HASHERS = [
     # https://docs.djangoproject.com/en/dev/topics/auth/passwords/#using-argon2-with-django
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    # Hashing on a bounded thread pool, see bistro.users.hashers.
+    "bistro.users.hashers.PooledArgon2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
 ]
+# Threads hashing passwords at a time, each Argon2 hash uses several cores.
+PASSWORD_HASHING_MAX_WORKERS = env.int("DJANGO_PASSWORD_HASHING_MAX_WORKERS", 2)
 # https://docs.djangoproject.com/en/dev/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -139,16 +167,22 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "bistro.core.middleware.RequestIDMiddleware",
+    "bistro.core.middleware.ContextSwitchMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.locale.LocaleMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "bistro.core.middleware.TransactionCountMiddleware",
+    "bistro.core.middleware.ReplicaMiddleware",
+    "bistro.core.middleware.WhiteNoiseMiddleware",
+    # Skipped by token authenticated API requests (CORS_URLS_REGEX), which use
+    # neither sessions, cookies nor HTML.
+    "bistro.core.middleware.SessionMiddleware",
+    "bistro.core.middleware.LocaleMiddleware",
+    "bistro.core.middleware.CommonMiddleware",
+    "bistro.core.middleware.CsrfViewMiddleware",
+    "bistro.core.middleware.AuthenticationMiddleware",
+    "bistro.core.middleware.MessageMiddleware",
+    "bistro.core.middleware.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
 ]
 
@@ -213,6 +247,15 @@ CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 # https://docs.djangoproject.com/en/dev/ref/settings/#fixture-dirs
 FIXTURE_DIRS = (str(APPS_DIR / "fixtures"),)
 
+# SESSIONS
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-engine
+SESSION_ENGINE = "bistro.core.sessions"
+# Share of new sessions that also delete a batch of expired ones, and the batch
+# size (clearsessions deletes all of them in batches of that size).
+SESSION_CLEANUP_PROBABILITY = env.float("DJANGO_SESSION_CLEANUP_PROBABILITY", 0.01)
+SESSION_CLEANUP_BATCH_SIZE = env.int("DJANGO_SESSION_CLEANUP_BATCH_SIZE", 1000)
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-httponly
@@ -221,16 +264,33 @@ SESSION_COOKIE_HTTPONLY = True
 CSRF_COOKIE_HTTPONLY = True
 # https://docs.djangoproject.com/en/dev/ref/settings/#x-frame-options
 X_FRAME_OPTIONS = "DENY"
+# https://docs.djangoproject.com/en/dev/ref/settings/#silenced-system-checks
+# Only find the stock middleware classes, bistro.core.checks replaces them.
+SILENCED_SYSTEM_CHECKS = ["security.W002", "security.W003"]
 
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
+# Queues to the outbox, see bistro.outbox.
 EMAIL_BACKEND = env(
     "DJANGO_EMAIL_BACKEND",
-    default="django.core.mail.backends.smtp.EmailBackend",
+    default="bistro.outbox.backends.EmailBackend",
 )
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-timeout
 EMAIL_TIMEOUT = 5
+# What the deliver_email command sends the outbox through.
+OUTBOX_EMAIL_BACKEND = env(
+    "DJANGO_OUTBOX_EMAIL_BACKEND",
+    default="django.core.mail.backends.smtp.EmailBackend",
+)
+# Messages claimed and sent at a time.
+OUTBOX_BATCH_SIZE = env.int("DJANGO_OUTBOX_BATCH_SIZE", 100)
+# Attempts to send a message before giving up on it.
+OUTBOX_MAX_ATTEMPTS = env.int("DJANGO_OUTBOX_MAX_ATTEMPTS", 8)
+# Seconds before retrying a failed message, doubled with every failure.
+OUTBOX_RETRY_DELAY = env.int("DJANGO_OUTBOX_RETRY_DELAY", 60)
+# Seconds a worker has to send the messages it claimed, before others may.
+OUTBOX_LEASE = env.int("DJANGO_OUTBOX_LEASE", 600)
 
 # ADMIN
 # ------------------------------------------------------------------------------
@@ -249,27 +309,50 @@ DJANGO_ADMIN_FORCE_ALLAUTH = env.bool("DJANGO_ADMIN_FORCE_ALLAUTH", default=Fals
 # https://docs.djangoproject.com/en/dev/ref/settings/#logging
 # See https://docs.djangoproject.com/en/dev/topics/logging for
 # more details on how to customize your logging configuration.
-LOGGING = {
+LOGGING: dict[str, Any] = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {"request": {"()": "bistro.core.log.RequestContextFilter"}},
     "formatters": {
         "verbose": {
             "format": "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s",
         },
+        "json": {"()": "bistro.core.log.JSONFormatter"},
     },
     "handlers": {
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "formatter": "json",
+        },
+        # Writes to the console from a thread of its own, see bistro.core.log.
+        "queue": {
+            "class": "bistro.core.log.BoundedQueueHandler",
+            "handlers": ["console"],
+            "filters": ["request"],
+            "queue": {"()": "queue.Queue", "maxsize": 10000},
         },
     },
-    "root": {"level": "INFO", "handlers": ["console"]},
+    "root": {"level": "INFO", "handlers": ["queue"]},
 }
 
 REDIS_URL = env("REDIS_URL", default="redis://localhost:6379/0")
 REDIS_SSL = REDIS_URL.startswith("rediss://")
 
+# BROADCAST
+# ------------------------------------------------------------------------------
+# Backplane carrying websocket events between workers, see bistro.core.broadcast.
+# "memory://" only reaches sockets held by the current process.
+BROADCAST_URL = env("BROADCAST_URL", default="memory://")
+
+# KITCHEN
+# ------------------------------------------------------------------------------
+# Stations kitchen screens may subscribe to, see config.websocket.
+KITCHEN_STATIONS = env.list(
+    "DJANGO_KITCHEN_STATIONS",
+    default=["kitchen", "grill", "bar"],
+)
+
 
 # django-allauth
 # ------------------------------------------------------------------------------
@@ -298,11 +381,26 @@ SOCIALACCOUNT_FORMS = {"signup": "bistro.users.forms.UserSocialSignupForm"}
 # django-rest-framework - https://www.django-rest-framework.org/api-guide/settings/
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
+        # Sub-requests of batches, see bistro.core.api.views.
+        "bistro.core.api.authentication.BatchAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "bistro.users.api.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # orjson based JSON, falling back to DRF's when orjson isn't installed.
+    "DEFAULT_RENDERER_CLASSES": (
+        "bistro.core.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "bistro.core.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Keyset pagination: no COUNT(*), deep pages cost as much as the first.
+    "DEFAULT_PAGINATION_CLASS": "bistro.core.pagination.KeysetPagination",
+    "PAGE_SIZE": 100,
 }
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
@@ -317,5 +415,11 @@ SPECTACULAR_SETTINGS = {
     "SERVE_PERMISSIONS": ["rest_framework.permissions.IsAdminUser"],
     "SCHEMA_PATH_PREFIX": "/api/",
 }
+# Directory holding the schema written by `manage.py build_schema` at build
+# time; without it every worker generates the schema once, on startup.
+SCHEMA_ARTIFACTS_DIR = env("DJANGO_SCHEMA_ARTIFACTS_DIR", default=None)
+# Threads running the reads of a batched API request (/api/batch/)
+# concurrently, each with its own database connection.
+API_BATCH_MAX_WORKERS = env.int("DJANGO_API_BATCH_MAX_WORKERS", default=4)
 # Your stuff...
 # ------------------------------------------------------------------------------
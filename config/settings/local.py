@@ -1,6 +1,7 @@
 # ruff: noqa: E501
 from .base import *  # noqa: F403
 from .base import INSTALLED_APPS
+from .base import LOGGING
 from .base import MIDDLEWARE
 from .base import env
 
@@ -34,6 +35,11 @@ EMAIL_BACKEND = env(
     default="django.core.mail.backends.console.EmailBackend",
 )
 
+# LOGGING
+# ------------------------------------------------------------------------------
+# Lines to read rather than JSON.
+LOGGING["handlers"]["console"]["formatter"] = "verbose"
+
 # WhiteNoise
 # ------------------------------------------------------------------------------
 # http://whitenoise.evans.io/en/latest/django.html#using-whitenoise-in-development
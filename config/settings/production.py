@@ -15,7 +15,23 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["example.com"])
 
 # DATABASES
 # ------------------------------------------------------------------------------
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
+# Under ASGI every request runs in its own thread, so CONN_MAX_AGE cannot keep
+# connections around; a psycopg connection pool per worker process does.
+# https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool
+for database in DATABASES.values():  # the primary and its read replicas
+    if env.bool("DJANGO_DB_POOL", default=True):
+        database.setdefault("OPTIONS", {})["pool"] = {
+            # https://www.psycopg.org/psycopg3/docs/api/pool.html#psycopg_pool.ConnectionPool
+            "min_size": env.int("DJANGO_DB_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DJANGO_DB_POOL_MAX_SIZE", default=10),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": env.float("DJANGO_DB_POOL_TIMEOUT", default=10.0),
+            # Seconds after which connections are replaced / idle ones closed.
+            "max_lifetime": env.float("DJANGO_DB_POOL_MAX_LIFETIME", default=1800.0),
+            "max_idle": env.float("DJANGO_DB_POOL_MAX_IDLE", default=300.0),
+        }
+    else:
+        database["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)
 
 # CACHES
 # ------------------------------------------------------------------------------
@@ -32,6 +48,10 @@ CACHES = {
     },
 }
 
+# BROADCAST
+# ------------------------------------------------------------------------------
+BROADCAST_URL = env("BROADCAST_URL", default=REDIS_URL)
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
@@ -102,7 +122,8 @@ INSTALLED_APPS += ["anymail"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 # https://anymail.readthedocs.io/en/stable/installation/#anymail-settings-reference
 # https://anymail.readthedocs.io/en/stable/esps
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+EMAIL_BACKEND = "bistro.outbox.backends.EmailBackend"
+OUTBOX_EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 ANYMAIL = {}
 
 
@@ -112,30 +133,42 @@ ANYMAIL = {}
 # See https://docs.djangoproject.com/en/dev/topics/logging for
 # more details on how to customize your logging configuration.
 # A sample logging configuration. The only tangible logging
-# performed by this configuration is to send an email to
-# the site admins on every HTTP 500 error when DEBUG=False.
+# performed by this configuration is to email the site admins digests of
+# the HTTP 500 errors when DEBUG=False.
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "filters": {"require_debug_false": {"()": "django.utils.log.RequireDebugFalse"}},
+    "filters": {
+        "require_debug_false": {"()": "django.utils.log.RequireDebugFalse"},
+        "request": {"()": "bistro.core.log.RequestContextFilter"},
+    },
     "formatters": {
-        "verbose": {
-            "format": "%(levelname)s %(asctime)s %(module)s %(process)d %(thread)d %(message)s",
-        },
+        "json": {"()": "bistro.core.log.JSONFormatter"},
     },
     "handlers": {
         "mail_admins": {
             "level": "ERROR",
             "filters": ["require_debug_false"],
-            "class": "django.utils.log.AdminEmailHandler",
+            # Digests of the errors of a minute, see bistro.core.log.
+            "class": "bistro.core.log.ErrorDigestHandler",
+            "interval": 60,
+            # Not through the outbox: the database may be what fails.
+            "email_backend": OUTBOX_EMAIL_BACKEND,
         },
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
-            "formatter": "verbose",
+            "formatter": "json",
+        },
+        # Writes to the console from a thread of its own, see bistro.core.log.
+        "queue": {
+            "class": "bistro.core.log.BoundedQueueHandler",
+            "handlers": ["console"],
+            "filters": ["request"],
+            "queue": {"()": "queue.Queue", "maxsize": 10000},
         },
     },
-    "root": {"level": "INFO", "handlers": ["console"]},
+    "root": {"level": "INFO", "handlers": ["queue"]},
     "loggers": {
         "django.request": {
             "handlers": ["mail_admins"],
@@ -144,7 +177,7 @@ LOGGING = {
         },
         "django.security.DisallowedHost": {
             "level": "ERROR",
-            "handlers": ["console", "mail_admins"],
+            "handlers": ["queue", "mail_admins"],
             "propagate": True,
         },
     },
@@ -6,16 +6,22 @@ from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include
 from django.urls import path
 from django.views import defaults as default_views
-from django.views.generic import TemplateView
-from drf_spectacular.views import SpectacularAPIView
 from drf_spectacular.views import SpectacularSwaggerView
 from rest_framework.authtoken.views import obtain_auth_token
 
+from bistro.core.schema import SchemaView
+from bistro.core.transaction import atomic_unless_safe
+from bistro.core.views import AsyncTemplateView
+
 urlpatterns = [
-    path("", TemplateView.as_view(template_name="pages/home.html"), name="home"),
+    path(
+        "",
+        AsyncTemplateView.as_view(template_name="pages/home.html"),
+        name="home",
+    ),
     path(
         "about/",
-        TemplateView.as_view(template_name="pages/about.html"),
+        AsyncTemplateView.as_view(template_name="pages/about.html"),
         name="about",
     ),
     # Django Admin, use {% url 'admin:index' %}
@@ -38,10 +44,14 @@ urlpatterns += [
     path("api/", include("config.api_router")),
     # DRF auth token
     path("api/auth-token/", obtain_auth_token),
-    path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
+    path(
+        "api/schema/",
+        atomic_unless_safe(SchemaView.as_view()),
+        name="api-schema",
+    ),
     path(
         "api/docs/",
-        SpectacularSwaggerView.as_view(url_name="api-schema"),
+        atomic_unless_safe(SpectacularSwaggerView.as_view(url_name="api-schema")),
         name="api-docs",
     ),
 ]
@@ -1,13 +1,151 @@
+import io
+import json
+from importlib import import_module
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.handlers.asgi import ASGIRequest
+from django.http.request import split_domain_port
+from django.http.request import validate_host
+from rest_framework.exceptions import AuthenticationFailed
+
+from bistro.orders.kitchen import Subscriber
+from bistro.orders.kitchen import board
+from bistro.users.api.authentication import CachedTokenAuthentication
+
+# Close codes of rejected connections, sent instead of websocket.accept.
+CLOSE_BAD_REQUEST = 4400
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+
+# Upper bound on the stations one socket subscribes to at a time.
+MAX_STATIONS = 16
+
+
+def parse_stations(value) -> list[str]:
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [station for station in value if isinstance(station, str) and station]
+
+
+def origin_allowed(request) -> bool:
+    """
+    Whether a browser page of ``request``'s Origin may open the socket.
+
+    Browsers send cookies with websocket handshakes from any page, so, like
+    CSRF protection, only pages of ``ALLOWED_HOSTS`` and
+    ``CSRF_TRUSTED_ORIGINS`` are let in. Clients that aren't browsers send
+    no Origin and have no page to hijack the socket from.
+    """
+    origin = request.META.get("HTTP_ORIGIN")
+    if origin is None:
+        return True
+    if origin in settings.CSRF_TRUSTED_ORIGINS:
+        return True
+    try:
+        domain, _ = split_domain_port(urlsplit(origin).netloc)
+    except ValueError:
+        return False
+    return bool(domain) and validate_host(domain, settings.ALLOWED_HOSTS)
+
+
+def authenticate(request):
+    """The user of the token in ``Authorization``, else of the session."""
+    try:
+        authenticated = CachedTokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+    if authenticated is not None:
+        return authenticated[0]
+    engine = import_module(settings.SESSION_ENGINE)
+    request.session = engine.SessionStore(
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME),
+    )
+    user = get_user(request)
+    return user if user.is_authenticated else None
+
+
+async def subscribe(subscriber: Subscriber, stations: list[str]) -> list[str]:
+    """Subscribe to the known ``stations`` there's room for; the rest back."""
+    rejected = []
+    for station in stations:
+        if station not in settings.KITCHEN_STATIONS or (
+            station not in subscriber.stations
+            and len(subscriber.stations) >= MAX_STATIONS
+        ):
+            rejected.append(station)
+        else:
+            await board.subscribe(subscriber, station)
+    return rejected
+
+
+async def handle_command(subscriber: Subscriber, text: str | None) -> None:
+    if text == "ping":
+        subscriber.deliver("pong!")
+        return
+    try:
+        command = json.loads(text or "")
+    except ValueError:
+        return
+    if not isinstance(command, dict):
+        return
+    rejected = await subscribe(subscriber, parse_stations(command.get("subscribe")))
+    for station in parse_stations(command.get("unsubscribe")):
+        await board.unsubscribe(subscriber, station)
+    ack = {"type": "subscribed", "stations": sorted(subscriber.stations)}
+    if rejected:
+        ack["rejected"] = rejected
+    subscriber.deliver(json.dumps(ack))
+
+
+async def check_connection(scope) -> tuple[int | None, list[str]]:
+    """The code to refuse the connection with, if any, and its stations."""
+    # Headers, cookies and the query string, parsed the way Django does.
+    request = ASGIRequest({**scope, "method": "GET"}, io.BytesIO())
+    stations = request.GET.getlist("station")
+    if not origin_allowed(request):
+        return CLOSE_FORBIDDEN, stations
+    if await sync_to_async(authenticate)(request) is None:
+        return CLOSE_UNAUTHORIZED, stations
+    if len(stations) > MAX_STATIONS or not set(stations).issubset(
+        settings.KITCHEN_STATIONS,
+    ):
+        return CLOSE_BAD_REQUEST, stations
+    return None, stations
+
+
 async def websocket_application(scope, receive, send):
-    while True:
-        event = await receive()
+    """
+    Kitchen display feed.
+
+    Clients pick stations of ``KITCHEN_STATIONS`` with
+    ``?station=grill&station=bar`` on connect, or later by sending
+    ``{"subscribe": [...]}`` / ``{"unsubscribe": [...]}``. Order events for
+    those stations are pushed as JSON text frames. Like the order API, the
+    feed is only open to authenticated users, by session or API token, and
+    to pages of the site's own origins.
+    """
+    subscriber = Subscriber(send)
+    try:
+        while True:
+            event = await receive()
 
-        if event["type"] == "websocket.connect":
-            await send({"type": "websocket.accept"})
+            if event["type"] == "websocket.connect":
+                code, stations = await check_connection(scope)
+                if code is not None:
+                    await send({"type": "websocket.close", "code": code})
+                    break
+                await send({"type": "websocket.accept"})
+                await subscribe(subscriber, stations)
 
-        if event["type"] == "websocket.disconnect":
-            break
+            if event["type"] == "websocket.disconnect":
+                break
 
-        if event["type"] == "websocket.receive":
-            if event["text"] == "ping":
-                await send({"type": "websocket.send", "text": "pong!"})
+            if event["type"] == "websocket.receive":
+                await handle_command(subscriber, event.get("text"))
+    finally:
+        await board.unsubscribe(subscriber)
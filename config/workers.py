@@ -0,0 +1,16 @@
+"""
+Gunicorn worker classes for serving ``config.asgi:application``.
+
+Run with ``gunicorn config.asgi:application -k config.workers.UvicornWorker``.
+"""
+
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+
+class UvicornWorker(BaseUvicornWorker):
+    CONFIG_KWARGS = {
+        **BaseUvicornWorker.CONFIG_KWARGS,
+        # Kitchen board frames are small JSON documents; per-message deflate
+        # would keep zlib state for every idle screen (~90 KiB each).
+        "ws_per_message_deflate": False,
+    }
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+
+import pytest
+
+from config import lifespan
+from config.asgi import application
+
+
+def run_lifespan(*events: str) -> list[dict]:
+    async def scenario():
+        inbox: asyncio.Queue = asyncio.Queue()
+        sent: list[dict] = []
+
+        async def send(message):
+            sent.append(message)
+
+        for event in events:
+            inbox.put_nowait({"type": event})
+        await application({"type": "lifespan"}, inbox.get, send)
+        return sent
+
+    return asyncio.run(scenario())
+
+
+def test_startup_runs_warm_up_before_completing(monkeypatch):
+    calls = []
+    monkeypatch.setattr(lifespan, "WARM_UP", [lambda: calls.append("warm")])
+    sent = run_lifespan("lifespan.startup", "lifespan.shutdown")
+    assert calls == ["warm"]
+    assert sent == [
+        {"type": "lifespan.startup.complete"},
+        {"type": "lifespan.shutdown.complete"},
+    ]
+
+
+def test_failing_warm_up_step_does_not_block_startup(monkeypatch, caplog):
+    def broken():
+        msg = "unreachable"
+        raise ConnectionError(msg)
+
+    monkeypatch.setattr(lifespan, "WARM_UP", [broken])
+    sent = run_lifespan("lifespan.startup", "lifespan.shutdown")
+    assert sent[0] == {"type": "lifespan.startup.complete"}
+    assert "Warm-up step broken failed" in caplog.text
+
+
+@pytest.mark.django_db
+def test_warm_up_steps(caplog):
+    with caplog.at_level(logging.DEBUG, logger="config.lifespan"):
+        lifespan.warm_up()
+    assert "failed" not in caplog.text
+    for step in lifespan.WARM_UP:
+        assert step.__name__ in caplog.text
+
+
+class FakeConnection:
+    def __init__(self, pool=None):
+        self.pool = pool
+        self.connected = False
+
+    def ensure_connection(self):
+        self.connected = True
+
+    def close(self):
+        self.connected = False
+
+
+class FakePool:
+    ready = False
+
+    def wait(self):
+        self.ready = True
+
+
+def test_warm_database_only_opens_pools(monkeypatch):
+    pooled, unpooled = FakeConnection(FakePool()), FakeConnection()
+    monkeypatch.setattr(lifespan.connections, "all", lambda: [pooled, unpooled])
+    assert lifespan.warm_database() is True
+    assert pooled.connected
+    assert pooled.pool.ready
+    assert not unpooled.connected
+
+
+def test_warm_database_is_skipped_without_pools(monkeypatch, caplog):
+    unpooled = FakeConnection()
+    monkeypatch.setattr(
+        lifespan.connections,
+        "all",
+        lambda initialized_only=False: [unpooled],
+    )
+    monkeypatch.setattr(lifespan, "WARM_UP", [lifespan.warm_database])
+    with caplog.at_level(logging.DEBUG, logger="config.lifespan"):
+        lifespan.warm_up()
+    assert not unpooled.connected
+    assert "Warm-up step warm_database skipped" in caplog.text
+    assert "Warm-up step warm_database took" not in caplog.text